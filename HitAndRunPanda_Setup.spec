@@ -5,7 +5,7 @@ a = Analysis(
     ['setup_wizard.py'],
     pathex=[],
     binaries=[],
-    datas=[('assets', 'assets'), ('dist/HitAndRunPanda.exe', '.')],
+    datas=[('compiled_assets', 'assets'), ('dist/HitAndRunPanda.exe', '.')],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
@@ -35,5 +35,5 @@ exe = EXE(
     target_arch=None,
     codesign_identity=None,
     entitlements_file=None,
-    icon=['assets\\app.ico'],
+    icon=['compiled_assets\\app.ico'],
 )
@@ -0,0 +1,214 @@
+"""
+Hit & Run Panda - Red Alert Surface
+The full-screen red alert window shared by main.py and red_alert.py.
+
+The background flash, "⚠ WARNING ⚠", the message, the subtext and the
+ESC hint are painted in one paintEvent. Each text is laid out and
+rendered once into a pixmap (text_pixmap(), cached per text, font and
+DPR), so a frame is a fill plus a few blits instead of a palette change
+that repaints a tree of QLabels and re-shapes 100 pt glyphs.
+
+- Flash: toggles the fill color and repaints the window.
+- Shake: moves the message pixmap by a few pixels and repaints only the
+  old and new message rectangles. The old shake rewrote a style sheet
+  20 times a second, making Qt re-parse it and re-lay out the window.
+
+The dismiss button stays a real QPushButton, styled by the theme.
+
+A surface can be built ahead of time: prewarm() polishes it, sizes it
+to its screen, renders the texts and creates the native window while
+it stays hidden, so present() only has to show it. The effects run
+while it is shown and stop when it is hidden.
+"""
+
+import math
+import random
+from functools import lru_cache
+
+from PyQt6.QtCore import QPoint, QRect, Qt
+from PyQt6.QtGui import QFont, QFontMetrics, QPainter, QPixmap
+from PyQt6.QtWidgets import QApplication, QPushButton, QWidget
+
+from theme import get_font, get_color
+from animation import shared_clock
+
+
+@lru_cache(maxsize=32)
+def text_pixmap(text: str, color: str, dpr: float, size: int, weight=None,
+                family: str = None) -> QPixmap:
+    """`text` on one line in a transparent pixmap of exactly its size."""
+    font = get_font(size, weight, family)
+    metrics = QFontMetrics(font)
+    width, height = max(1, metrics.horizontalAdvance(text)), metrics.height()
+    pixmap = QPixmap(math.ceil(width * dpr), math.ceil(height * dpr))
+    pixmap.setDevicePixelRatio(dpr)
+    pixmap.fill(Qt.GlobalColor.transparent)
+    painter = QPainter(pixmap)
+    painter.setFont(font)
+    painter.setPen(get_color(color))
+    painter.drawText(QRect(0, 0, width, height), Qt.AlignmentFlag.AlignCenter, text)
+    painter.end()
+    return pixmap
+
+
+class AlertSurface(QWidget):
+    """Frameless always-on-top alert painted in one pass.
+
+    Subclasses pass the texts and implement dismiss(); present()
+    shows the surface full screen.
+    """
+
+    SPACING = 6  # between stacked items, like the QVBoxLayout it replaces
+    HINT_GAP = 20
+    MARGIN = 20  # kept clear on both sides of the message
+    MIN_MESSAGE_SIZE = 24
+    SHAKE_X = 5
+    SHAKE_Y = 3
+    FLASH_MS = 100
+    SHAKE_MS = 50
+
+    def __init__(self, message: str, subtext: str, button_text: str, hint: str = None,
+                 message_size: int = 100):
+        super().__init__()
+        self.setWindowFlags(
+            Qt.WindowType.FramelessWindowHint |
+            Qt.WindowType.WindowStaysOnTopHint
+        )
+        # paintEvent fills every dirty pixel itself
+        self.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent)
+        self.message = message
+        self.subtext = subtext
+        self.hint = hint
+        self.message_size = message_size
+        self.background = get_color("alert_bg")
+        self.flash_state = False
+        self.offset = QPoint(0, 0)
+        self.placements = []  # (top-left, pixmap) of the still texts
+        self.message_pixmap = None
+        self.message_pos = QPoint(0, 0)
+        self.layout_dpr = None
+
+        self.button = QPushButton(button_text, self)
+        self.button.setFont(get_font(24, QFont.Weight.Bold, "Arial"))
+        self.button.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.button.setObjectName("alertButton")
+        self.button.clicked.connect(self.dismiss)
+
+        clock = shared_clock()
+        self.flash_timer = clock.timer_for(self.flash, self, "alert flash")
+        self.shake_timer = clock.timer_for(self.shake, self, "alert shake")
+
+    def prewarm(self):
+        """Do everything but showing: polish, size, render texts, native window."""
+        self.ensurePolished()
+        self.button.ensurePolished()
+        screen = self.screen() or QApplication.primaryScreen()
+        self.setGeometry(screen.geometry())
+        self.layout_content()  # a hidden widget gets its resize event only when shown
+        self.winId()
+
+    def present(self, message: str):
+        """Show full screen with `message`; no re-render if the message is unchanged."""
+        if message != self.message:
+            self.set_message(message)
+        self.showFullScreen()
+
+    def set_message(self, message: str):
+        self.message = message
+        if self.layout_dpr is not None:  # otherwise the first resize lays it out
+            self.layout_content()
+            self.update()
+
+    def layout_content(self):
+        """Render the texts for this DPR and stack everything centered."""
+        dpr = self.devicePixelRatioF()
+        self.layout_dpr = dpr
+        warning = text_pixmap("⚠ WARNING ⚠", "alert_text", dpr, 60, QFont.Weight.Bold, "Impact")
+        self.message_pixmap = text_pixmap(self.message, "alert_text", dpr, self.message_font_size(),
+                                          QFont.Weight.Bold, "Impact")
+        subtext = text_pixmap(self.subtext, "alert_subtext", dpr, 30, family="Arial")
+        hint = text_pixmap(self.hint, "alert_hint", dpr, 10) if self.hint else None
+        button_size = self.button.sizeHint()
+
+        items = [warning, self.message_pixmap, subtext, button_size] + ([hint] if hint else [])
+        sizes = [
+            item if not isinstance(item, QPixmap) else item.deviceIndependentSize().toSize()
+            for item in items
+        ]
+        height = sum(s.height() for s in sizes) + self.SPACING * (len(sizes) - 1)
+        if hint:
+            height += self.HINT_GAP
+        y = (self.height() - height) // 2
+        self.placements = []
+        for item, size in zip(items, sizes):
+            if item is hint:
+                y += self.HINT_GAP
+            top_left = QPoint((self.width() - size.width()) // 2, y)
+            if item is self.message_pixmap:
+                self.message_pos = top_left
+            elif item is button_size:
+                self.button.setGeometry(QRect(top_left, size))
+            else:
+                self.placements.append((top_left, item))
+            y += size.height() + self.SPACING
+
+    def message_font_size(self) -> int:
+        """message_size, shrunk so a long message still fits across the screen."""
+        width = QFontMetrics(get_font(self.message_size, QFont.Weight.Bold, "Impact")) \
+            .horizontalAdvance(self.message)
+        room = self.width() - 2 * (self.SHAKE_X + self.MARGIN)
+        if width <= room or room <= 0:
+            return self.message_size
+        return max(self.MIN_MESSAGE_SIZE, self.message_size * room // width)
+
+    def message_rect(self) -> QRect:
+        size = self.message_pixmap.deviceIndependentSize().toSize()
+        return QRect(self.message_pos + self.offset, size)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.layout_content()
+
+    def paintEvent(self, event):
+        if self.layout_dpr != self.devicePixelRatioF():
+            self.layout_content()  # moved to a screen with another DPR
+        painter = QPainter(self)
+        painter.fillRect(event.rect(), self.background)
+        for top_left, pixmap in self.placements:
+            painter.drawPixmap(top_left, pixmap)
+        painter.drawPixmap(self.message_pos + self.offset, self.message_pixmap)
+        painter.end()
+
+    def flash(self):
+        """Alternate the background between the two flash colors."""
+        self.flash_state = not self.flash_state
+        self.background = get_color("alert_flash_on" if self.flash_state else "alert_flash_off")
+        self.update()
+
+    def shake(self):
+        """Jump the message to a new random offset."""
+        if self.message_pixmap is None:
+            return
+        old = self.message_rect()
+        self.offset = QPoint(random.randint(-self.SHAKE_X, self.SHAKE_X),
+                             random.randint(-self.SHAKE_Y, self.SHAKE_Y))
+        self.update(old.united(self.message_rect()))
+
+    def keyPressEvent(self, event):
+        """Close on ESC key."""
+        if event.key() == Qt.Key.Key_Escape:
+            self.dismiss()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.flash_timer.start(self.FLASH_MS)
+        self.shake_timer.start(self.SHAKE_MS)
+
+    def hideEvent(self, event):
+        # Also reached through close() and when a new alert replaces this one
+        self.flash_timer.stop()
+        self.shake_timer.stop()
+        super().hideEvent(event)
+
+    def dismiss(self):
+        self.close()
@@ -0,0 +1,425 @@
+"""
+Hit & Run Panda - Animation Clock
+One timer that drives every animated widget: panda frame flips, the
+walk across the screen, the red alert flash and shake, crowd mode.
+
+Components get a ClockTimer (start/stop like a QTimer) or a Tween (the
+small part of QPropertyAnimation the app uses) from the shared clock.
+The clock ticks at the shortest interval among the running animations
+whose widget is on screen, fires everything that is due in that one
+wakeup, and stops its timer when nothing on screen is animating. A
+widget that is hidden or minimized does not count, nor does a paint
+timer whose window is fully covered (not exposed); the walk still
+moves a covered window. Show, hide, window state and expose events
+restart or stop the clock.
+
+FrameRateGovernor picks a pet's frame rate from its measured paint
+cost and event-loop delay, within the limits of the user's policy.
+
+WakeupCounter counts every timer event the GUI thread receives, to
+check that the daemon really sleeps between reminders. With a
+FrameStats set as `clock.stats`, every animation call is recorded
+(see frame_stats.py).
+"""
+
+import math
+import time
+from collections import Counter
+from functools import lru_cache
+
+from PyQt6 import sip
+from PyQt6.QtCore import QEasingCurve, QEvent, QObject, QPoint, Qt, QTimer, pyqtSignal
+from PyQt6.QtWidgets import QWidget
+
+
+class ClockTimer:
+    """QTimer-like handle for one periodic animation on an AnimationClock.
+
+    `widget`, if given, pauses the animation while it is hidden,
+    minimized or covered. Covered (not exposed) only pauses timers that
+    just repaint; `needs_exposure=False` keeps one that moves the window
+    running, since a window that starts off screen may never be exposed
+    until it has moved.
+    """
+
+    def __init__(self, clock, callback, widget=None, name: str = None,
+                 needs_exposure: bool = True):
+        self.clock = clock
+        self.callback = callback
+        self.widget = widget
+        self.needs_exposure = needs_exposure
+        self.name = name or getattr(callback, "__name__", "animation")
+        self.interval_ms = 0
+        self.due = 0.0
+        self.last_fired = None
+        self.last_delay = 0.0  # ms the latest call ran behind its due time
+        self.last_lateness = 0.0  # ms the clock tick that made it ran late, net of tick phase
+        self.active = False
+        self.visible = False  # is_visible() as of the clock's last reschedule()
+
+    def start(self, interval_ms: int = None):
+        if interval_ms is not None:
+            self.interval_ms = interval_ms
+        self.due = self.clock.now() + self.interval_ms
+        self.last_fired = None
+        self.clock.add(self)
+
+    def stop(self):
+        self.clock.remove(self)
+
+    def isActive(self) -> bool:
+        return self.active
+
+    def is_visible(self) -> bool:
+        if self.widget is None:
+            return True
+        if sip.isdeleted(self.widget):
+            self.active = False  # the clock drops it on the next tick
+            return False
+        if not self.widget.isVisible():
+            return False
+        window = self.widget.window()
+        if window.isMinimized():
+            return False
+        handle = window.windowHandle()
+        return not self.needs_exposure or handle is None or handle.isExposed()
+
+
+class AnimationClock(QObject):
+    """Single precise timer shared by all animations."""
+
+    MIN_TICK_MS = 16
+    WATCHED_EVENTS = (
+        QEvent.Type.Show, QEvent.Type.Hide, QEvent.Type.WindowStateChange, QEvent.Type.Expose,
+    )
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.timer = QTimer(self)
+        self.timer.setObjectName("animationClock")
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.timer.timeout.connect(self.tick)
+        self.animations = []  # running ClockTimers
+        self.ticks = 0
+        self.interval_ms = 0  # the running timer's interval, without asking Qt each tick
+        self.tick_due = None  # when Qt should deliver the next tick
+        self.lateness = 0.0  # ms the latest tick arrived after tick_due
+        self.stats = None  # FrameStats while frame timing is being recorded
+
+    @staticmethod
+    def now() -> float:
+        return time.perf_counter() * 1000
+
+    def timer_for(self, callback, widget=None, name: str = None,
+                  needs_exposure: bool = True) -> ClockTimer:
+        return ClockTimer(self, callback, widget, name, needs_exposure)
+
+    def add(self, animation: ClockTimer):
+        if not animation.active:
+            animation.active = True
+            self.animations.append(animation)
+            if animation.widget is not None:
+                self.watch(animation.widget)
+        self.reschedule()
+
+    def remove(self, animation: ClockTimer):
+        if animation.active:
+            animation.active = False
+            self.animations.remove(animation)
+            self.reschedule()
+
+    def reschedule(self):
+        """Tick at the shortest visible interval, or not at all.
+
+        Also refreshes each timer's cached `visible`, which tick() reads
+        instead of querying the widget and its native window every time.
+        """
+        intervals = []
+        for animation in self.animations:
+            animation.visible = animation.is_visible()
+            if animation.visible:
+                intervals.append(animation.interval_ms)
+        if any(not a.active for a in self.animations):  # widgets deleted under us
+            self.animations = [a for a in self.animations if a.active]
+        if not intervals:
+            self.timer.stop()
+            self.tick_due = None
+            return
+        interval = max(self.MIN_TICK_MS, min(intervals))
+        if not self.timer.isActive() or self.interval_ms != interval:
+            self.timer.start(interval)
+            self.interval_ms = interval
+            self.tick_due = self.now() + interval
+
+    def watch(self, widget):
+        widget.installEventFilter(self)
+        window = widget.window()
+        if window is not widget:
+            window.installEventFilter(self)
+        if window.windowHandle():
+            # Expose events go to the QWindow, not the widget
+            window.windowHandle().installEventFilter(self)
+
+    def eventFilter(self, watched, event):
+        if event.type() in self.WATCHED_EVENTS:
+            if event.type() == QEvent.Type.Show and isinstance(watched, QWidget):
+                self.watch(watched)  # the native window may be new
+            self.reschedule()
+        return False
+
+    def tick(self):
+        self.ticks += 1
+        now = self.now()
+        # Event-loop lateness of this tick. A timer's own delay (now - due)
+        # also includes up to half a tick of phase, since due timers fire
+        # on the nearest tick.
+        interval_ms = self.interval_ms
+        tick_due = self.tick_due
+        if tick_due is None:
+            lateness = 0.0
+            tick_due = now + interval_ms
+        else:
+            lateness = max(0.0, now - tick_due)
+            tick_due += interval_ms
+            if tick_due <= now:
+                tick_due = now + interval_ms
+        self.lateness = lateness
+        self.tick_due = tick_due
+        # Half a tick of slack, so a timer firing a little early still counts
+        horizon = now + interval_ms / 2
+        stale = False
+        for animation in list(self.animations):
+            if animation.due > horizon or not animation.visible or not animation.active:
+                continue
+            if animation.widget is not None and sip.isdeleted(animation.widget):
+                animation.active = False  # deleted without a hide event reaching us
+                stale = True
+                continue
+            # Interval 0 means every tick
+            interval = animation.interval_ms or interval_ms
+            animation.last_delay = now - animation.due
+            animation.last_lateness = lateness
+            dropped = 0
+            animation.due += interval
+            if animation.due <= now:
+                dropped = int((now - animation.due) // interval) + 1
+                animation.due = now + interval  # fell behind; don't burst
+            if self.stats is not None:
+                actual = now - animation.last_fired if animation.last_fired is not None else None
+                self.stats.record_fire(animation.name, interval, actual, animation.last_delay, dropped)
+            animation.last_fired = now
+            animation.callback()
+        if stale:
+            self.reschedule()
+
+
+class Tween(QObject):
+    """Moves a QPoint property from start to end over `duration` ms.
+
+    Covers the QPropertyAnimation calls the controller makes, but steps
+    on the shared clock instead of Qt's own animation timer.
+    """
+
+    finished = pyqtSignal()
+
+    def __init__(self, target=None, property_name: bytes = b"pos", clock=None):
+        super().__init__()
+        self.clock = clock or shared_clock()
+        self.property_name = bytes(property_name).decode()
+        self.target = None
+        self.duration = 250
+        self.start_value = QPoint()
+        self.end_value = QPoint()
+        self.easing = QEasingCurve(QEasingCurve.Type.Linear)
+        self.linear = True  # skip the curve lookup in step()
+        self.started = 0.0
+        self.path = (0, 0, 0, 0)  # start x, start y, delta x, delta y
+        self.timer = self.clock.timer_for(self.step, name="walk", needs_exposure=False)
+        self.setTargetObject(target)
+
+    def setTargetObject(self, target):
+        self.stop()
+        self.target = target
+        self.timer.widget = target
+        # Looked up once: a missing attribute on a QWidget is a slow sip lookup
+        self.step_source = target if hasattr(target, "animation_step_ms") else None
+
+    def setDuration(self, duration_ms: int):
+        self.duration = duration_ms
+
+    def setEasingCurve(self, curve):
+        self.easing = QEasingCurve(curve)
+        self.linear = self.easing.type() == QEasingCurve.Type.Linear
+
+    def setStartValue(self, value: QPoint):
+        self.start_value = QPoint(value)
+
+    def setEndValue(self, value: QPoint):
+        self.end_value = QPoint(value)
+
+    def start(self):
+        self.started = self.clock.now()
+        # Plain ints for step(), which runs every tick
+        self.path = (self.start_value.x(), self.start_value.y(),
+                     self.end_value.x() - self.start_value.x(),
+                     self.end_value.y() - self.start_value.y())
+        setattr(self.target, self.property_name, self.start_value)
+        self.timer.start(self.update_interval())
+
+    def update_interval(self) -> int:
+        """Step interval in ms; 0 steps on every clock tick.
+
+        A target with an `animation_step_ms` attribute (CharacterWidget)
+        sets it, so an adaptive frame rate also coarsens the walk.
+        """
+        return self.step_source.animation_step_ms if self.step_source is not None else 0
+
+    def stop(self):
+        self.timer.stop()
+
+    def isActive(self) -> bool:
+        return self.timer.isActive()
+
+    def step(self):
+        progress = min(1.0, (self.clock.now() - self.started) / max(1, self.duration))
+        eased = progress if self.linear else self.easing.valueForProgress(progress)
+        x, y, dx, dy = self.path
+        if self.clock.stats is not None:
+            # How far the previous position had fallen behind the wall clock
+            speed = math.hypot(dx, dy) / max(1, self.duration)
+            self.clock.stats.record_walk_lag(max(0.0, self.timer.last_delay) * speed)
+        setattr(self.target, self.property_name, QPoint(x + round(dx * eased), y + round(dy * eased)))
+        if progress >= 1.0:
+            self.stop()
+            self.finished.emit()
+        elif self.timer.interval_ms != self.update_interval():
+            self.timer.start(self.update_interval())
+
+
+class FrameRateGovernor:
+    """Chooses an animation rate level from measured per-frame cost.
+
+    Cost is paint time plus how late the frame timer ran (event-loop
+    delay), smoothed with an EWMA. Above BUDGET_MS the rate steps down
+    a level; after RAISE_AFTER samples well under budget it steps back
+    up. The EWMA carries across a change: the SETTLE_SAMPLES after it
+    still feed the average but cannot move the level again. The policy
+    bounds the levels:
+
+    - "smooth": always full rate;
+    - "adaptive": full rate while there is headroom;
+    - "power saver": starts coarse (battery, VDI) and only goes lower.
+    """
+
+    # (walk step ms, frame interval factor); walk step 0 = every clock tick
+    LEVELS = ((0, 1.0), (33, 1.0), (50, 1.5), (100, 2.0))
+    POLICIES = {"smooth": (0, 0), "adaptive": (0, 3), "power saver": (2, 3)}
+    BUDGET_MS = 6.0
+    RAISE_AFTER = 40
+    SETTLE_SAMPLES = 10  # no level change this soon after the last one
+    ALPHA = 0.2
+
+    def __init__(self, policy: str = "adaptive"):
+        self.changes = 0
+        self.set_policy(policy)
+
+    def set_policy(self, policy: str):
+        self.policy = policy if policy in self.POLICIES else "adaptive"
+        self.lowest, self.highest = self.POLICIES[self.policy]
+        self.level = self.lowest
+        self.cost = 0.0
+        self.samples = 0
+        self.calm = 0
+
+    @property
+    def walk_step_ms(self) -> int:
+        return self.LEVELS[self.level][0]
+
+    def frame_ms(self, base_ms: int) -> int:
+        return round(base_ms * self.LEVELS[self.level][1])
+
+    def record(self, cost_ms: float) -> bool:
+        """Add one frame's cost; returns True if the level changed."""
+        self.samples += 1
+        self.cost += self.ALPHA * (cost_ms - self.cost)
+        if self.samples <= self.SETTLE_SAMPLES:
+            return False
+        if self.cost > self.BUDGET_MS and self.level < self.highest:
+            return self._move(1)
+        self.calm = self.calm + 1 if self.cost < self.BUDGET_MS / 2 else 0
+        if self.calm >= self.RAISE_AFTER and self.level > self.lowest:
+            return self._move(-1)
+        return False
+
+    def _move(self, step: int) -> bool:
+        self.level += step
+        self.changes += 1
+        self.samples = self.calm = 0
+        return True
+
+    def status(self) -> str:
+        walk = f"{self.walk_step_ms} ms" if self.walk_step_ms else "every tick"
+        return (f"{self.policy}, level {self.level} (walk {walk}, frames x{self.LEVELS[self.level][1]:g}), "
+                f"cost {self.cost:.1f}/{self.BUDGET_MS:g} ms, {self.changes} changes")
+
+
+class WakeupCounter(QObject):
+    """Counts timer events on the GUI thread, app-wide, by timer name.
+
+    Installed as an application event filter, so it sees Qt's internal
+    timers as well as ours; it costs a Python call per event and is
+    only installed on request. The owner flags idle periods with
+    set_idle(); fires during them are reported per minute.
+    """
+
+    def __init__(self, app):
+        super().__init__(app)
+        self.total = 0
+        self.idle = False
+        self.idle_since = None
+        self.idle_seconds = 0.0
+        self.idle_fires = Counter()  # timer name -> fires while idle
+        app.installEventFilter(self)
+
+    def eventFilter(self, watched, event):
+        if event.type() == QEvent.Type.Timer:
+            self.total += 1
+            if self.idle:
+                name = watched.objectName() or watched.metaObject().className()
+                self.idle_fires[name] += 1
+        return False
+
+    def set_idle(self, idle: bool):
+        if idle == self.idle:
+            return
+        now = time.monotonic()
+        if self.idle:
+            self.idle_seconds += now - self.idle_since
+        self.idle = idle
+        self.idle_since = now if idle else None
+
+    def idle_minutes(self) -> float:
+        seconds = self.idle_seconds
+        if self.idle:
+            seconds += time.monotonic() - self.idle_since
+        return seconds / 60
+
+    def idle_rate(self) -> float:
+        """Timer fires per minute while idle."""
+        minutes = self.idle_minutes()
+        return sum(self.idle_fires.values()) / minutes if minutes else 0.0
+
+    def report(self) -> str:
+        lines = [
+            f"Timer wakeups while idle: {self.idle_rate():.1f}/min over "
+            f"{self.idle_minutes() * 60:.0f} s idle ({self.total} timer events in total)"
+        ]
+        for name, fires in self.idle_fires.most_common():
+            lines.append(f"  {name}: {fires}")
+        return "\n".join(lines)
+
+
+@lru_cache(maxsize=None)
+def shared_clock() -> AnimationClock:
+    """The app-wide clock (created on first use, after QApplication)."""
+    return AnimationClock()
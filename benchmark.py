@@ -0,0 +1,1047 @@
+"""
+Hit & Run Panda - Performance Benchmarks
+Runs headless (offscreen Qt platform) and prints timings.
+
+Usage: python benchmark.py [name ...]
+"""
+
+import io
+import json
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import zipfile
+from datetime import datetime, timedelta
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import Qt, QEventLoop, QSize, QThreadPool, QTimer
+from PyQt6.QtGui import QImageReader, QPixmap, QPixmapCache
+from PyQt6.QtWidgets import (
+    QApplication, QFrame, QHBoxLayout, QLabel, QPushButton, QVBoxLayout, QWidget,
+)
+
+import main
+import theme
+from crowd import PetCrowd
+from sprite_cache import SpriteDiskCache
+
+
+def timed(app, label: str, build, runs: int = 50):
+    """Build, show and tear down a widget `runs` times; print the mean cost."""
+    # Warm-up so one-off costs (font database, style plugin) are excluded
+    widget = build()
+    widget.deleteLater()
+    app.processEvents()
+
+    start = time.perf_counter()
+    for _ in range(runs):
+        widget = build()
+        widget.show()
+        app.processEvents()
+        widget.hide()
+        widget.deleteLater()
+    app.processEvents()
+    elapsed = (time.perf_counter() - start) / runs * 1000
+    print(f"  {label:<16} {elapsed:8.2f} ms")
+    return elapsed
+
+
+def bench_dialogs(app):
+    """Widget construction + first show for each dialog."""
+
+    class _Controller:
+        settings = main.load_settings()
+
+        def show_red_alert(self, message):
+            pass
+
+    timed(app, "PaintedBubble", lambda: main.PaintedBubble(main.BubbleRenderer(), "Did you drink water?",
+                                                     lambda: None, lambda: None))
+    timed(app, "SettingsDialog", lambda: main.SettingsDialog(_Controller()))
+    timed(app, "HistoryDialog", lambda: main.HistoryDialog())
+    def red_alert():
+        screen = main.RedAlertScreen("DRINK WATER NOW!", None)
+        screen.present(screen.message)
+        return screen
+
+    timed(app, "RedAlertScreen", red_alert, runs=10)
+
+
+class LabelBubble(QWidget):
+    """The old QLabel/QPushButton speech bubble, for comparison.
+
+    Kept for bench_bubble, which times it built per reminder and pooled:
+    set_task() re-targets the text and callbacks, and prewarm() polishes
+    it and creates its native window ahead of time.
+    """
+
+    def __init__(self, task: str = "", on_yes=None, on_no=None, from_left: bool = False):
+        super().__init__()
+        self.setWindowFlags(
+            Qt.WindowType.FramelessWindowHint |
+            Qt.WindowType.WindowStaysOnTopHint |
+            Qt.WindowType.Tool
+        )
+        self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
+        self.setup_ui()
+        self.set_task(task, on_yes, on_no, from_left)
+
+    def set_task(self, task: str, on_yes, on_no, from_left: bool = False):
+        self.task_label.setText(task)
+        self.on_yes = on_yes
+        self.on_no = on_no
+        self.from_left = from_left
+
+    def prewarm(self):
+        """Resolve styles, fonts and layout and create the native window."""
+        for widget in [self] + self.findChildren(QWidget):
+            widget.ensurePolished()
+        self.layout().activate()
+        self.winId()
+
+    def on_yes_clicked(self):
+        if self.on_yes:
+            self.on_yes()
+
+    def on_no_clicked(self):
+        if self.on_no:
+            self.on_no()
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(15, 15, 15, 15)
+
+        container = QFrame()
+        container.setObjectName("bubbleContainer")
+        container_layout = QVBoxLayout(container)
+        container_layout.setSpacing(12)
+
+        self.task_label = QLabel()
+        self.task_label.setWordWrap(True)
+        self.task_label.setFont(theme.get_font(11))
+        self.task_label.setObjectName("bubbleText")
+        self.task_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        container_layout.addWidget(self.task_label)
+
+        btn_layout = QHBoxLayout()
+
+        yes_btn = QPushButton("YES ✓")
+        yes_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+        yes_btn.setProperty("variant", "yes")
+        yes_btn.clicked.connect(self.on_yes_clicked)
+
+        no_btn = QPushButton("NO ✗")
+        no_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+        no_btn.setProperty("variant", "no")
+        no_btn.clicked.connect(self.on_no_clicked)
+
+        btn_layout.addWidget(yes_btn)
+        btn_layout.addWidget(no_btn)
+        container_layout.addLayout(btn_layout)
+
+        layout.addWidget(container)
+        self.setFixedSize(240, 130)
+
+
+def bench_bubble(app, runs: int = 100):
+    """Panda arrival to clickable bubble: new, pooled and pre-rendered bubbles."""
+    tasks = main.get_default_settings()["tasks"]
+
+    def fresh(i):
+        bubble = LabelBubble(tasks[i % len(tasks)], lambda: None, lambda: None)
+        bubble.show()
+        app.processEvents()
+        bubble.hide()
+        bubble.deleteLater()
+
+    pooled_bubble = LabelBubble()
+    pooled_bubble.prewarm()
+
+    def pooled(i):
+        pooled_bubble.set_task(tasks[i % len(tasks)], lambda: None, lambda: None)
+        pooled_bubble.show()
+        app.processEvents()
+        pooled_bubble.hide()
+
+    renderer = main.BubbleRenderer()
+    painted_bubble = main.PaintedBubble(renderer)
+    painted_bubble.prewarm()
+
+    def painted(i):
+        painted_bubble.set_task(tasks[i % len(tasks)], lambda: None, lambda: None, i % 2 == 0)
+        painted_bubble.show()
+        app.processEvents()
+        painted_bubble.hide()
+
+    for label, arrive in [
+        ("new per reminder", fresh),
+        ("pooled, pre-warmed", pooled),
+        ("painted pixmaps", painted),
+    ]:
+        arrive(0)  # warm-up
+        app.processEvents()
+        elapsed = 0.0
+        for i in range(runs):
+            start = time.perf_counter()
+            arrive(i)
+            elapsed += time.perf_counter() - start
+            app.processEvents()  # deleteLater outside the timed region
+        print(f"  {label:<20} {elapsed / runs * 1000:8.2f} ms to clickable")
+    total = renderer.hits + renderer.misses
+    print(f"  bubble pixmap cache: {renderer.hits}/{total} hits "
+          f"({renderer.hits / total:.0%}, {len(tasks)} tasks x 2 sides)")
+    pooled_bubble.deleteLater()
+    painted_bubble.deleteLater()
+
+
+def bench_history_search(app, entries: int = 100_000):
+    """History index build and per-keystroke filter cost on a large history."""
+    tasks = main.get_default_settings()["tasks"]
+    start_time = datetime(2024, 1, 1)
+    history = [
+        {
+            "task": random.choice(tasks),
+            "completed": random.random() < 0.6,
+            "timestamp": (start_time + timedelta(minutes=7 * i)).isoformat(),
+        }
+        for i in range(entries)
+    ]
+
+    start = time.perf_counter()
+    index = main.HistoryIndex(history)
+    print(f"  index build ({entries} entries) {(time.perf_counter() - start) * 1000:8.2f} ms")
+
+    # The dialog indexes a chunk per event-loop pass after it is shown
+    chunks = []
+    lazy = main.HistoryIndex(history, lazy=True)
+    while True:
+        start = time.perf_counter()
+        done = lazy.build(main.HistoryIndex.BUILD_CHUNK)
+        chunks.append(time.perf_counter() - start)
+        if done:
+            break
+    if lazy.search("drink missed") != index.search("drink missed"):
+        raise SystemExit("history: chunked index build disagrees with the full build")
+    print(f"  chunked build: {len(chunks)} chunks, worst {max(chunks) * 1000:.2f} ms, "
+          f"total {sum(chunks) * 1000:.2f} ms")
+
+    load_history = main.load_history
+    main.load_history = lambda: history
+    try:
+        start = time.perf_counter()
+        dialog = main.HistoryDialog()
+        dialog.show()
+        app.processEvents()
+        shown = time.perf_counter() - start
+        while not dialog.history_index.done:
+            app.processEvents()
+        indexed = time.perf_counter() - start
+    finally:
+        main.load_history = load_history
+    print(f"  HistoryDialog shown {shown * 1000:8.2f} ms, fully indexed {indexed * 1000:8.2f} ms "
+          f"({dialog.proxy.rowCount()} rows)")
+    dialog.deleteLater()
+
+    model = main.HistoryModel(index)
+    proxy = main.HistoryFilterProxy()
+    proxy.setSourceModel(model)
+    # Simulate typing one character at a time
+    for query in ["d", "dr", "dri", "drink", "drink m", "drink missed", "2024-03", ""]:
+        start = time.perf_counter()
+        proxy.set_rows(index.search(query))
+        app.processEvents()
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"  {query!r:<16} {proxy.rowCount():>7} rows {elapsed:8.2f} ms")
+
+
+def bench_sprites(app, runs: int = 20):
+    """SpriteManager startup cost, disk cache and resident pixmap memory."""
+    all_states = list(main.SpriteManager.SPRITE_FILES) + ["walk_mirror"]
+    size = main.CONFIG["character_size"]
+    pool = QThreadPool.globalInstance()
+
+    def report(label, cache_dir, states=(), fresh_cache=False, background=False):
+        blocked = ready = 0.0
+        for _ in range(runs):
+            if fresh_cache:
+                shutil.rmtree(cache_dir, ignore_errors=True)
+            # QPixmap(path) is served from QPixmapCache after the first load,
+            # so clear it to time a cold decode each run
+            QPixmapCache.clear()
+            start = time.perf_counter()
+            sprites = main.SpriteManager(size, cache_dir=cache_dir, background=background)
+            for state in states:
+                sprites.frames(state)
+            blocked += time.perf_counter() - start
+            if not sprites.ready.done():
+                loop = QEventLoop()
+                sprites.when_ready(loop.quit)
+                loop.exec()
+            ready += time.perf_counter() - start
+            # Let background atlas builds finish outside the timed region
+            pool.waitForDone()
+            app.processEvents()
+        print(f"  {label:<24} blocked {blocked / runs * 1000:7.2f} ms  ready {ready / runs * 1000:7.2f} ms "
+              f"{sprites.pixmap_bytes() / 1024:7.1f} KiB  loaded={sorted(sprites.sprites)}")
+        if not states:
+            # With or without an atlas only the startup states are loaded; the rest on first use
+            eager = set(main.SpriteManager.EAGER_STATES)
+            if set(sprites.sprites) != eager:
+                raise SystemExit(f"sprites: {label} loaded {sorted(sprites.sprites)} at startup, "
+                                 f"expected {sorted(eager)}")
+            victory = sprites.frames("victory")
+            if (len(victory) != len(main.SpriteManager.SPRITE_FILES["victory"])
+                    or any(f.isNull() for f in victory) or not sprites.is_loaded("victory")):
+                raise SystemExit(f"sprites: {label} could not load victory on first use")
+
+    print(f"  ({pool.maxThreadCount()} pool threads)")
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_dir = os.path.join(tmp, "sprites")
+        report("startup, no cache", None)
+        report("startup, threaded", None, background=True)
+        report("all states, no cache", None, all_states)
+        report("startup, cold cache", cache_dir, fresh_cache=True)
+        report("startup, atlas", cache_dir)
+        report("startup, atlas threaded", cache_dir, background=True)
+        report("all states, atlas", cache_dir, all_states)
+
+    # HiDPI pyramid: 2x top level from the sources, 1x derived from it
+    with tempfile.TemporaryDirectory() as cache_dir:
+        QPixmapCache.clear()
+        start = time.perf_counter()
+        sprites = main.SpriteManager(size, dpr=2.0, cache_dir=cache_dir)
+        for state in all_states:
+            sprites.frames(state)
+        top = time.perf_counter() - start
+        start = time.perf_counter()
+        sprites.set_dpr(1.0)
+        for state in all_states:
+            sprites.frames(state)
+        derived = time.perf_counter() - start
+        pool.waitForDone()
+        print(f"  pyramid 2x from sources  {top * 1000:8.2f} ms")
+        print(f"  pyramid 1x derived       {derived * 1000:8.2f} ms  "
+              f"{sprites.pixmap_bytes() / 1024:7.1f} KiB for both levels")
+        start = time.perf_counter()
+        sprites.set_dpr(2.0)
+        sprites.set_dpr(1.0)
+        print(f"  level switch 2x <-> 1x   {(time.perf_counter() - start) * 1000:8.2f} ms")
+
+    # A screen change (set_dpr) while the startup level is still decoding
+    # must not lose `ready`, or the first reminder never starts
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for label, directory in [("no cache", None), ("cold cache", cache_dir), ("atlas", cache_dir)]:
+            QPixmapCache.clear()
+            sprites = main.SpriteManager(size, dpr=1.0, cache_dir=directory, background=True)
+            sprites.set_dpr(2.0)
+            if not sprites.ready.done():
+                loop = QEventLoop()
+                sprites.when_ready(loop.quit)
+                QTimer.singleShot(5000, loop.quit)
+                loop.exec()
+            if not sprites.ready.done():
+                raise SystemExit(f"sprites: ready never resolved after a DPR switch while loading ({label})")
+            pool.waitForDone()
+        print("  DPR switch while loading  ready resolved (no cache, cold cache, atlas)")
+
+
+def bench_assets(app, runs: int = 10):
+    """Cold sprite decode from assets/ vs the compiled_assets/ pipeline output."""
+    compiled = os.path.join(os.path.dirname(os.path.abspath(__file__)), "compiled_assets")
+    if not os.path.isdir(compiled):
+        print("  compiled_assets/ missing; run: python build_assets.py")
+        return
+    all_states = list(main.SpriteManager.SPRITE_FILES) + ["walk_mirror"]
+    size = main.CONFIG["character_size"]
+    source_dir = main.ASSETS_DIR
+    for label, directory in [("assets/", source_dir), ("compiled_assets/", compiled)]:
+        files = [f for frames in main.SpriteManager.SPRITE_FILES.values() for f in frames]
+        on_disk = sum(os.path.getsize(os.path.join(directory, f)) for f in files)
+        main.ASSETS_DIR = directory
+        elapsed = 0.0
+        for _ in range(runs):
+            QPixmapCache.clear()
+            start = time.perf_counter()
+            sprites = main.SpriteManager(size, cache_dir=None)
+            for state in all_states:
+                sprites.frames(state)
+            elapsed += time.perf_counter() - start
+        print(f"  {label:<18} {on_disk / 1024:8.1f} KiB sprites  {elapsed / runs * 1000:8.2f} ms cold decode")
+    main.ASSETS_DIR = source_dir
+
+
+def bench_transforms(app, ticks: int = 500):
+    """Per-tick cost of mirrored / rotated reaction frames, cached vs not."""
+    size = main.CONFIG["character_size"]
+    sprites = main.SpriteManager(size, cache_dir=None)
+    angry = sprites.frames("angry")[0]
+
+    def uncached(i):
+        transform = main.QTransform().rotate(4 if i % 2 else -4).scale(-1, 1)
+        return angry.transformed(transform, Qt.TransformationMode.SmoothTransformation)
+
+    def cached(i):
+        return sprites.get_angry(True, 1.0, 4 if i % 2 else -4)
+
+    def victory_cached(i):
+        return sprites.get_victory_frame(i % 3, True)
+
+    for label, tick in [
+        ("angry wobble, per tick", uncached),
+        ("angry wobble, LRU", cached),
+        ("victory mirrored, LRU", victory_cached),
+    ]:
+        start = time.perf_counter()
+        for i in range(ticks):
+            tick(i)
+        print(f"  {label:<24} {(time.perf_counter() - start) / ticks * 1e6:8.1f} us/tick")
+    print(f"  LRU: {sprites.transform_hits} hits, {sprites.transform_misses} misses, "
+          f"{len(sprites.transforms)} entries, {sprites.pixmap_bytes() / 1024:.1f} KiB total")
+
+
+def bench_skins(app, frames: int = 240, ticks: int = 480):
+    """Long user animation: decode every frame up front vs stream through Skin."""
+    try:
+        from PIL import Image, ImageDraw
+    except ImportError:
+        print("  Pillow not installed; skipping (pip install Pillow)")
+        return
+    from skins import Skin
+
+    size = main.CONFIG["character_size"]
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, "long.gif")
+    images = []
+    for i in range(frames):
+        image = Image.new("RGB", (480, 480), "white")
+        x = i * 400 // frames
+        ImageDraw.Draw(image).ellipse((x, 160, x + 80, 240), fill="black")
+        images.append(image)
+    images[0].save(path, save_all=True, append_images=images[1:], duration=40, loop=0)
+
+    def eager():
+        reader = QImageReader(path)
+        reader.setScaledSize(QSize(size, size))
+        pixmaps = []
+        image = reader.read()
+        while not image.isNull():
+            pixmaps.append(QPixmap.fromImage(image))
+            image = reader.read()
+        return pixmaps
+
+    try:
+        start = time.perf_counter()
+        pixmaps = eager()
+        startup = time.perf_counter() - start
+        memory = sum(p.width() * p.height() * p.depth() // 8 for p in pixmaps)
+        start = time.perf_counter()
+        for i in range(ticks):
+            pixmaps[i % len(pixmaps)]
+        tick = time.perf_counter() - start
+        print(f"  {'eager, all frames':<20} {startup * 1000:8.1f} ms startup  "
+              f"{memory / 1024:8.1f} KiB  {tick / ticks * 1e6:8.1f} us/tick")
+
+        start = time.perf_counter()
+        skin = Skin.from_path(path, size, 1.0)
+        startup = time.perf_counter() - start
+        start = time.perf_counter()
+        for i in range(ticks):
+            skin.frame("walk", i)
+        tick = time.perf_counter() - start
+        print(f"  {'streamed, ring':<20} {startup * 1000:8.1f} ms startup  "
+              f"{skin.memory_bytes() / 1024:8.1f} KiB  {tick / ticks * 1e6:8.1f} us/tick")
+
+        # The same frames as a zip pack: one PNG member per frame
+        pack = os.path.join(directory, "long.zip")
+        with zipfile.ZipFile(pack, "w") as archive:
+            names = []
+            for i, image in enumerate(images):
+                buffer = io.BytesIO()
+                image.save(buffer, "PNG")
+                names.append(f"walk{i}.png")
+                archive.writestr(names[-1], buffer.getvalue())
+            archive.writestr("skin.json", json.dumps(
+                {"states": {"walk": {"frames": names, "duration": 40}}}
+            ))
+        disk_cache = SpriteDiskCache(os.path.join(directory, "cache"))
+        for label, cache in (("pack, no disk cache", None), ("pack, first switch", disk_cache),
+                             ("pack, cached frames", disk_cache)):
+            start = time.perf_counter()
+            skin = Skin.from_path(pack, size, 1.0, cache)
+            startup = time.perf_counter() - start
+            stream = skin.stream("walk")
+            start = time.perf_counter()
+            for i in range(ticks):
+                stream.started -= 0.15  # one 150 ms walk tick: every 4th frame is due
+                skin.frame("walk", i)
+            tick = time.perf_counter() - start
+            print(f"  {label:<20} {startup * 1000:8.1f} ms startup  "
+                  f"{skin.memory_bytes() / 1024:8.1f} KiB  {tick / ticks * 1e6:8.1f} us/tick"
+                  f"  ({stream.decoded} decodes, {len(stream.ring)} in ring)")
+            skin.close()
+            if stream.archive.zip.fp is not None:
+                raise SystemExit("skins: closing the skin left its pack open")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+class LabelCharacter(QWidget):
+    """The old QLabel-based CharacterWidget frame path, for comparison."""
+
+    def __init__(self, size: int):
+        super().__init__()
+        self.setWindowFlags(
+            Qt.WindowType.FramelessWindowHint |
+            Qt.WindowType.WindowStaysOnTopHint |
+            Qt.WindowType.Tool
+        )
+        self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
+        self.setFixedSize(size, size)
+        self.image_label = QLabel(self)
+        self.image_label.setFixedSize(size, size)
+        self.image_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+
+    def set_frame(self, pixmap):
+        self.image_label.setPixmap(pixmap)
+
+
+def bench_character_paint(app, frames: int = 2000, rounds: int = 8):
+    """Per-frame CPU time: painted CharacterWidget vs the old QLabel path."""
+    size = main.CONFIG["character_size"]
+    sprites = main.SpriteManager(size, cache_dir=None)
+    walk = sprites.frames("walk")
+    widgets = {
+        "paintEvent blit": main.CharacterWidget(sprites),
+        "QLabel.setPixmap": LabelCharacter(size),
+    }
+    for widget in widgets.values():
+        widget.show()
+        widget.set_frame(walk[0])  # warm-up
+    app.processEvents()
+
+    # Alternate short rounds so neither path gets the colder process
+    cpu = {label: [] for label in widgets}
+    wall = {label: [] for label in widgets}
+    for _ in range(rounds):
+        for label, widget in widgets.items():
+            start_cpu, start = time.process_time(), time.perf_counter()
+            for i in range(frames):
+                widget.set_frame(walk[i % len(walk)])
+                app.processEvents()
+            cpu[label].append((time.process_time() - start_cpu) / frames * 1e6)
+            wall[label].append((time.perf_counter() - start) / frames * 1e6)
+    for label, widget in widgets.items():
+        print(f"  {label:<18} {statistics.median(cpu[label]):8.1f} us CPU/frame "
+              f"{statistics.median(wall[label]):8.1f} us wall/frame  (median of {rounds})")
+        widget.hide()
+        widget.deleteLater()
+    app.processEvents()
+
+
+def bench_overlay(app, visits: int = 50):
+    """Reminder visit cost: separate panda + bubble windows vs one overlay."""
+    size = main.CONFIG["character_size"]
+    sprites = main.SpriteManager(size, cache_dir=None)
+    screen = app.primaryScreen()
+    geometry = screen.availableGeometry()
+    on_pos = main.QPoint(geometry.width() - size - 50, geometry.height() - size - 50)
+    bubble_pos = on_pos - main.QPoint(160, 50)
+    walk = [main.QPoint(on_pos.x() + 10 * step, on_pos.y()) for step in range(20, -1, -1)]
+
+    def windowed():
+        character = main.CharacterWidget(sprites)
+        character.show()
+        for i, pos in enumerate(walk):
+            character.pos = pos
+            character.set_frame(sprites.get_walk_frame(i % 4))
+            app.processEvents()
+        bubble = LabelBubble("Did you drink water?", lambda: None, lambda: None)
+        bubble.move(bubble_pos)
+        bubble.show()
+        app.processEvents()
+        bubble.hide()
+        bubble.deleteLater()
+        character.hide()
+        character.deleteLater()
+        app.processEvents()
+
+    overlay = main.PandaOverlay(sprites, screen)
+
+    def overlaid():
+        overlay.show()
+        for i, pos in enumerate(walk):
+            overlay.pos = pos
+            overlay.set_frame(sprites.get_walk_frame(i % 4))
+            app.processEvents()
+        overlay.show_bubble("Did you drink water?", lambda: None, lambda: None, bubble_pos)
+        app.processEvents()
+        overlay.hide_bubble()
+        overlay.hide()
+        app.processEvents()
+
+    for label, visit in [("separate windows", windowed), ("single overlay", overlaid)]:
+        visit()  # warm-up
+        start_cpu, start = time.process_time(), time.perf_counter()
+        for _ in range(visits):
+            visit()
+        cpu = (time.process_time() - start_cpu) / visits * 1000
+        wall = (time.perf_counter() - start) / visits * 1000
+        print(f"  {label:<18} {cpu:8.2f} ms CPU/visit {wall:8.2f} ms wall/visit")
+    overlay.deleteLater()
+
+
+def bench_animation(app, seconds: float = 2.0):
+    """Overlapping effects (walk, frame flips, alert flash/shake, crowd): wakeups and CPU."""
+    from PyQt6.QtCore import QPropertyAnimation
+    from animation import AnimationClock, Tween
+
+    intervals = {"frames": 150, "flash": 100, "shake": 50, "crowd": 33}
+    widget = QWidget()
+    widget.show()
+
+    def separate():
+        fires = [0]
+
+        def fire(*_args):
+            fires[0] += 1
+
+        timers = []
+        for interval in intervals.values():
+            timer = QTimer()
+            timer.timeout.connect(fire)
+            timer.start(interval)
+            timers.append(timer)
+        walk = QPropertyAnimation(widget, b"pos")
+        walk.setDuration(int(seconds * 1000))
+        walk.setStartValue(main.QPoint(0, 0))
+        walk.setEndValue(main.QPoint(500, 0))
+        walk.valueChanged.connect(fire)
+        walk.start()
+        return timers + [walk], lambda: fires[0]
+
+    def clocked():
+        clock = AnimationClock()
+        timers = [clock.timer_for(lambda: None, widget) for _ in intervals]
+        for timer, interval in zip(timers, intervals.values()):
+            timer.start(interval)
+        walk = Tween(widget, b"pos", clock)
+        walk.setDuration(int(seconds * 1000))
+        walk.setStartValue(main.QPoint(0, 0))
+        walk.setEndValue(main.QPoint(500, 0))
+        walk.start()
+        return timers + [walk, clock], lambda: clock.ticks
+
+    for label, setup in [("separate timers", separate), ("animation clock", clocked)]:
+        start_cpu = time.process_time()
+        keep, wakeups = setup()
+        loop = QEventLoop()
+        QTimer.singleShot(int(seconds * 1000), loop.quit)
+        loop.exec()
+        cpu = (time.process_time() - start_cpu) * 1000
+        for item in keep:
+            if hasattr(item, "stop"):
+                item.stop()
+        print(f"  {label:<18} {wakeups() / seconds:8.1f} wakeups/s {cpu / seconds:8.1f} ms CPU/s")
+    widget.deleteLater()
+
+
+def bench_clips(app, ticks: int = 20000):
+    """Per-tick frame stepping: the old per-state branches vs the compiled clip table."""
+    size = main.CONFIG["character_size"]
+    sprites = main.SpriteManager(size, cache_dir=None)
+    widget = main.CharacterWidget(sprites)
+    widget.show_sprite = lambda getter, *args: None  # time the stepping, not the blit
+
+    def branching_step(self):
+        """The old CharacterWidget.next_frame state machine (state in old_state)."""
+        if self.old_state == "walking":
+            self.walk_frame = (self.walk_frame + 1) % 4
+            self.show_sprite(sprites.get_walk_frame, self.walk_frame, self.is_mirrored)
+        elif self.old_state == "victory":
+            if not self.victory_jumping:
+                self.show_sprite(sprites.get_victory_frame, 0, self.is_mirrored)
+                self.victory_jumping = True
+                self.victory_cycle = 0
+            else:
+                jump_frame = 1 + (self.victory_cycle % 2)
+                self.show_sprite(sprites.get_victory_frame, jump_frame, self.is_mirrored)
+                self.victory_cycle += 1
+        elif self.old_state == "angry":
+            self.victory_cycle += 1
+            angle = 4 if self.victory_cycle % 2 else -4
+            self.show_sprite(sprites.get_angry, self.is_mirrored, 1.0, angle)
+
+    for state in ("walking", "victory", "angry"):
+        # Both run on the widget, whose attributes are slower than a plain object's
+        widget.is_mirrored = True
+        widget.old_state = state
+        widget.walk_frame = widget.victory_cycle = 0
+        widget.victory_jumping = False
+        start = time.perf_counter()
+        for _ in range(ticks):
+            branching_step(widget)
+        branching = (time.perf_counter() - start) / ticks * 1e9
+        widget.play(state)
+        start = time.perf_counter()
+        for _ in range(ticks):
+            widget.advance_clip()
+        table = (time.perf_counter() - start) / ticks * 1e9
+        print(f"  {state:<8} branches {branching:7.0f} ns/tick  clip table {table:7.0f} ns/tick")
+    widget.stop_animation()
+    widget.deleteLater()
+
+
+def bench_adaptive(app, seconds: float = 4.0, load_ms: float = 25.0):
+    """Walk under a busy event loop: CPU and frame rate level per policy."""
+    from animation import Tween
+
+    size = main.CONFIG["character_size"]
+    sprites = main.SpriteManager(size, cache_dir=None)
+
+    def busy():
+        time.sleep(load_ms / 1000)  # blocks the loop without using CPU
+
+    for policy in main.FrameRateGovernor.POLICIES:
+        character = main.CharacterWidget(sprites, policy)
+        character.show()
+        walk = Tween(character, b"pos")
+        walk.setDuration(int(seconds * 1000))
+        walk.setStartValue(main.QPoint(0, 0))
+        walk.setEndValue(main.QPoint(800, 0))
+        load = QTimer()
+        load.timeout.connect(busy)
+        load.start(40)
+        character.start_walking()
+        walk.start()
+        loop = QEventLoop()
+        walk.finished.connect(loop.quit)
+        start_cpu = time.process_time()
+        loop.exec()
+        cpu = (time.process_time() - start_cpu) / seconds * 1000
+        load.stop()
+        character.stop_animation()
+        print(f"  {policy:<12} {cpu:8.1f} ms CPU/s  {character.governor.status()}")
+        character.deleteLater()
+        app.processEvents()
+
+
+class LabelAlertScreen(QWidget):
+    """The old QLabel-tree red alert (palette flash, style sheet shake), for comparison."""
+
+    def __init__(self, message: str):
+        from PyQt6.QtGui import QPalette
+
+        super().__init__()
+        self.setWindowFlags(Qt.WindowType.FramelessWindowHint | Qt.WindowType.WindowStaysOnTopHint)
+        self.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        self.showFullScreen()
+        self.setAutoFillBackground(True)
+        self.flash_state = False
+        layout = QVBoxLayout(self)
+        layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        for text, font in [
+            ("⚠ WARNING ⚠", main.get_font(60, main.QFont.Weight.Bold, "Impact")),
+            (message, main.get_font(100, main.QFont.Weight.Bold, "Impact")),
+            ("DO IT NOW!", main.get_font(30, family="Arial")),
+        ]:
+            label = QLabel(text)
+            label.setFont(font)
+            label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            layout.addWidget(label)
+        self.message_label = layout.itemAt(1).widget()
+        button = QPushButton("I WILL DO IT")
+        button.setObjectName("alertButton")
+        layout.addWidget(button, alignment=Qt.AlignmentFlag.AlignCenter)
+        layout.addWidget(QLabel("(Press ESC or click button to close)"))
+        self.palette_role = QPalette.ColorRole.Window
+        clock = main.shared_clock()
+        self.flash_timer = clock.timer_for(self.flash, self, "alert flash")
+        self.flash_timer.start(100)
+        self.shake_timer = clock.timer_for(self.shake, self, "alert shake")
+        self.shake_timer.start(50)
+
+    def flash(self):
+        self.flash_state = not self.flash_state
+        palette = self.palette()
+        palette.setColor(self.palette_role,
+                         main.get_color("alert_flash_on" if self.flash_state else "alert_flash_off"))
+        self.setPalette(palette)
+
+    def shake(self):
+        ox, oy = random.randint(-5, 5), random.randint(-3, 3)
+        self.message_label.setStyleSheet(f"color: #ff0000; margin-left: {ox}px; margin-top: {oy}px;")
+
+    def closeEvent(self, event):
+        self.flash_timer.stop()
+        self.shake_timer.stop()
+        super().closeEvent(event)
+
+
+class FillBlitWidget(QWidget):
+    """Reference frame: one full-window fill plus one message-sized blit."""
+
+    def __init__(self):
+        super().__init__()
+        self.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent)
+        self.pixmap = main.QPixmap(600, 160)
+        self.pixmap.fill(main.get_color("alert_text"))
+
+    def paintEvent(self, event):
+        painter = main.QPainter(self)
+        painter.fillRect(event.rect(), main.get_color("alert_bg"))
+        painter.drawPixmap(100, 300, self.pixmap)
+        painter.end()
+
+
+def bench_alert(app, seconds: float = 60.0, frames: int = 200):
+    """Full-screen red alert: per-frame cost, then CPU while left running, QLabel tree vs painted."""
+
+    message = "WATER!"  # fits the offscreen screen, so the old layout keeps its size
+
+    def presented(screen):
+        screen.present(message)
+        return screen
+    variants = [
+        ("QLabel tree", lambda: LabelAlertScreen(message)),
+        ("painted surface", lambda: presented(main.RedAlertScreen(message, None))),
+    ]
+
+    for label, build in variants:
+        screen = build()
+        screen.show()
+        app.processEvents()
+        screen.flash_timer.stop()
+        screen.shake_timer.stop()
+        for effect in ("flash", "shake"):
+            step = getattr(screen, effect)
+            start = time.perf_counter()
+            for _ in range(frames):
+                step()
+                app.processEvents()  # polish, layout and paint whatever the step invalidated
+            cost = (time.perf_counter() - start) / frames * 1e6
+            print(f"  {label:<16} {effect} frame {cost:8.1f} us at {screen.width()}x{screen.height()}")
+        screen.close()
+        app.processEvents()
+
+    reference = FillBlitWidget()
+    reference.showFullScreen()
+    app.processEvents()
+    start = time.perf_counter()
+    for _ in range(frames):
+        reference.update()
+        app.processEvents()
+    print(f"  {'fill + blit':<16} frame       {(time.perf_counter() - start) / frames * 1e6:8.1f} us")
+    reference.close()
+
+    for label, build in variants:
+        screen = build()
+        screen.show()
+        app.processEvents()
+        start_cpu = time.process_time()
+        loop = QEventLoop()
+        QTimer.singleShot(int(seconds * 1000), loop.quit)
+        loop.exec()
+        cpu = (time.process_time() - start_cpu) * 1000 / seconds
+        print(f"  {label:<16} {cpu:8.1f} ms CPU/s ({cpu / 10:.1f}% of a core) over {seconds:g} s")
+        screen.close()
+        app.processEvents()
+
+
+def bench_alert_start(app, runs: int = 20):
+    """Red alert time-to-first-pixel: build on trigger vs show a pre-warmed hidden screen."""
+    from alert import text_pixmap
+
+    class TimedAlert(main.RedAlertScreen):
+        first_paint = None
+
+        def paintEvent(self, event):
+            super().paintEvent(event)
+            if self.first_paint is None:
+                self.first_paint = time.perf_counter()
+
+    def first_pixel(start, screen) -> float:
+        while screen.first_paint is None:
+            app.processEvents()
+        return (screen.first_paint - start) * 1000
+
+    def on_trigger(message):
+        text_pixmap.cache_clear()  # a fresh process has rendered nothing yet
+        start = time.perf_counter()
+        screen = TimedAlert(message, None)
+        screen.present(message)
+        return start, screen
+
+    def prewarmed(message):
+        screen = TimedAlert(message, None)
+        screen.prewarm()
+        app.processEvents()  # the idle time between startup and the alert
+        start = time.perf_counter()
+        screen.present(message)
+        return start, screen
+
+    message = "DRINK WATER NOW!"
+    for label, trigger in [("build on trigger", on_trigger), ("pre-warmed", prewarmed)]:
+        times = []
+        for _ in range(runs):
+            start, screen = trigger(message)
+            times.append(first_pixel(start, screen))
+            screen.on_dismiss_callback = None
+            screen.deleteLater()
+            app.processEvents()
+        print(f"  {label:<18} first {times[0]:7.1f} ms  median {statistics.median(times):7.1f} ms  "
+              f"max {max(times):7.1f} ms ({runs} alerts)")
+
+
+def bench_idle(app):
+    """Resident memory between reminders, before and after an idle trim."""
+    size = main.CONFIG["character_size"]
+    cache_dir = tempfile.mkdtemp()
+    try:
+        sprites = main.SpriteManager(size, cache_dir=cache_dir)
+        sprites.build_atlas(sprites.dpr)
+        # A session's worth of state: every state at two pyramid levels,
+        # reaction transforms, the overlay and the pooled bubble
+        for dpr in (sprites.dpr * 2, sprites.dpr):
+            sprites.set_dpr(dpr)
+            for state in sprites.ATLAS_STATES:
+                sprites.frames(state)
+        for angle in (-4, 4):
+            sprites.get_angry(True, 1.0, angle)
+        screen = app.primaryScreen()
+        renderer = main.BubbleRenderer()
+        overlay = main.PandaOverlay(sprites, screen, renderer)
+        overlay.show()
+        overlay.show_bubble("Did you drink water?", lambda: None, lambda: None, main.QPoint(100, 100))
+        app.processEvents()
+        overlay.hide()
+        bubble = main.PaintedBubble(renderer)
+        bubble.prewarm(main.get_default_settings()["tasks"])
+        app.processEvents()
+        main.release_freed_memory()
+
+        before = main.resident_memory()
+        pixmaps = sprites.pixmap_bytes()
+        sprites.trim()
+        renderer.clear()
+        overlay.deleteLater()
+        bubble.deleteLater()
+        app.processEvents()
+        main.release_freed_memory()
+        after = main.resident_memory()
+        if before is None or after is None:
+            print("  resident memory unavailable on this platform")
+        else:
+            print(f"  {'RSS while idle':<24} {before / 1024 ** 2:8.1f} MiB")
+            print(f"  {'RSS after trim':<24} {after / 1024 ** 2:8.1f} MiB "
+                  f"({pixmaps / 1024:.0f} KiB of pixmaps released)")
+
+        start = time.perf_counter()
+        sprites.restore()
+        loop = QEventLoop()
+        sprites.when_ready(loop.quit)
+        if not sprites.ready.done():
+            loop.exec()
+        print(f"  {'restore from atlas':<24} {(time.perf_counter() - start) * 1000:8.2f} ms")
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+def bench_crowd(app, ticks: int = 200):
+    """Frame time of crowd mode vs one window per pet, up to 100 pets."""
+    size = main.CONFIG["character_size"]
+    sprites = main.SpriteManager(size, cache_dir=None)
+    sprites.frames("walk_mirror")
+    width = app.primaryScreen().availableGeometry().width()
+
+    def run(label, count, advance):
+        advance()  # warm-up
+        app.processEvents()
+        start_cpu, start = time.process_time(), time.perf_counter()
+        for _ in range(ticks):
+            advance()
+            app.processEvents()
+        cpu = (time.process_time() - start_cpu) / ticks * 1000
+        wall = (time.perf_counter() - start) / ticks * 1000
+        print(f"  {label:<16} {count:>4} pets {cpu:8.3f} ms CPU/frame {wall:8.3f} ms wall/frame")
+        return cpu
+
+    counts = (1, 10, 25, 50, 100)
+    crowd_cpu = {}
+    for count in counts:
+        crowd = PetCrowd(sprites)
+        crowd.resize(width, 200)
+        for i in range(count):
+            crowd.add_pet(f"pet {i}")
+        crowd.show()
+        crowd_cpu[count] = run("crowd", count, lambda: crowd.tick(crowd.TICK_MS / 1000))
+        crowd.hide()
+        crowd.deleteLater()
+
+    window_cpu = {}
+    for count in counts:
+        pets = [main.CharacterWidget(sprites) for _ in range(count)]
+        for pet in pets:
+            pet.show()
+        state = {"step": 0}
+
+        def advance():
+            state["step"] += 1
+            step = state["step"]
+            for i, pet in enumerate(pets):
+                pet.pos = main.QPoint((i * 37 + step * 3) % width, 0)
+                pet.set_frame(sprites.get_walk_frame((step + i) // 5))
+
+        window_cpu[count] = run("window per pet", count, advance)
+        for pet in pets:
+            pet.hide()
+            pet.deleteLater()
+        app.processEvents()
+
+    for count in counts:
+        print(f"  {count:>4} pets  crowd {crowd_cpu[count] / window_cpu[count]:5.2f}x the window-per-pet CPU, "
+              f"{crowd_cpu[count] / crowd_cpu[1]:5.1f}x its own 1-pet frame")
+
+
+BENCHMARKS = {
+    "dialogs": bench_dialogs,
+    "bubble": bench_bubble,
+    "history": bench_history_search,
+    "sprites": bench_sprites,
+    "assets": bench_assets,
+    "transforms": bench_transforms,
+    "skins": bench_skins,
+    "paint": bench_character_paint,
+    "overlay": bench_overlay,
+    "crowd": bench_crowd,
+    "animation": bench_animation,
+    "clips": bench_clips,
+    "adaptive": bench_adaptive,
+    "alert": bench_alert,
+    "alert_start": bench_alert_start,
+    "idle": bench_idle,
+}
+
+
+def main_benchmark():
+    app = QApplication(sys.argv[:1])
+    theme.install(app)
+
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        if name not in BENCHMARKS:
+            print(f"Unknown benchmark: {name} (choose from {', '.join(BENCHMARKS)})")
+            return 1
+        print("=" * 50)
+        print(f"{name}: {BENCHMARKS[name].__doc__}")
+        print("=" * 50)
+        BENCHMARKS[name](app)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_benchmark())
@@ -0,0 +1,212 @@
+"""
+Hit & Run Panda - Pre-rendered Speech Bubble
+Renders the bubble body (frame, tail and wrapped task text) and the
+YES/NO buttons into cached pixmaps, and shows them in one painted
+widget that hit-tests clicks against plain rectangles.
+
+Bodies are cached per task text, side and DPR. Tasks come round-robin
+from the settings, so after one rotation every reminder is a cache hit
+and showing the bubble is three drawPixmap calls.
+"""
+
+from collections import OrderedDict
+
+from PyQt6.QtCore import Qt, QPointF, QRect, QRectF, QSize
+from PyQt6.QtGui import QColor, QFont, QPainter, QPainterPath, QPen, QPixmap
+from PyQt6.QtWidgets import QWidget
+
+from theme import get_font, get_color
+
+
+class BubbleRenderer:
+    """Cached bubble pixmaps plus the rectangles used for hit-testing.
+
+    All rectangles are relative to the bubble's top-left corner.
+    """
+
+    SIZE = QSize(240, 130)
+    FRAME = QRect(15, 15, 210, 100)
+    TEXT = QRect(27, 25, 186, 38)
+    BUTTONS = {
+        "yes": (QRect(27, 71, 90, 34), "YES ✓"),
+        "no": (QRect(123, 71, 90, 34), "NO ✗"),
+    }
+    MAX_BODIES = 32
+
+    def __init__(self):
+        self.bodies = OrderedDict()  # (task, from_left, dpr) -> QPixmap
+        self.buttons = {}  # (name, hovered, dpr) -> QPixmap
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self):
+        """Drop every cached pixmap (they are re-rendered on demand)."""
+        self.bodies.clear()
+        self.buttons.clear()
+
+    def button_at(self, point):
+        """Name of the button under `point` (bubble coordinates), or None."""
+        for name, (rect, _label) in self.BUTTONS.items():
+            if rect.contains(point):
+                return name
+        return None
+
+    def body(self, task: str, from_left: bool, dpr: float) -> QPixmap:
+        key = (task, from_left, dpr)
+        pixmap = self.bodies.get(key)
+        if pixmap is not None:
+            self.hits += 1
+            self.bodies.move_to_end(key)
+            return pixmap
+        self.misses += 1
+        pixmap = self.render_body(task, from_left, dpr)
+        self.bodies[key] = pixmap
+        if len(self.bodies) > self.MAX_BODIES:
+            self.bodies.popitem(last=False)
+        return pixmap
+
+    def button(self, name: str, hovered: bool, dpr: float) -> QPixmap:
+        key = (name, hovered, dpr)
+        if key not in self.buttons:
+            self.buttons[key] = self.render_button(name, hovered, dpr)
+        return self.buttons[key]
+
+    @staticmethod
+    def _canvas(size: QSize, dpr: float) -> QPixmap:
+        pixmap = QPixmap(round(size.width() * dpr), round(size.height() * dpr))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        return pixmap
+
+    def render_body(self, task: str, from_left: bool, dpr: float) -> QPixmap:
+        pixmap = self._canvas(self.SIZE, dpr)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+        frame = QRectF(self.FRAME).adjusted(1.5, 1.5, -1.5, -1.5)
+        path = QPainterPath()
+        path.addRoundedRect(frame, 15, 15)
+        # Tail on the side facing the panda
+        tail = QPainterPath()
+        y = frame.bottom() - 30
+        if from_left:
+            tail.moveTo(frame.left() + 1, y)
+            tail.lineTo(2, y + 22)
+            tail.lineTo(frame.left() + 1, y + 14)
+        else:
+            tail.moveTo(frame.right() - 1, y)
+            tail.lineTo(self.SIZE.width() - 2, y + 22)
+            tail.lineTo(frame.right() - 1, y + 14)
+        tail.closeSubpath()
+        painter.setPen(QPen(get_color("text"), 3))
+        painter.setBrush(QColor("white"))
+        painter.drawPath(path.united(tail))
+
+        painter.setFont(get_font(11))
+        painter.drawText(
+            self.TEXT, Qt.AlignmentFlag.AlignCenter | Qt.TextFlag.TextWordWrap, task
+        )
+        painter.end()
+        return pixmap
+
+    def render_button(self, name: str, hovered: bool, dpr: float) -> QPixmap:
+        rect, label = self.BUTTONS[name]
+        pixmap = self._canvas(rect.size(), dpr)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(get_color(f"{name}_hover" if hovered else name))
+        local = QRectF(0, 0, rect.width(), rect.height())
+        painter.drawRoundedRect(local, 10, 10)
+        painter.setFont(get_font(10, QFont.Weight.Bold))
+        painter.setPen(QColor("white"))
+        painter.drawText(local, Qt.AlignmentFlag.AlignCenter, label)
+        painter.end()
+        return pixmap
+
+    def paint(self, painter: QPainter, origin, task: str, from_left: bool,
+              hovered: str, dpr: float):
+        """Draw a whole bubble with its top-left corner at `origin`."""
+        origin = QPointF(origin)
+        painter.drawPixmap(origin, self.body(task, from_left, dpr))
+        for name, (rect, _label) in self.BUTTONS.items():
+            painter.drawPixmap(
+                origin + QPointF(rect.topLeft()), self.button(name, hovered == name, dpr)
+            )
+
+
+class PaintedBubble(QWidget):
+    """Speech bubble drawn from BubbleRenderer pixmaps, no child widgets.
+
+    Same interface as the old widget bubble (set_task, prewarm; see
+    benchmark.LabelBubble), so the controller can reuse one instance
+    for every reminder.
+    """
+
+    def __init__(self, renderer: BubbleRenderer = None, task: str = "",
+                 on_yes=None, on_no=None, from_left: bool = False):
+        super().__init__()
+        self.setWindowFlags(
+            Qt.WindowType.FramelessWindowHint |
+            Qt.WindowType.WindowStaysOnTopHint |
+            Qt.WindowType.Tool
+        )
+        self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
+        self.setMouseTracking(True)
+        self.renderer = renderer or BubbleRenderer()
+        self.setFixedSize(self.renderer.SIZE)
+        self.hovered = None
+        self.set_task(task, on_yes, on_no, from_left)
+
+    def set_task(self, task: str, on_yes, on_no, from_left: bool = False):
+        self.task = task
+        self.on_yes = on_yes
+        self.on_no = on_no
+        self.from_left = from_left
+        self.hovered = None
+        self.unsetCursor()
+        self.update()
+
+    def prewarm(self, tasks=()):
+        """Create the native window and render `tasks` ahead of use."""
+        self.winId()
+        dpr = self.devicePixelRatioF()
+        for name in self.renderer.BUTTONS:
+            for hovered in (False, True):
+                self.renderer.button(name, hovered, dpr)
+        for task in tasks:
+            for from_left in (False, True):
+                self.renderer.body(task, from_left, dpr)
+
+    def mouseMoveEvent(self, event):
+        hovered = self.renderer.button_at(event.position().toPoint())
+        if hovered != self.hovered:
+            self.hovered = hovered
+            if hovered:
+                self.setCursor(Qt.CursorShape.PointingHandCursor)
+            else:
+                self.unsetCursor()
+            self.update()
+
+    def leaveEvent(self, event):
+        if self.hovered:
+            self.hovered = None
+            self.unsetCursor()
+            self.update()
+
+    def mousePressEvent(self, event):
+        if event.button() != Qt.MouseButton.LeftButton:
+            return
+        button = self.renderer.button_at(event.position().toPoint())
+        if button == "yes" and self.on_yes:
+            self.on_yes()
+        elif button == "no" and self.on_no:
+            self.on_no()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        self.renderer.paint(
+            painter, QPointF(0, 0), self.task, self.from_left, self.hovered,
+            self.devicePixelRatioF()
+        )
+        painter.end()
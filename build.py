@@ -25,7 +25,7 @@ def main():
     
     # Install requirements
     print("\n1. Installing requirements...")
-    subprocess.run([sys.executable, "-m", "pip", "install", "-q", "pyinstaller", "pyqt6"])
+    subprocess.run([sys.executable, "-m", "pip", "install", "-q", "pyinstaller", "pyqt6", "Pillow"])
     
     # Clean old builds
     print("\n2. Cleaning old builds...")
@@ -33,33 +33,40 @@ def main():
         if os.path.exists(folder):
             shutil.rmtree(folder, ignore_errors=True)
     
+    # Pre-scaled, quantized assets (only changed inputs are recompiled)
+    print("\n3. Compiling assets...")
+    from build_assets import ensure_compiled_assets
+    assets_dir = ensure_compiled_assets()
+    
     # Build
-    print("\n3. Building executable...")
+    print("\n4. Building executable...")
     
     if IS_MAC:
-        build_mac()
+        build_mac(assets_dir)
     else:
-        build_windows()
+        build_windows(assets_dir)
     
     print("\n" + "=" * 50)
     print("BUILD COMPLETE!")
     print("=" * 50)
 
 
-def build_mac():
+def build_mac(assets_dir="assets"):
     """Build macOS .app bundle."""
     cmd = [
         sys.executable, "-m", "PyInstaller",
         "--name", APP_NAME,
         "--windowed",  # .app bundle
         "--onefile",
-        "--add-data", "assets:assets",
+        "--add-data", f"{assets_dir}:assets",
         "--hidden-import", "PyQt6.QtNetwork",
         "main.py"
     ]
     
     # Add icon if exists
-    icon_path = Path("assets/app.icns")
+    icon_path = Path(assets_dir) / "app.icns"
+    if not icon_path.exists():
+        icon_path = Path("assets/app.icns")
     if icon_path.exists():
         cmd.extend(["--icon", str(icon_path)])
     
@@ -75,20 +82,20 @@ def build_mac():
         sys.exit(1)
 
 
-def build_windows():
+def build_windows(assets_dir="assets"):
     """Build Windows .exe."""
     cmd = [
         sys.executable, "-m", "PyInstaller",
         "--name", APP_NAME,
         "--windowed",
         "--onefile",
-        "--add-data", "assets;assets",
+        "--add-data", f"{assets_dir};assets",
         "--hidden-import", "PyQt6.QtNetwork",
         "main.py"
     ]
     
     # Add icon if exists
-    icon_path = Path("assets/app.ico")
+    icon_path = Path(assets_dir) / "app.ico"
     if icon_path.exists():
         cmd.extend(["--icon", str(icon_path)])
     
@@ -106,7 +113,7 @@ def build_windows():
 
 def create_dmg():
     """Create macOS DMG for distribution."""
-    print("\n4. Creating DMG...")
+    print("\n5. Creating DMG...")
     
     dmg_name = f"{APP_NAME}_{VERSION}.dmg"
     app_path = f"dist/{APP_NAME}.app"
@@ -132,7 +139,7 @@ def create_dmg():
 
 def create_windows_package():
     """Create Windows portable package."""
-    print("\n4. Creating portable package...")
+    print("\n5. Creating portable package...")
     
     output_dir = Path("installer_output")
     output_dir.mkdir(exist_ok=True)
@@ -0,0 +1,165 @@
+"""
+Hit & Run Panda - Asset Pipeline
+Compiles assets/ into compiled_assets/, which the build scripts bundle
+in place of the raw full-size PNGs.
+
+- Sprites are pre-scaled to the largest size the app draws them at
+  (character size x MAX_DPR), palette-quantized and saved as optimized
+  PNGs, so the bundle is smaller and a cold start decodes small images.
+- Windows icons are generated once from the panda sprite.
+- Source files nothing references (e.g. anime_girl.png) are pruned.
+- manifest.json records source and output SHA-256 hashes; outputs whose
+  source and settings are unchanged are skipped on the next run.
+
+Usage: python build_assets.py [--force]
+"""
+
+import hashlib
+import json
+import os
+import sys
+
+from sprite_assets import CHARACTER_SIZE, SPRITE_FILES, TRAY_ICON
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+SOURCE_DIR = os.path.join(ROOT, "assets")
+OUTPUT_DIR = os.path.join(ROOT, "compiled_assets")
+MANIFEST = "manifest.json"
+
+PIPELINE_VERSION = 1
+MAX_DPR = 2  # highest pyramid level shipped; 3x screens upscale from it
+SHIP_SIZE = CHARACTER_SIZE * MAX_DPR
+PALETTE_COLORS = 256
+
+ICONS = {
+    # output: (source, sizes)
+    "app.ico": (TRAY_ICON, [256, 48, 32, 16]),
+    "walking panda 1.ico": (TRAY_ICON, [256, 128, 64, 48, 32, 16]),
+}
+
+
+def sprite_files() -> list:
+    """Every PNG the app loads at runtime."""
+    files = {f for frames in SPRITE_FILES.values() for f in frames}
+    files.add(TRAY_ICON)
+    return sorted(files)
+
+
+def sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_manifest() -> dict:
+    try:
+        with open(os.path.join(OUTPUT_DIR, MANIFEST), "r") as f:
+            manifest = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    if manifest.get("version") != PIPELINE_VERSION:
+        return {}
+    return manifest.get("files", {})
+
+
+def is_current(entry: dict, source_hash: str, settings: dict, output: str) -> bool:
+    return (
+        entry is not None
+        and entry.get("source_sha256") == source_hash
+        and entry.get("settings") == settings
+        and os.path.exists(output)
+        and sha256(output) == entry.get("sha256")
+    )
+
+
+def compile_sprite(source: str, output: str):
+    """Scale to SHIP_SIZE, quantize to a palette and write an optimized PNG."""
+    from PIL import Image
+
+    image = Image.open(source).convert("RGBA")
+    image.thumbnail((SHIP_SIZE, SHIP_SIZE), Image.Resampling.LANCZOS)
+    if PALETTE_COLORS:
+        # FASTOCTREE is the quantizer that keeps the alpha channel
+        image = image.quantize(PALETTE_COLORS, method=Image.Quantize.FASTOCTREE)
+    image.save(output, format="PNG", optimize=True)
+
+
+def compile_icon(source: str, output: str, sizes: list):
+    from PIL import Image
+
+    image = Image.open(source).convert("RGBA")
+    image = image.resize((sizes[0], sizes[0]), Image.Resampling.LANCZOS)
+    image.save(output, format="ICO", sizes=[(s, s) for s in sizes])
+
+
+def compile_assets(force: bool = False) -> dict:
+    """Bring compiled_assets/ up to date; returns the manifest file table."""
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    previous = {} if force else load_manifest()
+    jobs = [
+        (name, name, {"size": SHIP_SIZE, "colors": PALETTE_COLORS}, compile_sprite)
+        for name in sprite_files()
+    ]
+    jobs += [
+        (name, source, {"sizes": sizes},
+         lambda src, out, sizes=sizes: compile_icon(src, out, sizes))
+        for name, (source, sizes) in ICONS.items()
+    ]
+
+    files = {}
+    built = 0
+    for name, source_name, settings, compile_job in jobs:
+        source = os.path.join(SOURCE_DIR, source_name)
+        output = os.path.join(OUTPUT_DIR, name)
+        source_hash = sha256(source)
+        entry = previous.get(name)
+        if not is_current(entry, source_hash, settings, output):
+            compile_job(source, output)
+            entry = {
+                "source": source_name,
+                "source_sha256": source_hash,
+                "settings": settings,
+                "sha256": sha256(output),
+                "bytes": os.path.getsize(output),
+            }
+            built += 1
+            print(f"  ✓ {name} ({os.path.getsize(source) // 1024} KiB -> {entry['bytes'] // 1024} KiB)")
+        files[name] = entry
+
+    # Prune outputs from earlier runs that nothing produces any more
+    for name in os.listdir(OUTPUT_DIR):
+        if name not in files and name != MANIFEST:
+            os.remove(os.path.join(OUTPUT_DIR, name))
+            print(f"  - removed stale {name}")
+    unused = sorted(
+        set(os.listdir(SOURCE_DIR)) - set(files) - {source for source, _ in ICONS.values()}
+    )
+    if unused:
+        print(f"  Not shipped (unused): {', '.join(unused)}")
+
+    with open(os.path.join(OUTPUT_DIR, MANIFEST), "w") as f:
+        json.dump({"version": PIPELINE_VERSION, "files": files}, f, indent=2)
+
+    source_bytes = sum(os.path.getsize(os.path.join(SOURCE_DIR, n)) for n in os.listdir(SOURCE_DIR))
+    output_bytes = sum(entry["bytes"] for entry in files.values())
+    print(f"  {built} rebuilt, {len(files) - built} up to date; "
+          f"{source_bytes // 1024} KiB in assets/ -> {output_bytes // 1024} KiB shipped")
+    return files
+
+
+def ensure_compiled_assets() -> str:
+    """Compile assets for a build script; returns the directory to bundle."""
+    try:
+        compile_assets()
+        return os.path.relpath(OUTPUT_DIR)
+    except ImportError:
+        print("⚠ Pillow not installed. Run: pip install Pillow")
+        print("  Bundling the uncompiled assets/ folder instead...")
+        return os.path.relpath(SOURCE_DIR)
+
+
+if __name__ == "__main__":
+    print("Compiling assets...")
+    compile_assets(force="--force" in sys.argv[1:])
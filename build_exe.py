@@ -7,6 +7,8 @@ import subprocess
 import sys
 import os
 
+from build_assets import ensure_compiled_assets
+
 def build():
     # Install PyInstaller if not present
     try:
@@ -15,6 +17,9 @@ def build():
         print("Installing PyInstaller...")
         subprocess.check_call([sys.executable, "-m", "pip", "install", "pyinstaller"])
     
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    assets_dir = ensure_compiled_assets()
+    
     # Build command
     cmd = [
         sys.executable, "-m", "PyInstaller",
@@ -22,14 +27,14 @@ def build():
         "--onefile",
         "--windowed",  # No console window
         "--icon=assets/walking panda 1.png",  # Use panda as icon
-        "--add-data=assets;assets",  # Include assets folder
+        f"--add-data={assets_dir};assets",  # Include compiled assets
         "--add-data=settings.json;.",  # Include settings if exists
         "launcher.pyw"
     ]
     
     print("Building executable...")
     print(" ".join(cmd))
-    subprocess.run(cmd, cwd=os.path.dirname(__file__) or ".")
+    subprocess.run(cmd)
     
     print("\n✅ Done! Find your exe in: dist/HitAndRunPanda.exe")
     print("You can share this exe - it includes everything needed!")
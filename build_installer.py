@@ -12,24 +12,10 @@ import subprocess
 import sys
 import os
 import shutil
-from PIL import Image
 
-def create_icon():
-    """Convert PNG to ICO for Windows."""
-    print("Creating icon...")
-    try:
-        from PIL import Image
-        img = Image.open("assets/walking panda 1.png")
-        img = img.resize((256, 256), Image.Resampling.LANCZOS)
-        img.save("assets/walking panda 1.ico", format='ICO', sizes=[(256, 256), (128, 128), (64, 64), (48, 48), (32, 32), (16, 16)])
-        print("✓ Icon created")
-    except ImportError:
-        print("⚠ Pillow not installed. Run: pip install Pillow")
-        print("  Skipping icon creation...")
-    except Exception as e:
-        print(f"⚠ Could not create icon: {e}")
+from build_assets import ensure_compiled_assets
 
-def build_exe():
+def build_exe(assets_dir="assets"):
     """Build the exe with PyInstaller."""
     print("Building executable...")
     
@@ -46,14 +32,16 @@ def build_exe():
             shutil.rmtree(folder)
     
     # Build command - create a folder, not single file
-    icon_path = "assets/walking panda 1.ico" if os.path.exists("assets/walking panda 1.ico") else None
+    icon_path = os.path.join(assets_dir, "walking panda 1.ico")
+    if not os.path.exists(icon_path):
+        icon_path = None
     
     cmd = [
         sys.executable, "-m", "PyInstaller",
         "--name=HitAndRunPanda",
         "--onedir",  # Folder mode for faster startup
         "--windowed",
-        "--add-data=assets;assets",
+        f"--add-data={assets_dir};assets",
         "launcher.pyw"
     ]
     
@@ -73,15 +61,17 @@ def main():
     print("Hit & Run Panda - Installer Builder")
     print("=" * 50)
     
-    # Install Pillow for icon creation
+    # Install Pillow for the asset pipeline
     try:
         from PIL import Image
     except ImportError:
-        print("Installing Pillow for icon creation...")
+        print("Installing Pillow for the asset pipeline...")
         subprocess.check_call([sys.executable, "-m", "pip", "install", "Pillow"])
     
-    create_icon()
-    build_exe()
+    # Pre-scaled sprites and icons; only changed inputs are recompiled
+    print("Compiling assets...")
+    assets_dir = ensure_compiled_assets()
+    build_exe(assets_dir)
     
     print("\n" + "=" * 50)
     print("BUILD COMPLETE!")
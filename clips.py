@@ -0,0 +1,151 @@
+"""
+Hit & Run Panda - Animation Clips
+The pet's animations as data, compiled into flat frame tables.
+
+A clip lists sprite frames with per-frame durations (ms) and says what
+happens after the last frame: loop (optionally from a later frame, so
+an intro frame plays once), chain into another clip, or hold the last
+frame. compile_clips() turns all clips into parallel lists indexed by
+one global frame number, with each frame's successor precomputed, so
+advancing an animation is a single lookup in ClipTable.steps(), which
+holds the successor's index, bound sprite call, state and duration. A
+held frame is its own successor with a duration of 0 (stop the timer).
+
+ClipPlayer is the playhead a widget steps through those tables; it is
+a plain slotted object because attribute access on a QWidget subclass
+goes through sip and costs several times more per tick.
+
+Each clip also gets a cue entry: playing a clip points the cursor at
+its cue, whose successor is the first frame and whose duration is the
+first frame's, so the first tick needs no special case.
+
+Durations default to the app's base frame duration.
+
+Adding a state is one entry in CLIPS:
+
+    "wave": {"sprite": "victory", "frames": [0, 1, 0, 1],
+             "duration": 120, "next": "walking"}
+"""
+
+from dataclasses import dataclass, field
+
+# sprite name -> (SpriteManager accessor, takes a frame index)
+SPRITE_ACCESSORS = {
+    "walk": ("get_walk_frame", True),
+    "victory": ("get_victory_frame", True),
+    "angry": ("get_angry", False),
+    "crying": ("get_crying", False),
+}
+
+CLIPS = {
+    # Frame 0 is the standing pose shown on arrival, so a walk starts on 1
+    "walking": {"sprite": "walk", "frames": [1, 2, 3, 0], "loop": True},
+    # Land once, then keep jumping between the two air frames
+    "victory": {"sprite": "victory", "frames": [0, 1, 2], "duration": 200, "loop": True,
+                "loop_from": 1},
+    # Stomp by wobbling a few degrees each way
+    "angry": {"sprite": "angry", "frames": [0, 0], "angles": [4, -4], "loop": True},
+    "crying": {"sprite": "crying", "frames": [0], "duration": 0},
+}
+
+
+@dataclass
+class ClipTable:
+    """All clips as parallel per-frame lists; see compile_clips()."""
+
+    accessors: list = field(default_factory=list)  # SpriteManager method name
+    leads: list = field(default_factory=list)  # () or (frame index,)
+    angles: list = field(default_factory=list)
+    durations: list = field(default_factory=list)  # ms until the next frame, 0 = hold
+    states: list = field(default_factory=list)  # clip name shown as current_state
+    next: list = field(default_factory=list)  # successor frame
+    cues: dict = field(default_factory=dict)  # clip name -> cue entry
+
+    def _append(self, accessor, lead, angle, duration, state) -> int:
+        self.accessors.append(accessor)
+        self.leads.append(lead)
+        self.angles.append(angle)
+        self.durations.append(duration)
+        self.states.append(state)
+        self.next.append(len(self.next))
+        return len(self.next) - 1
+
+    def steps(self, sprites, mirrored: bool) -> list:
+        """Per entry, what the next tick shows: (successor, getter, args, state, ms).
+
+        Getters are bound to `sprites` (a SpriteManager) and args are
+        complete, so a tick is one list index and a call.
+        """
+        steps = []
+        for successor in self.next:
+            steps.append((
+                successor,
+                getattr(sprites, self.accessors[successor]),
+                self.leads[successor] + (mirrored, 1.0, self.angles[successor]),
+                self.states[successor],
+                self.durations[successor],
+            ))
+        return steps
+
+
+def compile_clips(clips: dict = None, frame_ms: int = 150) -> ClipTable:
+    """Compile clip definitions into one ClipTable.
+
+    Raises ValueError for an unknown sprite or `next` clip.
+    """
+    clips = CLIPS if clips is None else clips
+    table = ClipTable()
+    starts = {}
+    pending = []  # (last frame, clip it chains into)
+    for name, clip in clips.items():
+        if clip["sprite"] not in SPRITE_ACCESSORS:
+            raise ValueError(f"clip {name!r}: unknown sprite {clip['sprite']!r}")
+        accessor, indexed = SPRITE_ACCESSORS[clip["sprite"]]
+        frames = clip["frames"]
+        durations = clip.get("durations") or [clip.get("duration", frame_ms)] * len(frames)
+        angles = clip.get("angles") or [0] * len(frames)
+        cue = table._append(None, (), 0, durations[0], name)
+        entries = [
+            table._append(accessor, (index,) if indexed else (), angle, duration, name)
+            for index, angle, duration in zip(frames, angles, durations)
+        ]
+        table.next[cue] = entries[0]
+        for entry, successor in zip(entries, entries[1:]):
+            table.next[entry] = successor
+        if clip.get("loop"):
+            table.next[entries[-1]] = entries[clip.get("loop_from", 0)]
+        elif clip.get("next"):
+            pending.append((entries[-1], clip["next"]))
+        else:
+            table.durations[entries[-1]] = 0  # hold the last frame (its own successor)
+        table.cues[name] = cue
+        starts[name] = entries[0]
+    for entry, target in pending:
+        if target not in starts:
+            raise ValueError(f"unknown next clip {target!r}")
+        table.next[entry] = starts[target]
+    return table
+
+
+class ClipPlayer:
+    """Playback position in a ClipTable for one pet.
+
+    Per tick: `player.cursor, getter, args, player.state, ms =
+    player.steps[player.cursor]`, then call getter(*args).
+    """
+
+    __slots__ = ("table", "mirror_steps", "steps", "cursor", "state")
+
+    def __init__(self, table: ClipTable, sprites):
+        self.table = table
+        self.mirror_steps = (table.steps(sprites, False), table.steps(sprites, True))
+        self.steps = self.mirror_steps[0]
+        self.cursor = 0
+        self.state = "idle"
+
+    def play(self, clip: str, mirrored: bool) -> int:
+        """Cue `clip`; returns the ms until its first frame (0: show it now)."""
+        self.steps = self.mirror_steps[bool(mirrored)]
+        self.cursor = self.table.cues[clip]
+        self.state = clip
+        return self.table.durations[self.cursor]
@@ -20,16 +20,10 @@ def main():
     print("\n1. Installing requirements...")
     subprocess.check_call([sys.executable, "-m", "pip", "install", "pyinstaller", "Pillow", "pywin32", "-q"])
     
-    # Create icon
-    print("\n2. Creating icon...")
-    try:
-        from PIL import Image
-        img = Image.open("assets/walking panda 1.png")
-        img = img.resize((256, 256), Image.Resampling.LANCZOS)
-        img.save("assets/app.ico", format='ICO', sizes=[(256, 256), (48, 48), (32, 32), (16, 16)])
-        print("   ✓ Icon created")
-    except Exception as e:
-        print(f"   ⚠ Icon skipped: {e}")
+    # Compile assets (pre-scaled sprites + icons, only changed inputs)
+    print("\n2. Compiling assets...")
+    from build_assets import ensure_compiled_assets
+    assets_dir = ensure_compiled_assets()
     
     # Clean old builds
     print("\n3. Cleaning old builds...")
@@ -45,14 +39,15 @@ def main():
     
     # Build main app exe
     print("\n4. Building main application...")
-    icon_arg = "--icon=assets/app.ico" if os.path.exists("assets/app.ico") else ""
+    icon_path = os.path.join(assets_dir, "app.ico")
+    icon_arg = f"--icon={icon_path}" if os.path.exists(icon_path) else ""
     
     cmd = [
         sys.executable, "-m", "PyInstaller",
         "--name=HitAndRunPanda",
         "--onefile",
         "--windowed",
-        "--add-data=assets;assets",
+        f"--add-data={assets_dir};assets",
         icon_arg,
         "launcher.pyw"
     ]
@@ -67,7 +62,7 @@ def main():
         "--name=HitAndRunPanda_Setup",
         "--onefile",
         "--windowed",
-        "--add-data=assets;assets",
+        f"--add-data={assets_dir};assets",
         "--add-data=dist/HitAndRunPanda.exe;.",
         icon_arg,
         "setup_wizard.py"
@@ -0,0 +1,281 @@
+"""
+Hit & Run Panda - Crowd Mode
+Many walking pets drawn by one widget: one clock timer, one paint pass.
+
+Pet state lives in parallel arrays (position, speed, animation phase)
+instead of one CharacterWidget window, timer and walk animation per
+pet. Each tick of the shared animation clock advances every pet in a
+single loop and schedules a single repaint; paintEvent blits all pets
+from one sprite sheet with a single QPainter.drawPixmapFragments call,
+and all name labels, rendered once into a label sheet, with a second.
+Sheet cells are cropped to the walk frames' opaque box, so the blit
+does not blend the sprites' transparent margins.
+"""
+
+import bisect
+import math
+import random
+import time
+from array import array
+
+from PyQt6.QtCore import Qt, QPointF, QRect, QRectF
+from PyQt6.QtGui import QFont, QFontMetricsF, QImage, QPainter, QPixmap
+from PyQt6.QtWidgets import QWidget
+
+from theme import get_font, get_color
+from animation import shared_clock
+
+
+def _opaque_rect(image: QImage) -> QRect:
+    """Bounding box of the pixels of `image` with any alpha at all."""
+    alpha = image.convertToFormat(QImage.Format.Format_Alpha8)
+    bits = alpha.constBits()
+    bits.setsize(alpha.sizeInBytes())
+    data = bytes(bits)
+    width, stride = alpha.width(), alpha.bytesPerLine()
+    left, right, rows = width, 0, []
+    for y in range(alpha.height()):
+        row = data[y * stride:y * stride + width]
+        rest = row.lstrip(b"\0")
+        if rest:
+            rows.append(y)
+            left = min(left, width - len(rest))
+            right = max(right, len(row.rstrip(b"\0")))
+    if not rows:
+        return QRect()
+    return QRect(left, rows[0], right - left, rows[-1] + 1 - rows[0])
+
+
+class PetCrowd(QWidget):
+    """A translucent strip of pets walking back and forth.
+
+    `sprites` is the app's SpriteManager; only its walk and mirrored
+    walk frames are used.
+    """
+
+    TICK_MS = 33
+    FRAME_MS = 150
+    LANE_SPREAD = 60  # vertical jitter so pets do not stand on one line
+    SPEED_RANGE = (40.0, 110.0)  # px per second
+    LABEL_SHEET_WIDTH = 1024  # logical px per row of the label sheet
+
+    def __init__(self, sprites, parent=None):
+        super().__init__(parent)
+        self.setWindowFlags(
+            Qt.WindowType.FramelessWindowHint |
+            Qt.WindowType.WindowStaysOnTopHint |
+            Qt.WindowType.Tool |
+            Qt.WindowType.WindowTransparentForInput
+        )
+        self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
+        self.sprites = sprites
+
+        # Parallel per-pet arrays, kept sorted by y so paint order is back to front
+        self.xs = array("d")
+        self.ys = array("d")
+        self.speeds = array("d")  # px per second, negative = walking left
+        self.phases = array("H")  # animation frame offset
+        self.labels = []  # label text or None
+        self.fragments = []  # reused QPainter.PixmapFragment per pet
+        self.label_fragments = []  # per pet: PixmapFragment into label_sheet, or None
+        self.label_sheet = None  # every label rendered once; None = rebuild
+        self.label_key = None  # (text colour, dpr) the label sheet was drawn with
+
+        self.sheet = None
+        self.sheet_dpr = None
+        self.source_rects = []  # walk frames, then mirrored walk frames
+        self.centers = []  # per source rect: its centre, relative to the frame's top left
+        self.frame_size = QRectF()
+
+        self.clock = time.perf_counter()
+        self.elapsed_ms = 0.0
+        self.timer = shared_clock().timer_for(self.tick, self, "crowd")
+
+    def __len__(self):
+        return len(self.xs)
+
+    def add_pet(self, label: str = None, x: float = None, speed: float = None):
+        """Add one pet at a random lane; returns its current index."""
+        self.ensure_sheet()
+        if x is None:
+            x = random.uniform(0, max(1, self.width() - self.frame_size.width()))
+        if speed is None:
+            speed = random.uniform(*self.SPEED_RANGE) * random.choice((-1, 1))
+        y = random.uniform(0, self.LANE_SPREAD)
+        i = bisect.bisect(self.ys, y)
+        self.xs.insert(i, x)
+        self.ys.insert(i, y)
+        self.speeds.insert(i, speed)
+        self.phases.insert(i, random.randrange(4))
+        self.labels.insert(i, label or None)
+        self.fragments.insert(i, self.new_fragment())
+        self.label_sheet = None
+        self.update()
+        return i
+
+    def new_fragment(self):
+        # Only x, y and sourceLeft change per frame; the rest is set here
+        source = self.source_rects[0]
+        scale = 1 / self.sheet_dpr
+        return QPainter.PixmapFragment.create(QPointF(), source, scale, scale)
+
+    def clear(self):
+        for values in (self.xs, self.ys, self.speeds, self.phases):
+            del values[:]
+        self.labels.clear()
+        self.fragments.clear()
+        self.label_fragments.clear()
+        self.label_sheet = None
+        self.update()
+
+    def ensure_sheet(self):
+        """Pack the walk frames (both directions) into one pixmap.
+
+        Each direction's frames are cropped to their shared opaque box;
+        both boxes get the same size, so a fragment only changes
+        sourceLeft and its centre when the pet turns around.
+        """
+        if self.sheet is not None and self.sheet_dpr == self.sprites.dpr:
+            return
+        dpr = self.sprites.dpr
+        directions = [self.sprites.frames("walk"), self.sprites.frames("walk_mirror")]
+        boxes = []
+        for frames in directions:
+            box = QRect()
+            for frame in frames:
+                box = box.united(_opaque_rect(frame.toImage()))
+            boxes.append(box if box.isValid() else frames[0].rect())
+        box_width = max(box.width() for box in boxes)
+        top = min(box.top() for box in boxes)
+        box_height = max(box.bottom() for box in boxes) + 1 - top
+        frame_count = sum(len(frames) for frames in directions)
+        sheet = QPixmap(box_width * frame_count, box_height)
+        sheet.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(sheet)
+        self.source_rects = []
+        self.centers = []
+        x = 0
+        for frames, box in zip(directions, boxes):
+            left = min(box.left(), frames[0].width() - box_width)
+            for frame in frames:
+                # Device pixels on both sides, so no rescale on the way in
+                image = frame.toImage()
+                image.setDevicePixelRatio(1.0)
+                painter.drawImage(QPointF(x, 0), image, QRectF(left, top, box_width, box_height))
+                self.source_rects.append(QRectF(x, 0, box_width, box_height))
+                self.centers.append(((left + box_width / 2) / dpr, (top + box_height / 2) / dpr))
+                x += box_width
+        painter.end()
+        frames = directions[0]
+        self.sheet = sheet
+        self.sheet_dpr = dpr
+        self.frame_size = QRectF(0, 0, frames[0].width() / dpr, frames[0].height() / dpr)
+        self.setMinimumHeight(int(self.frame_size.height() + self.LANE_SPREAD + 20))
+        self.fragments = [self.new_fragment() for _ in self.fragments]
+
+    def ensure_label_sheet(self):
+        """Render every label once into one pixmap, shelf-packed in rows."""
+        color = get_color("text")
+        key = (color.rgba(), self.sheet_dpr)
+        if self.label_sheet is not None and self.label_key == key:
+            return
+        dpr = self.sheet_dpr
+        font = get_font(9, QFont.Weight.Bold)
+        metrics = QFontMetricsF(font)
+        height = math.ceil(metrics.height())
+        rects = []
+        x = y = width = 0
+        for label in self.labels:
+            if label is None:
+                rects.append(None)
+                continue
+            w = math.ceil(metrics.horizontalAdvance(label)) + 2
+            if x and x + w > self.LABEL_SHEET_WIDTH:
+                x, y = 0, y + height
+            rects.append(QRectF(x, y, w, height))
+            x += w
+            width = max(width, x)
+        sheet = QPixmap(max(1, math.ceil(width * dpr)), max(1, math.ceil((y + height) * dpr)))
+        sheet.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(sheet)
+        painter.scale(dpr, dpr)  # device pixels, like the sprite sheet
+        painter.setFont(font)
+        painter.setPen(color)
+        scale = 1 / dpr
+        self.label_fragments = []
+        for label, rect in zip(self.labels, rects):
+            if rect is None:
+                self.label_fragments.append(None)
+                continue
+            painter.drawText(QPointF(rect.x() + 1, rect.y() + metrics.ascent()), label)
+            source = QRectF(rect.x() * dpr, rect.y() * dpr, rect.width() * dpr, rect.height() * dpr)
+            self.label_fragments.append(QPainter.PixmapFragment.create(QPointF(), source, scale, scale))
+        painter.end()
+        self.label_sheet = sheet
+        self.label_key = key
+
+    def start(self):
+        self.clock = time.perf_counter()
+        self.timer.start(self.TICK_MS)
+
+    def stop(self):
+        self.timer.stop()
+
+    def tick(self, dt: float = None):
+        """Advance every pet by `dt` seconds (default: wall time since last tick)."""
+        now = time.perf_counter()
+        if dt is None:
+            dt = now - self.clock
+        self.clock = now
+        self.elapsed_ms += dt * 1000
+        right = self.width() - self.frame_size.width()
+        xs, speeds = self.xs, self.speeds
+        for i in range(len(xs)):
+            x = xs[i] + speeds[i] * dt
+            if x < 0 or x > right:
+                # Turn around at the edges
+                speeds[i] = -speeds[i]
+                x = min(max(x, 0.0), right)
+            xs[i] = x
+        self.update()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        screen = self.screen()
+        if screen:
+            self.sprites.set_dpr(screen.devicePixelRatio())
+        self.ensure_sheet()
+
+    def paintEvent(self, event):
+        if not self.xs:
+            return
+        self.ensure_sheet()
+        walk_frames = len(self.source_rects) // 2
+        step = int(self.elapsed_ms // self.FRAME_MS)
+        half_w = self.frame_size.width() / 2
+        lefts = [r.x() for r in self.source_rects]
+        centers = self.centers
+        for fragment, x, y, speed, phase in zip(
+            self.fragments, self.xs, self.ys, self.speeds, self.phases
+        ):
+            # Mirrored frames face right, so they follow the walking direction
+            frame = (step + phase) % walk_frames
+            if speed > 0:
+                frame += walk_frames
+            cx, cy = centers[frame]
+            fragment.sourceLeft = lefts[frame]
+            fragment.x = x + cx
+            fragment.y = y + 20 + cy
+
+        painter = QPainter(self)
+        painter.drawPixmapFragments(self.fragments, self.sheet)
+        if any(self.labels):
+            self.ensure_label_sheet()
+            labels = []
+            for fragment, x, y in zip(self.label_fragments, self.xs, self.ys):
+                if fragment is not None:
+                    fragment.x = x + half_w
+                    fragment.y = y + fragment.height / 2 * fragment.scaleY
+                    labels.append(fragment)
+            painter.drawPixmapFragments(labels, self.label_sheet)
+        painter.end()
@@ -0,0 +1,170 @@
+"""
+Hit & Run Panda - Frame Timing Stats
+Histograms of how animations are actually delivered, to tell Qt
+scheduling delay apart from paint cost when a walk stutters.
+
+For every animation on the shared clock (panda frames, walk, alert
+effects, crowd) FrameStats records the real interval between calls,
+the jitter against the requested interval, how late each call ran
+behind its due time and the frames dropped by falling behind. For
+the walk it also records the position lag: how many pixels behind
+the wall-clock position the panda was drawn. Paint time is recorded
+separately by the widgets, as is the adaptive frame rate's status.
+
+FrameStatsOverlay is a small always-on-top window showing the live
+numbers; `python main.py framestats` prints the same report.
+"""
+
+import math
+
+from PyQt6.QtCore import QPoint, Qt
+from PyQt6.QtGui import QColor, QFont, QPainter
+from PyQt6.QtWidgets import QWidget
+
+from theme import get_font
+
+
+class Histogram:
+    """Fixed-bucket histogram of non-negative values (ms or px).
+
+    Buckets are BUCKET wide up to LIMIT; larger values share an
+    overflow bucket but still count towards the max.
+    """
+
+    BUCKET = 0.25
+    LIMIT = 250.0
+
+    def __init__(self):
+        self.buckets = [0] * (int(self.LIMIT / self.BUCKET) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value: float):
+        value = max(0.0, value)
+        self.buckets[min(int(value / self.BUCKET), len(self.buckets) - 1)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def percentile(self, p: float) -> float:
+        """Upper edge of the bucket holding the p-th percentile."""
+        if not self.count:
+            return 0.0
+        rank = math.ceil(self.count * p / 100)
+        seen = 0
+        for index, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank:
+                return min((index + 1) * self.BUCKET, self.max)
+        return self.max
+
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+class AnimationStats:
+    """Delivery histograms for one named animation."""
+
+    def __init__(self):
+        self.interval = Histogram()
+        self.jitter = Histogram()
+        self.delay = Histogram()
+        self.dropped = 0
+
+
+class FrameStats:
+    """All frame timing collected while instrumentation is on."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.animations = {}  # name -> AnimationStats
+        self.paint = Histogram()
+        self.walk_lag = Histogram()
+        self.rate = None  # latest FrameRateGovernor status line
+
+    def record_fire(self, name: str, expected_ms: float, actual_ms: float, delay_ms: float,
+                    dropped: int = 0):
+        """One animation callback: interval since the last call and lateness."""
+        stats = self.animations.get(name)
+        if stats is None:
+            stats = self.animations[name] = AnimationStats()
+        stats.delay.add(delay_ms)
+        stats.dropped += dropped
+        if actual_ms is not None:
+            stats.interval.add(actual_ms)
+            if expected_ms:
+                stats.jitter.add(abs(actual_ms - expected_ms))
+
+    def record_paint(self, ms: float):
+        self.paint.add(ms)
+
+    def record_walk_lag(self, pixels: float):
+        self.walk_lag.add(pixels)
+
+    def record_rate(self, status: str):
+        self.rate = status
+
+    @staticmethod
+    def _percentiles(histogram: Histogram) -> str:
+        return "/".join(f"{histogram.percentile(p):.1f}" for p in (50, 95, 99))
+
+    def lines(self) -> list:
+        """Report lines; percentiles are p50/p95/p99."""
+        lines = []
+        for name, stats in sorted(self.animations.items()):
+            if not stats.delay.count:
+                continue
+            lines.append(
+                f"{name:<13} n={stats.delay.count:<5} "
+                f"interval {stats.interval.mean():6.1f} ms  "
+                f"jitter {self._percentiles(stats.jitter)} ms  "
+                f"delay {self._percentiles(stats.delay)} ms  dropped {stats.dropped}"
+            )
+        if self.walk_lag.count:
+            lines.append(f"{'walk lag':<13} n={self.walk_lag.count:<5} "
+                         f"{self._percentiles(self.walk_lag)} px")
+        if self.paint.count:
+            lines.append(f"{'paint':<13} n={self.paint.count:<5} "
+                         f"{self._percentiles(self.paint)} ms (max {self.paint.max:.1f})")
+        if self.rate:
+            lines.append(f"{'frame rate':<13} {self.rate}")
+        return lines or ["No frames recorded yet"]
+
+    def report(self) -> str:
+        return "\n".join(["Frame timing, p50/p95/p99:"] + self.lines())
+
+
+class FrameStatsOverlay(QWidget):
+    """Live FrameStats report in a small window in the top-left corner."""
+
+    REFRESH_MS = 500
+
+    def __init__(self, stats: FrameStats, clock):
+        super().__init__()
+        self.setWindowFlags(
+            Qt.WindowType.FramelessWindowHint |
+            Qt.WindowType.WindowStaysOnTopHint |
+            Qt.WindowType.Tool |
+            Qt.WindowType.WindowTransparentForInput
+        )
+        self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
+        self.stats = stats
+        self.text_font = QFont(get_font(9, family="Consolas"))  # copy: the cached one is shared
+        self.text_font.setStyleHint(QFont.StyleHint.Monospace)
+        self.resize(640, 150)
+        self.move(QPoint(10, 10))
+        self.timer = clock.timer_for(self.update, self, "stats overlay")
+        self.timer.start(self.REFRESH_MS)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor(0, 0, 0, 170))
+        painter.setPen(QColor("white"))
+        painter.setFont(self.text_font)
+        line_height = painter.fontMetrics().height()
+        for i, line in enumerate(self.stats.report().splitlines()):
+            painter.drawText(8, 6 + line_height * (i + 1), line)
+        painter.end()
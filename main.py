@@ -5,38 +5,57 @@ Now with Red Alert mode and flexible time intervals!
 """
 
 import sys
+import bisect
+import calendar
+import ctypes
+import gc
 import json
 import os
 import platform
 import random
-from datetime import datetime
+import re
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from datetime import date, datetime
+from itertools import islice
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QLabel, QPushButton, QVBoxLayout,
-    QHBoxLayout, QSystemTrayIcon, QMenu, QDialog, QScrollArea,
-    QFrame, QLineEdit, QSpinBox, QListWidget, QMessageBox,
-    QComboBox, QCheckBox, QTabWidget, QGroupBox
+    QHBoxLayout, QSystemTrayIcon, QMenu, QDialog,
+    QLineEdit, QSpinBox, QListWidget, QMessageBox,
+    QComboBox, QCheckBox, QTabWidget, QGroupBox, QTableView, QHeaderView
 )
 from PyQt6.QtCore import (
-    Qt, QTimer, QPropertyAnimation, QPoint, QEasingCurve,
-    pyqtProperty
+    Qt, QTimer, QPoint, QRect, QSize, QEasingCurve,
+    pyqtProperty, pyqtSignal, QObject, QThreadPool,
+    QAbstractListModel, QAbstractProxyModel, QModelIndex
+)
+from PyQt6.QtGui import (
+    QIcon, QPixmap, QImage, QAction, QFont, QTransform, QColor, QPainter,
+    QRegion, QPixmapCache
 )
-from PyQt6.QtGui import QIcon, QPixmap, QAction, QFont, QTransform, QColor, QPalette
 from PyQt6.QtNetwork import QLocalServer, QLocalSocket
 
+import theme
+from theme import get_font, get_color
+from sprite_assets import CHARACTER_SIZE, SPRITE_FILES, TRAY_ICON
+from sprite_cache import SpriteDiskCache
+from sprite_atlas import SpriteAtlas, atlas_key
+from crowd import PetCrowd
+from bubble import BubbleRenderer, PaintedBubble
+from skins import Skin, find_skins
+from animation import FrameRateGovernor, Tween, WakeupCounter, shared_clock
+from clips import ClipPlayer, compile_clips
+from alert import AlertSurface, text_pixmap
+from frame_stats import FrameStats, FrameStatsOverlay
+
 # Platform detection
 IS_MAC = platform.system() == "Darwin"
 IS_WINDOWS = platform.system() == "Windows"
 
-def get_font(size=10, weight=None):
-    """Get platform-appropriate font."""
-    family = "SF Pro" if IS_MAC else "Segoe UI"
-    if weight:
-        return QFont(family, size, weight)
-    return QFont(family, size)
-
 # Configuration defaults
 CONFIG = {
-    "character_size": 120,
+    "character_size": CHARACTER_SIZE,
     "walk_speed_ms": 2500,
     "frame_duration_ms": 150,
 }
@@ -44,6 +63,8 @@ CONFIG = {
 ASSETS_DIR = os.path.join(os.path.dirname(__file__), "assets")
 HISTORY_FILE = os.path.join(os.path.dirname(__file__), "history.json")
 SETTINGS_FILE = os.path.join(os.path.dirname(__file__), "settings.json")
+SPRITE_CACHE_DIR = os.path.join(os.path.dirname(__file__), "cache", "sprites")
+SKINS_DIR = os.path.join(os.path.dirname(__file__), "skins")
 
 
 def get_default_settings():
@@ -53,6 +74,10 @@ def get_default_settings():
         "panda_enabled": False,
         "panda_interval": 30,
         "panda_interval_unit": "seconds",  # seconds, minutes, hours, days
+        "overlay_mode": False,  # draw panda + bubble in one window per screen
+        "skin": "",  # name of a custom skin in skins/, "" for the panda
+        "frame_rate_policy": "adaptive",  # smooth, adaptive, power saver
+        "idle_trim_minutes": 10,  # free sprites and windows after this idle time, 0 = never
         "tasks": [
             "Did you drink water?",
             "Time to stretch!",
@@ -97,6 +122,45 @@ def interval_to_ms(value: int, unit: str) -> int:
     return value * multipliers.get(unit, 1000)
 
 
+def resident_memory():
+    """Resident set size of this process in bytes, or None if unknown."""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    if IS_WINDOWS:
+        class ProcessMemoryCounters(ctypes.Structure):
+            _fields_ = [("cb", ctypes.c_ulong), ("PageFaultCount", ctypes.c_ulong)] + [
+                (name, ctypes.c_size_t) for name in (
+                    "PeakWorkingSetSize", "WorkingSetSize", "QuotaPeakPagedPoolUsage",
+                    "QuotaPagedPoolUsage", "QuotaPeakNonPagedPoolUsage",
+                    "QuotaNonPagedPoolUsage", "PagefileUsage", "PeakPagefileUsage",
+                )
+            ]
+        counters = ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return counters.WorkingSetSize
+        return None
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def release_freed_memory():
+    """Collect garbage and hand freed heap pages back to the OS where possible."""
+    gc.collect()
+    if sys.platform.startswith("linux"):
+        try:
+            ctypes.CDLL("libc.so.6").malloc_trim(0)
+        except (OSError, AttributeError):
+            pass  # not glibc
+
+
 def load_history():
     if os.path.exists(HISTORY_FILE):
         try:
@@ -122,74 +186,412 @@ def log_task(task: str, completed: bool):
     save_history(history)
 
 
+class SpriteLoaderSignals(QObject):
+    """Carries decoded frames from pool threads back to the GUI thread."""
+    # dpr level, state, frame index, frame count, image
+    frame_loaded = pyqtSignal(float, str, int, int, QImage)
+
+
 class SpriteManager:
-    """Manages loading and caching of sprite images."""
+    """Manages loading and caching of sprite images.
+    
+    Only the walking frames are decoded up front; every other state
+    (victory, angry, crying and the mirrored walk) is decoded on first
+    use or by prefetch() while the panda is already on its way.
+    Scaled and mirrored frames are kept in a SpriteDiskCache, so only
+    the first launch (or a changed asset/size/DPR) pays for scaling.
+    Once every state has been scaled they are packed into a SpriteAtlas;
+    later launches read its index and slice the startup states out of
+    the one sheet file, and each other state on first use, so lazy
+    loading is kept and only the requested states are read.
+    
+    With background=True all decoding and scaling runs on the global
+    QThreadPool as QImages; only the QImage -> QPixmap conversion happens
+    on the GUI thread. `ready` resolves once the startup states are in.
+    
+    Frames form a small pyramid with one level per device pixel ratio.
+    Only the top level (the highest DPR of any screen) is scaled from the
+    source PNGs; lower levels are downscaled from it. A level is built
+    the first time a screen with that DPR needs it, and set_dpr()
+    switches levels when the character moves between monitors.
+    
+    Other transforms (mirroring states without a pre-mirrored variant,
+    scaling, small rotations) go through transformed(), which keeps an
+    LRU of the results keyed by frame and transform, so an animation
+    that flips or wobbles every tick only pays for each variant once.
+    
+    With a custom Skin set, the get_* accessors stream its frames
+    instead; the crowd and the caches above keep using the panda.
+    
+    trim() drops all of it while the pet is away for a long time;
+    restore() reloads the startup level from the on-disk atlas.
+    """
     
-    def __init__(self, size: int):
+    SPRITE_FILES = SPRITE_FILES
+    EAGER_STATES = ("walk",)
+    MIRROR_SUFFIX = "_mirror"
+    ATLAS_STATES = ("walk", "walk_mirror", "victory", "angry", "crying")
+    TRANSFORM_CACHE_SIZE = 48
+    
+    def __init__(self, size: int, dpr: float = None, cache_dir: str = SPRITE_CACHE_DIR,
+                 background: bool = False):
         self.size = size
-        self.sprites = {}
-        self.load_sprites()
+        if dpr is None:
+            screen = QApplication.primaryScreen()
+            dpr = screen.devicePixelRatio() if screen else 1.0
+        self.top_dpr = max([dpr] + [s.devicePixelRatio() for s in QApplication.screens()])
+        self.cache_dir = cache_dir
+        self.disk_cache = SpriteDiskCache(cache_dir) if cache_dir else None
+        self.levels = {}  # dpr -> {state: [QPixmap, ...]}
+        self.atlases = {}  # dpr -> SpriteAtlas index, sliced a state at a time
+        self.dpr = dpr
+        self.sprites = self.levels.setdefault(dpr, {})
+        self.ready = Future()
+        
+        self.pool = QThreadPool.globalInstance()
+        self.signals = SpriteLoaderSignals()
+        self.signals.frame_loaded.connect(self._on_frame_loaded)
+        self._partial = {}  # (dpr, state) -> frames received so far
+        self.transforms = OrderedDict()  # (cacheKey, mirrored, scale, angle) -> QPixmap
+        self.transform_hits = 0
+        self.transform_misses = 0
+        self.skin = None
+        
+        if background:
+            self.load_async()
+        else:
+            self.load_sprites()
         
     def load_sprites(self):
-        # Walking frames (1-4)
-        self.sprites["walk"] = []
-        for i in range(1, 5):
-            path = os.path.join(ASSETS_DIR, f"walking panda {i}.png")
-            pixmap = QPixmap(path).scaled(
-                self.size, self.size,
+        """Load the startup states synchronously on the calling thread."""
+        self._load_level_atlas(self.dpr)
+        for state in self.EAGER_STATES:
+            self.frames(state)
+        self._check_ready()
+    
+    def load_async(self):
+        """Decode the startup states on the thread pool."""
+        self._partial.update({(self.dpr, state): None for state in self.EAGER_STATES})
+        self.pool.start(lambda dpr=self.dpr: self._load_startup_job(dpr))
+    
+    def trim(self) -> bool:
+        """Drop every decoded and transformed frame until restore().
+        
+        Returns False (and keeps everything) while the startup frames are
+        still loading.
+        """
+        if not self.ready.done():
+            return False
+        self.levels.clear()
+        self.atlases.clear()
+        self.sprites = self.levels.setdefault(self.dpr, {})
+        self._partial.clear()
+        self.transforms.clear()
+        if self.skin:
+            self.skin.trim()
+        QPixmapCache.clear()
+        self.ready = Future()
+        return True
+    
+    def restore(self):
+        """Reload the startup frames after trim(), from the disk atlas when there is one."""
+        self._check_ready()  # a synchronous frames() call may have beaten us to it
+        if not self.ready.done() and not self._partial:
+            self.load_async()
+    
+    def set_skin(self, skin):
+        """Use a custom Skin for the get_* accessors (None for the panda)."""
+        if self.skin is not None and self.skin is not skin:
+            self.skin.close()  # releases the pack files its streams hold
+        self.skin = skin
+        if skin:
+            skin.set_dpr(self.dpr)
+    
+    def set_dpr(self, dpr: float) -> bool:
+        """Switch to the pyramid level for `dpr`; returns True if it changed."""
+        if dpr == self.dpr:
+            return False
+        if self.skin:
+            self.skin.set_dpr(dpr)
+        self.dpr = dpr
+        self.sprites = self.levels.setdefault(dpr, {})
+        if not self.sprites:
+            self._load_level_atlas(dpr)
+        self._check_ready()  # the new level may already be complete
+        return True
+    
+    def _load_level_atlas(self, dpr: float):
+        atlas = self.read_atlas(dpr)
+        if atlas:
+            self.atlases[dpr] = atlas
+            level = self.levels.setdefault(dpr, {})
+            for state in self.EAGER_STATES:
+                images = self._atlas_images(dpr, state)
+                if images:
+                    level[state] = [self._to_pixmap(i, dpr) for i in images]
+        elif self.cache_dir:
+            # First use of this level: pack its atlas in the background
+            self.pool.start(lambda: self.build_atlas(dpr))
+    
+    def when_ready(self, callback):
+        """Run `callback` on the GUI thread once the startup frames are loaded."""
+        self.ready.add_done_callback(lambda _future: callback())
+    
+    def _check_ready(self, dpr: float = None):
+        """Resolve `ready` once level `dpr` (default: current) has the startup states.
+        
+        Any complete level will do: a load started before a set_dpr()
+        still resolves it, and frames() fills in the new level on demand.
+        """
+        level = self.levels.get(self.dpr if dpr is None else dpr, {})
+        if not self.ready.done() and all(s in level for s in self.EAGER_STATES):
+            self.ready.set_result(True)
+    
+    def read_atlas(self, dpr: float):
+        if not self.cache_dir:
+            return None
+        return SpriteAtlas.load(self.cache_dir, self.atlas_key(dpr), dpr)
+    
+    def _atlas_images(self, dpr: float, state: str) -> list:
+        """`state`'s frames from level `dpr`'s atlas, or [] if it has none."""
+        atlas = self.atlases.get(dpr)
+        return atlas.images(state) if atlas and state in atlas.rects else []
+    
+    def atlas_key(self, dpr: float) -> str:
+        paths = [
+            os.path.join(ASSETS_DIR, f)
+            for state in self.ATLAS_STATES if state in self.SPRITE_FILES
+            for f in self.SPRITE_FILES[state]
+        ]
+        return atlas_key(paths, self.size, dpr)
+    
+    def build_atlas(self, dpr: float):
+        """Pack all states of one level into a sheet for the next launch (thread-safe)."""
+        try:
+            images = {
+                state: [self.decode_image(f, mirrored, dpr) for f in files]
+                for state, files, mirrored in map(self._state_files, self.ATLAS_STATES)
+            }
+            SpriteAtlas.build(images, self.atlas_key(dpr)).save(self.cache_dir, dpr)
+        except Exception as e:
+            # Best effort: without an atlas the next launch just decodes per frame
+            print(f"⚠ Could not build sprite atlas: {e}")
+    
+    def _state_files(self, state: str):
+        mirrored = state.endswith(self.MIRROR_SUFFIX)
+        base = state[:-len(self.MIRROR_SUFFIX)] if mirrored else state
+        return state, self.SPRITE_FILES[base], mirrored
+    
+    def decode_image(self, filename: str, mirrored: bool, dpr: float) -> QImage:
+        """Decode and scale one frame for a pyramid level; safe from any thread."""
+        path = os.path.join(ASSETS_DIR, filename)
+        variant = "mirror" if mirrored else ""
+        if self.disk_cache:
+            image = self.disk_cache.load(path, self.size, dpr, variant)
+            if image is not None:
+                return image
+        
+        pixels = round(self.size * dpr)
+        if mirrored:
+            image = self.decode_image(filename, False, dpr).transformed(QTransform().scale(-1, 1))
+        elif dpr < self.top_dpr:
+            # Lower levels come from the top level, not the source PNG
+            image = self.decode_image(filename, False, self.top_dpr).scaled(
+                pixels, pixels,
                 Qt.AspectRatioMode.KeepAspectRatio,
                 Qt.TransformationMode.SmoothTransformation
             )
-            self.sprites["walk"].append(pixmap)
-        
-        # Victory frames (1-3)
-        self.sprites["victory"] = []
-        for i in range(1, 4):
-            path = os.path.join(ASSETS_DIR, f"victory panda {i}.png")
-            pixmap = QPixmap(path).scaled(
-                self.size, self.size,
+        else:
+            image = QImage(path).scaled(
+                pixels, pixels,
                 Qt.AspectRatioMode.KeepAspectRatio,
                 Qt.TransformationMode.SmoothTransformation
             )
-            self.sprites["victory"].append(pixmap)
-        
-        # Angry & crying
-        path = os.path.join(ASSETS_DIR, "angry panda.png")
-        self.sprites["angry"] = QPixmap(path).scaled(self.size, self.size, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-        
-        path = os.path.join(ASSETS_DIR, "crying panda.png")
-        self.sprites["crying"] = QPixmap(path).scaled(self.size, self.size, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-        
-        # Mirrored walking frames
-        self.sprites["walk_mirror"] = []
-        transform = QTransform().scale(-1, 1)
-        for pixmap in self.sprites["walk"]:
-            self.sprites["walk_mirror"].append(pixmap.transformed(transform))
+        if self.disk_cache and not image.isNull():
+            self.disk_cache.store(image, path, self.size, dpr, variant)
+        return image
+    
+    @staticmethod
+    def _to_pixmap(image: QImage, dpr: float) -> QPixmap:
+        pixmap = QPixmap.fromImage(image)
+        pixmap.setDevicePixelRatio(dpr)
+        return pixmap
+    
+    def _load_startup_job(self, dpr: float):
+        """Pool job: deliver the startup states from the atlas, or fan out per-frame jobs."""
+        try:
+            atlas = self.read_atlas(dpr)
+        except Exception:
+            atlas = None
+        if atlas:
+            self.atlases[dpr] = atlas
+            for state in self.EAGER_STATES:
+                self._atlas_state_job(dpr, state)
+            return
+        self._submit_states(self.EAGER_STATES, dpr)
+        if self.cache_dir:
+            self.pool.start(lambda: self.build_atlas(dpr))
+    
+    def _submit_states(self, states, dpr: float):
+        atlas = self.atlases.get(dpr)
+        for state in states:
+            if atlas and state in atlas.rects:
+                self.pool.start(lambda s=state: self._atlas_state_job(dpr, s))
+                continue
+            state, files, mirrored = self._state_files(state)
+            for index, filename in enumerate(files):
+                self.pool.start(
+                    lambda s=state, i=index, n=len(files), f=filename, m=mirrored:
+                        self._decode_frame_job(dpr, s, i, n, f, m)
+                )
     
-    def get_walk_frame(self, index: int, mirrored: bool = False) -> QPixmap:
-        frames = self.sprites["walk_mirror"] if mirrored else self.sprites["walk"]
-        return frames[index % len(frames)]
+    def _atlas_state_job(self, dpr, state):
+        """Slice one state out of the atlas, decoding it instead if the sheet is gone."""
+        images = self._atlas_images(dpr, state)
+        if not images:
+            state, files, mirrored = self._state_files(state)
+            for index, filename in enumerate(files):
+                self._decode_frame_job(dpr, state, index, len(files), filename, mirrored)
+        for index, image in enumerate(images):
+            self._emit_frame(dpr, state, index, len(images), image)
     
-    def get_victory_frame(self, index: int) -> QPixmap:
-        return self.sprites["victory"][index % len(self.sprites["victory"])]
+    def _decode_frame_job(self, dpr, state, index, count, filename, mirrored):
+        try:
+            image = self.decode_image(filename, mirrored, dpr)
+        except Exception:
+            # Deliver a null frame so `ready` still resolves
+            image = QImage()
+        self._emit_frame(dpr, state, index, count, image)
     
-    def get_angry(self) -> QPixmap:
-        return self.sprites["angry"]
+    def _emit_frame(self, dpr, state, index, count, image):
+        """Hand a decoded frame to the GUI thread (from a pool job)."""
+        try:
+            self.signals.frame_loaded.emit(dpr, state, index, count, image)
+        except RuntimeError:
+            pass  # interpreter shutdown already deleted the signals object
     
-    def get_crying(self) -> QPixmap:
-        return self.sprites["crying"]
+    def _on_frame_loaded(self, dpr, state, index, count, image):
+        level = self.levels.setdefault(dpr, {})
+        if state in level:
+            return  # already loaded synchronously or from the atlas
+        frames = self._partial.get((dpr, state)) or [None] * count
+        frames[index] = self._to_pixmap(image, dpr)
+        self._partial[(dpr, state)] = frames
+        if all(f is not None for f in frames):
+            level[state] = frames
+            del self._partial[(dpr, state)]
+            self._check_ready(dpr)
+    
+    def frames(self, state: str) -> list:
+        """Frames for `state` ("walk", "walk_mirror", ...) at the current level."""
+        frames = self.sprites.get(state)
+        if frames is None:
+            state, files, mirrored = self._state_files(state)
+            images = self._atlas_images(self.dpr, state) or [
+                self.decode_image(f, mirrored, self.dpr) for f in files
+            ]
+            frames = [self._to_pixmap(i, self.dpr) for i in images]
+            self.sprites[state] = frames
+            self._partial.pop((self.dpr, state), None)
+        return frames
+    
+    def is_loaded(self, state: str) -> bool:
+        return state in self.sprites
+    
+    def prefetch(self, states):
+        """Decode `states` on the thread pool ahead of use."""
+        pending = [
+            s for s in states
+            if not self.is_loaded(s) and (self.dpr, s) not in self._partial
+        ]
+        self._partial.update({(self.dpr, state): None for state in pending})
+        self._submit_states(pending, self.dpr)
+    
+    def pixmap_bytes(self) -> int:
+        """Approximate memory held by decoded and transformed pixmaps."""
+        pixmaps = [p for level in self.levels.values() for frames in level.values() for p in frames]
+        pixmaps.extend(self.transforms.values())
+        skin_bytes = self.skin.memory_bytes() if self.skin else 0
+        return skin_bytes + sum(p.width() * p.height() * p.depth() // 8 for p in pixmaps)
+    
+    def transformed(self, pixmap: QPixmap, mirrored: bool = False, scale: float = 1.0,
+                    angle: float = 0.0) -> QPixmap:
+        """`pixmap` mirrored, scaled and rotated by `angle` degrees, from the LRU."""
+        if not mirrored and scale == 1.0 and not angle:
+            return pixmap
+        key = (pixmap.cacheKey(), mirrored, scale, angle)
+        result = self.transforms.get(key)
+        if result is not None:
+            self.transform_hits += 1
+            self.transforms.move_to_end(key)
+            return result
+        self.transform_misses += 1
+        transform = QTransform().rotate(angle).scale(-scale if mirrored else scale, scale)
+        result = pixmap.transformed(transform, Qt.TransformationMode.SmoothTransformation)
+        result.setDevicePixelRatio(pixmap.devicePixelRatio())
+        self.transforms[key] = result
+        if len(self.transforms) > self.TRANSFORM_CACHE_SIZE:
+            self.transforms.popitem(last=False)
+        return result
+    
+    def get_walk_frame(self, index: int, mirrored: bool = False, scale: float = 1.0,
+                       angle: float = 0.0) -> QPixmap:
+        if self.skin:
+            return self.skin.frame("walk", index, mirrored, scale, angle)
+        # Walking mirrors through the pre-mirrored (disk-cached) state
+        frames = self.frames("walk_mirror" if mirrored else "walk")
+        return self.transformed(frames[index % len(frames)], False, scale, angle)
+    
+    def get_victory_frame(self, index: int, mirrored: bool = False, scale: float = 1.0,
+                          angle: float = 0.0) -> QPixmap:
+        if self.skin:
+            return self.skin.frame("victory", index, mirrored, scale, angle)
+        frames = self.frames("victory")
+        return self.transformed(frames[index % len(frames)], mirrored, scale, angle)
+    
+    def get_angry(self, mirrored: bool = False, scale: float = 1.0, angle: float = 0.0) -> QPixmap:
+        if self.skin:
+            return self.skin.frame("angry", None, mirrored, scale, angle)
+        return self.transformed(self.frames("angry")[0], mirrored, scale, angle)
+    
+    def get_crying(self, mirrored: bool = False, scale: float = 1.0, angle: float = 0.0) -> QPixmap:
+        if self.skin:
+            return self.skin.frame("crying", None, mirrored, scale, angle)
+        return self.transformed(self.frames("crying")[0], mirrored, scale, angle)
 
 
 class CharacterWidget(QWidget):
-    """The animated panda character."""
+    """The animated panda character.
+    
+    Frames are painted straight from the SpriteManager pixmaps in
+    paintEvent; a frame change only invalidates the rectangle covered by
+    the old and new frame, with no child label, size hints or layout.
+    
+    Reactions face the same way the panda walked in.
+    
+    Animations are clips (clips.py) compiled once into flat tables; a
+    frame tick looks up the clip player's precomputed next step and
+    makes its pre-bound sprite call.
     
-    def __init__(self, sprite_manager: SpriteManager):
+    A FrameRateGovernor watches paint time plus frame timer delay and,
+    as the policy allows, lowers the frame rate and the walk's step
+    granularity (animation_step_ms, read by the walk Tween) under load.
+    Paints are timed only one in PAINT_SAMPLE_EVERY for the governor,
+    or every one while frame stats are being recorded.
+    """
+    
+    PAINT_SAMPLE_EVERY = 8
+    
+    def __init__(self, sprite_manager: SpriteManager, frame_rate_policy: str = "adaptive"):
         super().__init__()
         self.sprites = sprite_manager
+        self.governor = FrameRateGovernor(frame_rate_policy)
+        self.frame_base_ms = CONFIG["frame_duration_ms"]
+        self.last_paint_ms = 0.0
+        self.paint_count = 0
+        self.clock = shared_clock()
         self._pos = QPoint(0, 0)
-        self.walk_frame = 0
         self.is_mirrored = False
-        self.current_state = "idle"
         self.coming_from_left = False
         
         self.setWindowFlags(
@@ -202,60 +604,168 @@ class CharacterWidget(QWidget):
         self.size = CONFIG["character_size"]
         self.setFixedSize(self.size, self.size)
         
-        self.image_label = QLabel(self)
-        self.image_label.setFixedSize(self.size, self.size)
-        self.image_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.frame = None
+        self.frame_rect = QRect()
+        self.frame_rects = {}  # pixmap cacheKey -> target rect at frame_origin
+        self.frame_origin = QPoint(0, 0)  # top-left of the panda box in widget coords
         
-        self.frame_timer = QTimer()
-        self.frame_timer.timeout.connect(self.next_frame)
+        self.frame_timer = self.clock.timer_for(self.next_frame, self, "panda frames")
         
-        self.victory_cycle = 0
-        self.victory_jumping = False
+        self.clip_player = ClipPlayer(compile_clips(frame_ms=CONFIG["frame_duration_ms"]),
+                                      self.sprites)
+        self.current_sprite = None
+        self.screen_hooked = False
         
-        self.set_frame(self.sprites.get_walk_frame(0))
+        self.sprites.when_ready(lambda: self.show_sprite(self.sprites.get_walk_frame, 0))
         
     def set_frame(self, pixmap: QPixmap):
-        self.image_label.setPixmap(pixmap)
+        if pixmap is self.frame:
+            return
+        key = pixmap.cacheKey()
+        rect = self.frame_rects.get(key)
+        if rect is None:
+            # Centered like QLabel's AlignCenter, in logical (DPR-independent) pixels
+            size = pixmap.deviceIndependentSize().toSize()
+            rect = QRect(
+                self.frame_origin.x() + (self.size - size.width()) // 2,
+                self.frame_origin.y() + (self.size - size.height()) // 2,
+                size.width(), size.height()
+            )
+            if len(self.frame_rects) > 256:
+                self.frame_rects.clear()  # evicted transforms leave stale keys
+            self.frame_rects[key] = rect
+        self.frame = pixmap
+        self.set_frame_rect(rect)
+    
+    def set_frame_rect(self, rect: QRect):
+        # Walk frames share one size, so the dirty area is usually just `rect`
+        dirty = rect if rect == self.frame_rect else rect.united(self.frame_rect)
+        self.frame_rect = rect
+        self.update(dirty)
+    
+    def paint_frame(self, painter: QPainter):
+        if self.frame is not None:
+            painter.drawPixmap(self.frame_rect, self.frame)
+    
+    def paintEvent(self, event):
+        self.paint_count += 1
+        if self.paint_count % self.PAINT_SAMPLE_EVERY and self.clock.stats is None:
+            # Untimed fast path: the common case, kept free of extra calls
+            painter = QPainter(self)
+            if self.frame is not None:
+                painter.drawPixmap(self.frame_rect, self.frame)
+            painter.end()
+            return
+        start = time.perf_counter()
+        painter = QPainter(self)
+        self.paint_frame(painter)
+        painter.end()
+        self.record_paint(start)
+    
+    def paint_started(self) -> float:
+        """perf_counter() if this paint is to be timed, else 0."""
+        self.paint_count += 1
+        if self.clock.stats is None and self.paint_count % self.PAINT_SAMPLE_EVERY:
+            return 0.0
+        return time.perf_counter()
+    
+    def record_paint(self, start: float):
+        self.last_paint_ms = (time.perf_counter() - start) * 1000
+        stats = self.clock.stats
+        if stats is not None:
+            stats.record_paint(self.last_paint_ms)
+    
+    @property
+    def animation_step_ms(self) -> int:
+        return self.governor.walk_step_ms
+    
+    def set_frame_rate_policy(self, policy: str):
+        self.governor.set_policy(policy)
+        self.apply_frame_rate()
+    
+    def start_frames(self, base_ms: int):
+        self.frame_base_ms = base_ms
+        self.frame_timer.start(self.governor.frame_ms(base_ms))
+    
+    def apply_frame_rate(self):
+        if self.frame_timer.isActive():
+            self.frame_timer.start(self.governor.frame_ms(self.frame_base_ms))
+    
+    def measure_frame(self):
+        """Feed the governor this frame's paint cost plus event-loop lateness."""
+        cost = self.last_paint_ms + self.frame_timer.last_lateness
+        if self.governor.record(cost):
+            print(f"🎞 Frame rate level {self.governor.level} ({self.governor.policy}) "
+                  f"after {cost:.1f} ms frames")
+            self.apply_frame_rate()
+        stats = self.clock.stats
+        if stats is not None:
+            stats.record_rate(self.governor.status())
+    
+    def show_sprite(self, getter, *args):
+        """Show getter(*args), remembered so a DPR switch can re-fetch it."""
+        self.current_sprite = (getter, args)
+        self.set_frame(getter(*args))
+    
+    def showEvent(self, event):
+        super().showEvent(event)
+        if not self.screen_hooked and self.windowHandle():
+            self.windowHandle().screenChanged.connect(self.on_screen_changed)
+            self.screen_hooked = True
+        self.on_screen_changed(self.screen())
+    
+    def on_screen_changed(self, screen):
+        """Pick the sprite pyramid level matching the new screen's DPR."""
+        if screen and self.sprites.set_dpr(screen.devicePixelRatio()) and self.current_sprite:
+            getter, args = self.current_sprite
+            self.set_frame(getter(*args))
         
     def next_frame(self):
-        if self.current_state == "walking":
-            self.walk_frame = (self.walk_frame + 1) % 4
-            self.set_frame(self.sprites.get_walk_frame(self.walk_frame, self.is_mirrored))
-        elif self.current_state == "victory":
-            if not self.victory_jumping:
-                self.set_frame(self.sprites.get_victory_frame(0))
-                self.victory_jumping = True
-                self.victory_cycle = 0
+        self.measure_frame()
+        self.advance_clip()
+    
+    def advance_clip(self):
+        player = self.clip_player
+        player.cursor, getter, args, player.state, duration = player.steps[player.cursor]
+        self.show_sprite(getter, *args)
+        if duration != self.frame_base_ms:
+            # Entering a clip with another pace, or a held frame (0)
+            if duration:
+                self.start_frames(duration)
             else:
-                jump_frame = 1 + (self.victory_cycle % 2)
-                self.set_frame(self.sprites.get_victory_frame(jump_frame))
-                self.victory_cycle += 1
+                self.frame_timer.stop()
+    
+    def play(self, clip: str):
+        """Start a clip from clips.CLIPS; a clip without timing shows at once."""
+        duration = self.clip_player.play(clip, self.is_mirrored)
+        if duration:
+            self.start_frames(duration)
+        else:
+            self.frame_timer.stop()
+            self.advance_clip()
     
     def start_walking(self, mirrored: bool = False):
-        self.current_state = "walking"
         self.is_mirrored = mirrored
-        self.walk_frame = 0
-        self.frame_timer.start(CONFIG["frame_duration_ms"])
+        self.play("walking")
         
     def start_victory(self):
-        self.current_state = "victory"
-        self.victory_jumping = False
-        self.victory_cycle = 0
-        self.frame_timer.start(CONFIG["frame_duration_ms"] + 50)
+        self.play("victory")
         
     def show_angry(self):
-        self.current_state = "angry"
-        self.frame_timer.stop()
-        self.set_frame(self.sprites.get_angry())
+        # Untilted until the first wobble frame
+        self.show_sprite(self.sprites.get_angry, self.is_mirrored)
+        self.play("angry")
         
     def show_crying(self):
-        self.current_state = "crying"
-        self.frame_timer.stop()
-        self.set_frame(self.sprites.get_crying())
+        self.play("crying")
         
     def stop_animation(self):
         self.frame_timer.stop()
-        self.current_state = "idle"
+        self.clip_player.state = "idle"
+    
+    @property
+    def current_state(self) -> str:
+        return self.clip_player.state
     
     @pyqtProperty(QPoint)
     def pos(self):
@@ -267,235 +777,475 @@ class CharacterWidget(QWidget):
         self.move(value)
 
 
-class SpeechBubble(QWidget):
-    """Speech bubble with task and YES/NO buttons."""
+class PandaOverlay(CharacterWidget):
+    """One persistent translucent window per screen for panda and bubble.
     
-    def __init__(self, task: str, on_yes, on_no, from_left: bool = False):
-        super().__init__()
-        self.from_left = from_left
-        self.setWindowFlags(
-            Qt.WindowType.FramelessWindowHint |
-            Qt.WindowType.WindowStaysOnTopHint |
-            Qt.WindowType.Tool
-        )
-        self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
-        self.setup_ui(task, on_yes, on_no)
-        
-    def setup_ui(self, task: str, on_yes, on_no):
-        layout = QVBoxLayout(self)
-        layout.setContentsMargins(15, 15, 15, 15)
-        
-        container = QFrame()
-        container.setStyleSheet("""
-            QFrame {
-                background-color: white;
-                border-radius: 15px;
-                border: 3px solid #333;
-            }
-        """)
-        container_layout = QVBoxLayout(container)
-        container_layout.setSpacing(12)
-        
-        task_label = QLabel(task)
-        task_label.setWordWrap(True)
-        task_label.setFont(get_font(11))
-        task_label.setStyleSheet("color: #333; border: none;")
-        task_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        container_layout.addWidget(task_label)
-        
-        btn_layout = QHBoxLayout()
-        
-        yes_btn = QPushButton("YES ✓")
-        yes_btn.setCursor(Qt.CursorShape.PointingHandCursor)
-        yes_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #4CAF50; color: white; border: none;
-                padding: 10px 25px; border-radius: 10px; font-weight: bold; font-size: 13px;
-            }
-            QPushButton:hover { background-color: #45a049; }
-        """)
-        yes_btn.clicked.connect(on_yes)
-        
-        no_btn = QPushButton("NO ✗")
-        no_btn.setCursor(Qt.CursorShape.PointingHandCursor)
-        no_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #f44336; color: white; border: none;
-                padding: 10px 25px; border-radius: 10px; font-weight: bold; font-size: 13px;
-            }
-            QPushButton:hover { background-color: #da190b; }
-        """)
-        no_btn.clicked.connect(on_no)
-        
-        btn_layout.addWidget(yes_btn)
-        btn_layout.addWidget(no_btn)
-        container_layout.addLayout(btn_layout)
-        
-        layout.addWidget(container)
-        self.setFixedSize(240, 130)
+    The panda and the speech bubble are painted into the same window, so
+    a reminder visit maps no new windows: walking only repaints the old
+    and new frame rectangles, and the bubble is drawn from the shared
+    BubbleRenderer pixmaps and hit-tested here instead of being a
+    separate top-level bubble window.
+    
+    The window ignores input while the panda walks. While the bubble is
+    up, a mask limits it to the panda and bubble, so clicks elsewhere on
+    the screen still reach the apps underneath.
+    """
+    
+    def __init__(self, sprite_manager: SpriteManager, screen, renderer: BubbleRenderer = None,
+                 frame_rate_policy: str = "adaptive"):
+        super().__init__(sprite_manager, frame_rate_policy)
+        self.setWindowFlag(Qt.WindowType.WindowTransparentForInput, True)
+        self.setMouseTracking(True)
+        self.overlay_screen = screen
+        self.renderer = renderer or BubbleRenderer()
+        self.bubble_task = None
+        self.bubble_from_left = False
+        self.bubble_rect = QRect()
+        self.hovered = None
+        self.on_yes = self.on_no = None
+        self.fit_screen()
+        screen.availableGeometryChanged.connect(self.fit_screen)
+    
+    def fit_screen(self, *args):
+        geometry = self.overlay_screen.availableGeometry()
+        self.setFixedSize(geometry.size())
+        self.move(geometry.topLeft())
+    
+    @pyqtProperty(QPoint)
+    def pos(self):
+        return self._pos
+    
+    @pos.setter
+    def pos(self, value):
+        # Move the panda inside the overlay rather than the window itself
+        self._pos = value
+        origin = value - self.geometry().topLeft()
+        if origin == self.frame_origin:
+            return
+        if self.frame is not None:
+            self.set_frame_rect(self.frame_rect.translated(origin - self.frame_origin))
+        self.frame_origin = origin
+        self.frame_rects.clear()  # they are cached at the old origin
+    
+    def set_input_enabled(self, enabled: bool):
+        handle = self.windowHandle()
+        if handle:
+            handle.setFlag(Qt.WindowType.WindowTransparentForInput, not enabled)
+        if enabled:
+            panda = QRect(self.frame_origin, QSize(self.size, self.size))
+            self.setMask(QRegion(self.bubble_rect).united(QRegion(panda)))
+        else:
+            self.clearMask()
+    
+    def show_bubble(self, task: str, on_yes, on_no, pos: QPoint, from_left: bool = False):
+        """Draw the task bubble at global `pos` and listen for YES/NO."""
+        self.bubble_task = task
+        self.bubble_from_left = from_left
+        self.on_yes, self.on_no = on_yes, on_no
+        self.hovered = None
+        self.bubble_rect = QRect(pos - self.geometry().topLeft(), self.renderer.SIZE)
+        self.set_input_enabled(True)
+        self.update(self.bubble_rect)
+    
+    def hide_bubble(self):
+        if self.bubble_task is None:
+            return
+        self.bubble_task = None
+        self.on_yes = self.on_no = None
+        self.unsetCursor()
+        self.set_input_enabled(False)
+        self.update(self.bubble_rect)
+    
+    def button_at(self, point):
+        if self.bubble_task is None:
+            return None
+        return self.renderer.button_at(point - self.bubble_rect.topLeft())
+    
+    def mouseMoveEvent(self, event):
+        hovered = self.button_at(event.position().toPoint())
+        if hovered != self.hovered:
+            self.hovered = hovered
+            if hovered:
+                self.setCursor(Qt.CursorShape.PointingHandCursor)
+            else:
+                self.unsetCursor()
+            self.update(self.bubble_rect)
+    
+    def mousePressEvent(self, event):
+        if event.button() != Qt.MouseButton.LeftButton:
+            return
+        button = self.button_at(event.position().toPoint())
+        if button == "yes":
+            self.on_yes()
+        elif button == "no":
+            self.on_no()
+    
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.hide_bubble()
+    
+    def paintEvent(self, event):
+        start = self.paint_started()
+        painter = QPainter(self)
+        self.paint_frame(painter)
+        if self.bubble_task is not None and event.rect().intersects(self.bubble_rect):
+            self.renderer.paint(
+                painter, self.bubble_rect.topLeft(), self.bubble_task,
+                self.bubble_from_left, self.hovered, self.devicePixelRatioF()
+            )
+        painter.end()
+        if start:
+            self.record_paint(start)
 
 
-class RedAlertScreen(QWidget):
-    """Full screen horror red alert."""
+class RedAlertScreen(AlertSurface):
+    """Full screen horror red alert.
+    
+    Kept hidden between alerts and reused; the controller builds and
+    pre-warms it in advance and calls present() when an alert fires.
+    """
     
     def __init__(self, message: str, on_dismiss):
-        super().__init__()
+        super().__init__(message, "DO IT NOW!", "I WILL DO IT",
+                         hint="(Press ESC or click button to close)")
         self.on_dismiss_callback = on_dismiss
-        self.setWindowFlags(
-            Qt.WindowType.FramelessWindowHint |
-            Qt.WindowType.WindowStaysOnTopHint
-        )
-        self.showFullScreen()
-        
-        self.setAutoFillBackground(True)
-        palette = self.palette()
-        palette.setColor(QPalette.ColorRole.Window, QColor("#1a0000"))
-        self.setPalette(palette)
-        
-        layout = QVBoxLayout(self)
-        layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        
-        self.warning = QLabel("⚠ WARNING ⚠")
-        self.warning.setFont(QFont("Impact", 60, QFont.Weight.Bold))
-        self.warning.setStyleSheet("color: #ff0000;")
-        self.warning.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        layout.addWidget(self.warning)
-        
-        self.message_label = QLabel(message)
-        self.message_label.setFont(QFont("Impact", 100, QFont.Weight.Bold))
-        self.message_label.setStyleSheet("color: #ff0000;")
-        self.message_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        layout.addWidget(self.message_label)
-        
-        self.subtext = QLabel("DO IT NOW!")
-        self.subtext.setFont(QFont("Arial", 30))
-        self.subtext.setStyleSheet("color: #880000;")
-        self.subtext.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        layout.addWidget(self.subtext)
-        
-        btn = QPushButton("I WILL DO IT")
-        btn.setFont(QFont("Arial", 24, QFont.Weight.Bold))
-        btn.setCursor(Qt.CursorShape.PointingHandCursor)
-        btn.setStyleSheet("""
-            QPushButton {
-                background-color: #330000; color: #ff0000;
-                border: 3px solid #ff0000; padding: 20px 50px; margin-top: 50px;
-            }
-            QPushButton:hover { background-color: #ff0000; color: #000000; }
-        """)
-        btn.clicked.connect(self.dismiss)
-        layout.addWidget(btn, alignment=Qt.AlignmentFlag.AlignCenter)
-        
-        # ESC hint
-        esc_hint = QLabel("(Press ESC or click button to close)")
-        esc_hint.setStyleSheet("color: #550000; margin-top: 20px;")
-        esc_hint.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        layout.addWidget(esc_hint)
-        
-        self.flash_timer = QTimer()
-        self.flash_timer.timeout.connect(self.flash)
-        self.flash_timer.start(100)
-        self.flash_state = False
-        
-        self.shake_timer = QTimer()
-        self.shake_timer.timeout.connect(self.shake_text)
-        self.shake_timer.start(50)
-    
-    def keyPressEvent(self, event):
-        """Close on ESC key."""
-        if event.key() == Qt.Key.Key_Escape:
-            self.dismiss()
-        
-    def flash(self):
-        self.flash_state = not self.flash_state
-        palette = self.palette()
-        color = "#2a0000" if self.flash_state else "#0a0000"
-        palette.setColor(QPalette.ColorRole.Window, QColor(color))
-        self.setPalette(palette)
-        
-    def shake_text(self):
-        ox, oy = random.randint(-5, 5), random.randint(-3, 3)
-        self.message_label.setStyleSheet(f"color: #ff0000; margin-left: {ox}px; margin-top: {oy}px;")
         
     def dismiss(self):
-        """Stop everything and close."""
-        self.flash_timer.stop()
-        self.shake_timer.stop()
+        """Stop everything and hide until the next alert."""
         self.hide()
-        self.close()
-        self.deleteLater()
-        if self.on_dismiss_callback:
+        
+    def hideEvent(self, event):
+        # Also reached by closing the window some other way (e.g. Alt+F4)
+        super().hideEvent(event)
+        if self.on_dismiss_callback and not event.spontaneous():
             self.on_dismiss_callback()
 
 
+class HistoryIndex:
+    """Search index over history, newest entry first.
+    
+    Each entry is tokenized once (task words, outcome, date and time);
+    queries are answered by prefix lookups in a sorted token list
+    instead of rescanning every entry per keystroke.
+    
+    With lazy=True nothing is indexed up front: build() indexes the next
+    chunk of entries, so the history dialog can show its first rows at
+    once and index the rest a chunk per event-loop pass. `entries` and
+    search() cover the rows indexed so far.
+    """
+    
+    TOKEN_RE = re.compile(r"[\w:-]+")
+    BUILD_CHUNK = 1000
+    PREFIX_CACHE_SIZE = 64
+    
+    def __init__(self, history: list, lazy: bool = False):
+        self.history = history
+        self.entries = []
+        self.completed_rows = set()
+        self.tokens = []  # sorted
+        self.postings = {}  # token -> rows
+        self._value_tokens = {}  # (field, value) -> tokens; each distinct value is tokenized once
+        self._prefix_cache = OrderedDict()  # prefix -> rows, LRU
+        if not lazy:
+            self.build()
+    
+    @property
+    def done(self) -> bool:
+        return len(self.entries) == len(self.history)
+    
+    def build(self, count: int = None) -> bool:
+        """Index the next `count` entries (default: all the rest); True once complete."""
+        first = len(self.entries)
+        end = len(self.history) if count is None else min(len(self.history), first + count)
+        # Rows grouped by field value, so postings grow a set at a time
+        groups = {}
+        newest_first = islice(reversed(self.history), first, end)
+        for row, entry in enumerate(newest_first, first):
+            completed = bool(entry.get("completed"))
+            try:
+                dt = datetime.fromisoformat(entry["timestamp"])
+                # Formatted by hand: strftime dominates index build time
+                day = f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d}"
+                clock = f"{dt.hour:02d}:{dt.minute:02d}"
+                time_str = f"{day} {clock}"
+            except (KeyError, TypeError, ValueError):
+                day, clock, time_str = "unknown", "", "Unknown"
+            task = entry.get("task", "")
+            self.entries.append((task, completed, time_str))
+            if completed:
+                self.completed_rows.add(row)
+            for key in (("task", task), ("day", day), ("clock", clock), ("outcome", completed)):
+                groups.setdefault(key, []).append(row)
+        
+        new_tokens = []
+        for key, rows in groups.items():
+            tokens = self._value_tokens.get(key)
+            if tokens is None:
+                tokens = self._value_tokens[key] = set(self.tokenize(self._field_text(*key)))
+            for token in tokens:
+                posting = self.postings.get(token)
+                if posting is None:
+                    posting = self.postings[token] = set()
+                    new_tokens.append(token)
+                posting.update(rows)
+        if new_tokens:
+            self.tokens = sorted(self.tokens + new_tokens)
+        if end > first:
+            self._prefix_cache.clear()  # cached rows predate this chunk
+        return self.done
+    
+    @staticmethod
+    def _field_text(field: str, value) -> str:
+        if field == "outcome":
+            return "completed done yes" if value else "missed no"
+        if field == "day" and value != "unknown":
+            d = date.fromisoformat(value)
+            return f"{value} {calendar.month_name[d.month]} {calendar.day_name[d.weekday()]}"
+        return value
+    
+    @classmethod
+    def tokenize(cls, text: str) -> list:
+        return cls.TOKEN_RE.findall(text.lower())
+    
+    def _rows_for_prefix(self, prefix: str) -> set:
+        rows = self._prefix_cache.get(prefix)
+        if rows is not None:
+            self._prefix_cache.move_to_end(prefix)
+            return rows
+        rows = set()
+        i = bisect.bisect_left(self.tokens, prefix)
+        while i < len(self.tokens) and self.tokens[i].startswith(prefix):
+            rows |= self.postings[self.tokens[i]]
+            i += 1
+        self._prefix_cache[prefix] = rows
+        if len(self._prefix_cache) > self.PREFIX_CACHE_SIZE:
+            self._prefix_cache.popitem(last=False)
+        return rows
+    
+    def search(self, query: str):
+        """Rows matching every word of `query` as a prefix, or None for no filter."""
+        words = self.tokenize(query)
+        if not words:
+            return None
+        # Narrowest posting first keeps the intersections small
+        matches = sorted((self._rows_for_prefix(w) for w in set(words)), key=len)
+        result = set(matches[0])
+        for rows in matches[1:]:
+            result &= rows
+        return sorted(result)
+
+
+class HistoryModel(QAbstractListModel):
+    """Read-only list model over a HistoryIndex."""
+    
+    def __init__(self, index: HistoryIndex, parent=None):
+        super().__init__(parent)
+        self.history_index = index
+        self.task_font = get_font(10)
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.history_index.entries)
+    
+    def index_more(self, count: int) -> bool:
+        """Index `count` more entries and insert them as rows; True once complete."""
+        index = self.history_index
+        first = len(index.entries)
+        last = min(len(index.history), first + count) - 1
+        if last < first:
+            return index.build(0)
+        self.beginInsertRows(QModelIndex(), first, last)
+        done = index.build(count)
+        self.endInsertRows()
+        return done
+    
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        task, completed, time_str = self.history_index.entries[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            icon = "✓" if completed else "✗"
+            return f"{icon}  {task}\n     {time_str}"
+        if role == Qt.ItemDataRole.BackgroundRole:
+            return get_color("completed_bg" if completed else "missed_bg")
+        if role == Qt.ItemDataRole.FontRole:
+            return self.task_font
+        return None
+
+
+class HistoryFilterProxy(QAbstractProxyModel):
+    """Proxy exposing only the rows picked by HistoryIndex.search().
+    
+    The accepted rows are handed over as one sorted list, so a new filter
+    costs a single model reset instead of a Python callback per row.
+    Rows the source appends while unfiltered are passed through as
+    inserts, so the view keeps its scroll position.
+    """
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.rows = None  # None = show everything
+    
+    def setSourceModel(self, model):
+        super().setSourceModel(model)
+        model.rowsAboutToBeInserted.connect(self._source_rows_about_to_be_inserted)
+        model.rowsInserted.connect(self._source_rows_inserted)
+    
+    def _source_rows_about_to_be_inserted(self, parent, first, last):
+        if self.rows is None:
+            self.beginInsertRows(QModelIndex(), first, last)
+    
+    def _source_rows_inserted(self, parent, first, last):
+        if self.rows is None:
+            self.endInsertRows()
+    
+    def set_rows(self, rows):
+        self.beginResetModel()
+        self.rows = rows
+        self.endResetModel()
+    
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid() or self.sourceModel() is None:
+            return 0
+        if self.rows is None:
+            return self.sourceModel().rowCount()
+        return len(self.rows)
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else 1
+    
+    def index(self, row, column, parent=QModelIndex()):
+        if parent.isValid() or row < 0 or column != 0:
+            return QModelIndex()
+        return self.createIndex(row, column)
+    
+    def parent(self, index=None):
+        return QModelIndex()
+    
+    def mapToSource(self, proxy_index):
+        if not proxy_index.isValid() or self.sourceModel() is None:
+            return QModelIndex()
+        row = proxy_index.row()
+        if self.rows is not None:
+            row = self.rows[row]
+        return self.sourceModel().index(row, 0)
+    
+    def mapFromSource(self, source_index):
+        if not source_index.isValid():
+            return QModelIndex()
+        row = source_index.row()
+        if self.rows is not None:
+            pos = bisect.bisect_left(self.rows, row)
+            if pos == len(self.rows) or self.rows[pos] != row:
+                return QModelIndex()
+            row = pos
+        return self.createIndex(row, 0)
+
+
 class HistoryDialog(QDialog):
     """Dialog showing task completion history."""
     
+    SEARCH_DEBOUNCE_MS = 150
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Task History")
         self.setFixedSize(400, 500)
         self.setup_ui()
         
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.index_timer and not self.history_index.done:
+            self.index_timer.start()
+    
     def setup_ui(self):
         layout = QVBoxLayout(self)
         
         history = load_history()
-        completed = sum(1 for h in history if h["completed"])
-        missed = len(history) - completed
-        
-        stats_label = QLabel(f"✓ Completed: {completed}  |  ✗ Missed: {missed}")
-        stats_label.setFont(get_font(12, QFont.Weight.Bold))
-        stats_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        stats_label.setStyleSheet("padding: 10px; background-color: #f0f0f0; border-radius: 8px;")
-        layout.addWidget(stats_label)
-        
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll.setStyleSheet("border: none;")
-        
-        scroll_content = QWidget()
-        scroll_layout = QVBoxLayout(scroll_content)
-        scroll_layout.setSpacing(5)
-        
-        for entry in reversed(history[-50:]):
-            frame = QFrame()
-            frame.setStyleSheet(f"QFrame {{ background-color: {'#e8f5e9' if entry['completed'] else '#ffebee'}; border-radius: 8px; padding: 5px; }}")
-            
-            h_layout = QHBoxLayout(frame)
-            icon = "✓" if entry["completed"] else "✗"
-            icon_label = QLabel(icon)
-            icon_label.setFont(get_font(14))
-            icon_label.setStyleSheet(f"color: {'#4CAF50' if entry['completed'] else '#f44336'};")
-            h_layout.addWidget(icon_label)
-            
-            info_layout = QVBoxLayout()
-            task_label = QLabel(entry["task"])
-            task_label.setFont(get_font(10))
-            try:
-                dt = datetime.fromisoformat(entry["timestamp"])
-                time_str = dt.strftime("%Y-%m-%d %H:%M")
-            except:
-                time_str = "Unknown"
-            time_label = QLabel(time_str)
-            time_label.setFont(get_font(8))
-            time_label.setStyleSheet("color: #888;")
-            info_layout.addWidget(task_label)
-            info_layout.addWidget(time_label)
-            h_layout.addLayout(info_layout)
-            h_layout.addStretch()
-            
-            scroll_layout.addWidget(frame)
+        # Indexed a chunk at a time once the dialog is up (index_more)
+        self.history_index = HistoryIndex(history, lazy=True)
+        self.index_timer = None
+        
+        self.stats_label = QLabel()
+        self.stats_label.setFont(get_font(12, QFont.Weight.Bold))
+        self.stats_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.stats_label.setObjectName("historyStats")
+        layout.addWidget(self.stats_label)
+        self.update_stats(None)
         
         if not history:
             empty = QLabel("No history yet!\nThe panda will visit you soon.")
             empty.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            empty.setStyleSheet("color: #888; padding: 20px;")
-            scroll_layout.addWidget(empty)
+            empty.setObjectName("historyEmpty")
+            layout.addWidget(empty)
+            layout.addStretch()
+            return
         
-        scroll_layout.addStretch()
-        scroll.setWidget(scroll_content)
-        layout.addWidget(scroll)
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Filter by task, outcome or date...")
+        self.search_input.setFont(get_font(10))
+        self.search_input.setObjectName("historySearch")
+        self.search_input.setClearButtonEnabled(True)
+        layout.addWidget(self.search_input)
+        
+        # Debounce: only search once typing pauses
+        self.search_timer = QTimer(self)
+        self.search_timer.setObjectName("historySearchTimer")
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(self.SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.apply_filter)
+        self.search_input.textChanged.connect(self.search_timer.start)
+        
+        self.model = HistoryModel(self.history_index, self)
+        self.model.index_more(HistoryIndex.BUILD_CHUNK)  # the newest rows, before the first paint
+        self.update_stats(None)
+        self.proxy = HistoryFilterProxy(self)
+        self.proxy.setSourceModel(self.model)
+        
+        self.index_timer = QTimer(self)
+        self.index_timer.setObjectName("historyIndexTimer")
+        self.index_timer.setInterval(0)
+        self.index_timer.timeout.connect(self.index_more)
+        
+        # A table view only touches visible rows; QListView lays out every row
+        self.list_view = QTableView()
+        self.list_view.setObjectName("historyList")
+        self.list_view.setModel(self.proxy)
+        self.list_view.setShowGrid(False)
+        self.list_view.horizontalHeader().hide()
+        self.list_view.horizontalHeader().setStretchLastSection(True)
+        self.list_view.verticalHeader().hide()
+        self.list_view.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.list_view.verticalHeader().setDefaultSectionSize(44)
+        self.list_view.setWordWrap(False)
+        self.list_view.setEditTriggers(QTableView.EditTrigger.NoEditTriggers)
+        self.list_view.setSelectionMode(QTableView.SelectionMode.NoSelection)
+        layout.addWidget(self.list_view)
+    
+    def index_more(self):
+        """Index the next chunk of history; re-run a filter once it is all in."""
+        done = self.model.index_more(HistoryIndex.BUILD_CHUNK)
+        if done:
+            self.index_timer.stop()
+        if self.proxy.rows is None:
+            self.update_stats(None)
+        elif done:
+            self.apply_filter()
+    
+    def apply_filter(self):
+        rows = self.history_index.search(self.search_input.text())
+        self.proxy.set_rows(rows)
+        self.update_stats(rows)
+    
+    def update_stats(self, rows):
+        index = self.history_index
+        if rows is None:
+            total = len(index.entries)
+            completed = len(index.completed_rows)
+        else:
+            total = len(rows)
+            completed = len(index.completed_rows.intersection(rows))
+        missed = total - completed
+        self.stats_label.setText(f"✓ Completed: {completed}  |  ✗ Missed: {missed}")
 
 
 class SettingsDialog(QDialog):
@@ -520,7 +1270,7 @@ class SettingsDialog(QDialog):
         title = QLabel("🐼 Hit & Run Panda")
         title.setFont(get_font(18, QFont.Weight.Bold))
         title.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        title.setStyleSheet("color: #333; padding: 10px;")
+        title.setObjectName("settingsTitle")
         layout.addWidget(title)
         
         # Tabs
@@ -533,10 +1283,7 @@ class SettingsDialog(QDialog):
         save_btn = QPushButton("💾 Save All Settings")
         save_btn.setCursor(Qt.CursorShape.PointingHandCursor)
         save_btn.setFont(get_font(12, QFont.Weight.Bold))
-        save_btn.setStyleSheet("""
-            QPushButton { background-color: #2196F3; color: white; border: none; padding: 15px; border-radius: 10px; }
-            QPushButton:hover { background-color: #1976D2; }
-        """)
+        save_btn.setProperty("variant", "primary")
         save_btn.clicked.connect(self.save_all)
         layout.addWidget(save_btn)
         
@@ -570,6 +1317,56 @@ class SettingsDialog(QDialog):
         
         layout.addWidget(interval_group)
         
+        trim_layout = QHBoxLayout()
+        trim_label = QLabel("Free memory after idle minutes (0 = never):")
+        trim_label.setFont(get_font(10))
+        trim_layout.addWidget(trim_label)
+        self.idle_trim = QSpinBox()
+        self.idle_trim.setRange(0, 999)
+        self.idle_trim.setValue(self.controller.settings.get("idle_trim_minutes", 10))
+        self.idle_trim.setFont(get_font(10))
+        trim_layout.addWidget(self.idle_trim)
+        trim_layout.addStretch()
+        layout.addLayout(trim_layout)
+        
+        rate_layout = QHBoxLayout()
+        rate_label = QLabel("Animation frame rate:")
+        rate_label.setFont(get_font(10))
+        rate_layout.addWidget(rate_label)
+        self.frame_rate_policy = QComboBox()
+        self.frame_rate_policy.addItems(list(FrameRateGovernor.POLICIES))
+        self.frame_rate_policy.setCurrentText(
+            self.controller.settings.get("frame_rate_policy", "adaptive")
+        )
+        self.frame_rate_policy.setToolTip(
+            "adaptive: lower the walk frame rate when the machine is busy\n"
+            "power saver: choppier walk, less CPU (battery, remote desktops)"
+        )
+        self.frame_rate_policy.setFont(get_font(10))
+        rate_layout.addWidget(self.frame_rate_policy)
+        rate_layout.addStretch()
+        layout.addLayout(rate_layout)
+        
+        self.overlay_mode = QCheckBox("Draw panda and bubble in one overlay window")
+        self.overlay_mode.setFont(get_font(10))
+        self.overlay_mode.setChecked(self.controller.settings.get("overlay_mode", False))
+        layout.addWidget(self.overlay_mode)
+        
+        skin_layout = QHBoxLayout()
+        skin_label = QLabel("Skin:")
+        skin_label.setFont(get_font(10))
+        skin_layout.addWidget(skin_label)
+        self.skin_combo = QComboBox()
+        self.skin_combo.setFont(get_font(10))
+        self.skin_combo.addItem("🐼 Panda (built-in)", "")
+        for name in find_skins(SKINS_DIR):
+            self.skin_combo.addItem(name, name)
+        current = self.skin_combo.findData(self.controller.settings.get("skin", ""))
+        self.skin_combo.setCurrentIndex(max(current, 0))
+        skin_layout.addWidget(self.skin_combo)
+        skin_layout.addStretch()
+        layout.addLayout(skin_layout)
+        
         # Tasks section
         tasks_label = QLabel("Tasks (panda will ask these):")
         tasks_label.setFont(get_font(11, QFont.Weight.Bold))
@@ -579,27 +1376,27 @@ class SettingsDialog(QDialog):
         self.task_input = QLineEdit()
         self.task_input.setPlaceholderText("Type a new task...")
         self.task_input.setFont(get_font(10))
-        self.task_input.setStyleSheet("padding: 8px; border: 2px solid #ddd; border-radius: 8px;")
+        self.task_input.setObjectName("taskInput")
         self.task_input.returnPressed.connect(self.add_task)
         add_layout.addWidget(self.task_input)
         
         add_btn = QPushButton("+ Add")
         add_btn.setCursor(Qt.CursorShape.PointingHandCursor)
-        add_btn.setStyleSheet("background-color: #4CAF50; color: white; border: none; padding: 8px 15px; border-radius: 8px;")
+        add_btn.setProperty("variant", "small-yes")
         add_btn.clicked.connect(self.add_task)
         add_layout.addWidget(add_btn)
         layout.addLayout(add_layout)
         
         self.task_list = QListWidget()
         self.task_list.setFont(get_font(10))
-        self.task_list.setStyleSheet("border: 2px solid #ddd; border-radius: 8px; padding: 5px;")
+        self.task_list.setObjectName("taskList")
         for task in self.controller.settings.get("tasks", []):
             self.task_list.addItem(task)
         layout.addWidget(self.task_list)
         
         delete_btn = QPushButton("🗑️ Delete Selected")
         delete_btn.setCursor(Qt.CursorShape.PointingHandCursor)
-        delete_btn.setStyleSheet("background-color: #f44336; color: white; border: none; padding: 8px 15px; border-radius: 8px;")
+        delete_btn.setProperty("variant", "small-no")
         delete_btn.clicked.connect(lambda: self.task_list.takeItem(self.task_list.currentRow()) if self.task_list.currentRow() >= 0 else None)
         layout.addWidget(delete_btn)
         
@@ -618,7 +1415,7 @@ class SettingsDialog(QDialog):
         
         # Description
         desc = QLabel("Full-screen aggressive reminder that demands attention!")
-        desc.setStyleSheet("color: #666; font-style: italic;")
+        desc.setObjectName("settingsHint")
         layout.addWidget(desc)
         
         # Interval
@@ -647,7 +1444,7 @@ class SettingsDialog(QDialog):
         self.red_message = QLineEdit()
         self.red_message.setText(self.controller.settings.get("red_alert_message", "DRINK WATER NOW!"))
         self.red_message.setFont(get_font(12))
-        self.red_message.setStyleSheet("padding: 10px; border: 2px solid #f44336; border-radius: 8px;")
+        self.red_message.setObjectName("alertMessageInput")
         msg_layout.addWidget(self.red_message)
         
         layout.addWidget(msg_group)
@@ -656,10 +1453,7 @@ class SettingsDialog(QDialog):
         test_btn = QPushButton("🚨 Test Red Alert")
         test_btn.setCursor(Qt.CursorShape.PointingHandCursor)
         test_btn.setFont(get_font(11, QFont.Weight.Bold))
-        test_btn.setStyleSheet("""
-            QPushButton { background-color: #f44336; color: white; border: none; padding: 12px; border-radius: 8px; }
-            QPushButton:hover { background-color: #d32f2f; }
-        """)
+        test_btn.setProperty("variant", "danger")
         test_btn.clicked.connect(self.test_red_alert)
         layout.addWidget(test_btn)
         
@@ -689,6 +1483,10 @@ class SettingsDialog(QDialog):
         self.controller.settings["panda_enabled"] = self.panda_enabled.isChecked()
         self.controller.settings["panda_interval"] = self.panda_interval.value()
         self.controller.settings["panda_interval_unit"] = self.panda_unit.currentText()
+        self.controller.settings["overlay_mode"] = self.overlay_mode.isChecked()
+        self.controller.settings["skin"] = self.skin_combo.currentData()
+        self.controller.settings["idle_trim_minutes"] = self.idle_trim.value()
+        self.controller.settings["frame_rate_policy"] = self.frame_rate_policy.currentText()
         self.controller.settings["tasks"] = tasks
         self.controller.settings["red_alert_enabled"] = self.red_alert_enabled.isChecked()
         self.controller.settings["red_alert_interval"] = self.red_interval.value()
@@ -697,6 +1495,9 @@ class SettingsDialog(QDialog):
         
         save_settings(self.controller.settings)
         self.controller.update_timers()
+        self.controller.apply_skin()
+        self.controller.apply_frame_rate_policy()
+        self.controller.schedule_idle_trim()
         
         QMessageBox.information(self, "Saved", "Settings saved! 🐼")
         self.close()
@@ -705,18 +1506,35 @@ class SettingsDialog(QDialog):
 class PetController:
     """Main controller for the productivity pet."""
     
+    RESTORE_LEAD_MS = 5000  # reload trimmed sprites this long before a reminder
+    
     def __init__(self):
         self.app = QApplication(sys.argv)
         self.app.setQuitOnLastWindowClosed(False)
+        theme.install(self.app)
         
         self.settings = load_settings()
         self.is_first_run = self.settings.get("first_run", True)
         
-        self.sprite_manager = SpriteManager(CONFIG["character_size"])
+        # Tray first, so it appears while sprites decode on the thread pool
+        self.setup_tray()
+        self.sprite_manager = SpriteManager(CONFIG["character_size"], background=True)
+        self.apply_skin()
         
-        self.character = CharacterWidget(self.sprite_manager)
-        self.bubble = None
-        self.red_alert_screen = None
+        self.panda_window = CharacterWidget(
+            self.sprite_manager, self.settings.get("frame_rate_policy", "adaptive")
+        )
+        self.character = self.panda_window
+        self.overlays = {}  # QScreen -> PandaOverlay, created on first use
+        self.app.screenRemoved.connect(self.on_screen_removed)
+        self.crowd = None
+        self.bubble = None  # built and pre-warmed once the event loop is idle
+        self.bubble_renderer = BubbleRenderer()
+        self.red_alert_screen = None  # hidden between alerts, see prewarm_red_alert()
+        self.wakeups = WakeupCounter(self.app) if os.environ.get("PANDA_COUNT_WAKEUPS") else None
+        if os.environ.get("PANDA_FRAME_STATS"):
+            shared_clock().stats = FrameStats()
+        self.stats_overlay = None
         self.current_task = ""
         self.task_index = 0
         self.is_busy = False
@@ -731,24 +1549,41 @@ class PetController:
         # Positions for both sides
         self.bottom_y = self.screen_height - self.char_size - 50
         
-        self.setup_tray()
-        
         # Panda timer
         self.panda_timer = QTimer()
+        self.panda_timer.setObjectName("pandaTimer")
         self.panda_timer.timeout.connect(self.trigger_reminder)
         
         # Red alert timer
         self.red_alert_timer = QTimer()
+        self.red_alert_timer.setObjectName("redAlertTimer")
         self.red_alert_timer.timeout.connect(self.trigger_red_alert)
         
+        # Idle memory trimming between reminders
+        self.trimmed = False
+        self.idle_timer = QTimer()
+        self.idle_timer.setObjectName("idleTrimTimer")
+        self.idle_timer.setSingleShot(True)
+        self.idle_timer.timeout.connect(self.trim_memory)
+        self.restore_timer = QTimer()
+        self.restore_timer.setObjectName("restoreTimer")
+        self.restore_timer.setSingleShot(True)
+        self.restore_timer.timeout.connect(self.restore_memory)
+        
         # Only start timers if not first run
         if not self.is_first_run:
             self.update_timers()
+        self.schedule_idle_trim()
         
-        # Walk animation
-        self.walk_animation = QPropertyAnimation(self.character, b"pos")
+        # Walk animation, stepped by the shared animation clock
+        self.walk_animation = Tween(self.character, b"pos")
         self.walk_animation.setEasingCurve(QEasingCurve.Type.Linear)
         self.walk_animation.setDuration(CONFIG["walk_speed_ms"])
+        # Kept so an abandoned visit can cancel the walk off after a reaction
+        self.leave_timer = QTimer()
+        self.leave_timer.setObjectName("leaveTimer")
+        self.leave_timer.setSingleShot(True)
+        self.leave_timer.timeout.connect(self.walk_off_screen)
         
         # IPC server
         self.server = QLocalServer()
@@ -756,9 +1591,13 @@ class PetController:
         self.server.listen("HitAndRunPanda")
         self.server.newConnection.connect(self.handle_cli_command)
         
+        # Build the reminder bubble (and overlay) as soon as the event loop is idle
+        QTimer.singleShot(0, self.prewarm_bubble)
+        QTimer.singleShot(0, self.prewarm_overlay)
+        
     def setup_tray(self):
         self.tray = QSystemTrayIcon()
-        icon_path = os.path.join(ASSETS_DIR, "walking panda 1.png")
+        icon_path = os.path.join(ASSETS_DIR, TRAY_ICON)
         self.tray.setIcon(QIcon(icon_path))
         
         menu = QMenu()
@@ -767,6 +1606,11 @@ class PetController:
         show_action.triggered.connect(self.trigger_reminder)
         menu.addAction(show_action)
         
+        self.crowd_action = QAction("👥 Crowd Mode", menu)
+        self.crowd_action.setCheckable(True)
+        self.crowd_action.toggled.connect(self.set_crowd_visible)
+        menu.addAction(self.crowd_action)
+        
         menu.addSeparator()
         
         settings_action = QAction("⚙️ Settings", menu)
@@ -793,6 +1637,27 @@ class PetController:
         self.tray.setToolTip("Hit & Run Panda")
         self.tray.show()
         
+    def apply_skin(self):
+        """Point the sprite manager at the skin chosen in settings."""
+        name = self.settings.get("skin", "")
+        current = self.sprite_manager.skin
+        if (current.name if current else "") == name:
+            return
+        path = find_skins(SKINS_DIR).get(name) if name else None
+        skin = None
+        if path:
+            skin = Skin.from_path(path, CONFIG["character_size"], self.sprite_manager.dpr,
+                                  self.sprite_manager.disk_cache)
+        if name and skin is None:
+            print(f"⚠ Could not load skin '{name}', using the panda")
+        self.sprite_manager.set_skin(skin)
+    
+    def apply_frame_rate_policy(self):
+        policy = self.settings.get("frame_rate_policy", "adaptive")
+        for character in [self.panda_window, *self.overlays.values()]:
+            if character:
+                character.set_frame_rate_policy(policy)
+    
     def update_timers(self):
         # Panda timer - only if enabled
         if self.settings.get("panda_enabled", False):
@@ -813,8 +1678,12 @@ class PetController:
             )
             self.red_alert_timer.setInterval(red_ms)
             self.red_alert_timer.start()
+            # Build the alert window as soon as the event loop is idle
+            QTimer.singleShot(0, self.prewarm_red_alert)
         else:
             self.red_alert_timer.stop()
+            self.drop_red_alert()
+        self.schedule_restore()
             
     def get_positions(self, from_left: bool):
         """Get start, on-screen, and exit positions based on direction."""
@@ -826,11 +1695,51 @@ class PetController:
             on_screen = QPoint(self.screen_width - self.char_size - 50, self.bottom_y)
         return off_screen, on_screen
         
+    def get_overlay(self, screen):
+        if screen not in self.overlays:
+            self.overlays[screen] = PandaOverlay(
+                self.sprite_manager, screen, self.bubble_renderer,
+                self.settings.get("frame_rate_policy", "adaptive")
+            )
+        return self.overlays[screen]
+    
+    def prewarm_overlay(self):
+        """In overlay mode, build the primary screen's overlay and its native
+        window ahead of the first visit, and again after an idle trim."""
+        if self.trimmed or not self.settings.get("overlay_mode", False):
+            return
+        self.get_overlay(self.app.primaryScreen()).winId()
+    
+    def on_screen_removed(self, screen):
+        overlay = self.overlays.pop(screen, None)
+        if overlay is None:
+            return
+        if overlay is self.character:
+            # Abandon the visit; the next one starts on the remaining screen
+            self.walk_animation.stop()
+            for slot in (self.on_arrived, self.on_left):
+                try:
+                    self.walk_animation.finished.disconnect(slot)
+                except TypeError:
+                    pass  # not connected at this stage of the visit
+            self.leave_timer.stop()
+            self.character = self.panda_window
+            self.is_busy = False
+            self.update_idle_state()
+        overlay.deleteLater()
+        
     def trigger_reminder(self):
         if self.is_busy:
             return
         self.is_busy = True
-        
+        self.update_idle_state()
+        self.restore_memory()
+        self.idle_timer.stop()
+        # Right after startup the sprites may still be decoding; wait for
+        # them without blocking the event loop
+        self.sprite_manager.when_ready(self.start_reminder)
+        
+    def start_reminder(self):
         # Random side
         self.coming_from_left = random.choice([True, False])
         
@@ -842,11 +1751,19 @@ class PetController:
         self.current_on_pos = on_pos
         self.current_off_pos = off_pos
         
-        self.character.move(off_pos)
+        if self.settings.get("overlay_mode", False):
+            self.character = self.get_overlay(self.app.primaryScreen())
+        else:
+            self.character = self.panda_window
+        self.walk_animation.setTargetObject(self.character)
+        
+        self.character.pos = off_pos
         self.character.show()
         
         # Walking: mirrored if coming from left (facing right)
         self.character.start_walking(mirrored=self.coming_from_left)
+        # Decode the reaction frames while the panda walks in
+        self.sprite_manager.prefetch(["victory", "angry", "crying", "walk_mirror"])
         
         self.walk_animation.setStartValue(off_pos)
         self.walk_animation.setEndValue(on_pos)
@@ -860,9 +1777,7 @@ class PetController:
             pass
         
         self.character.stop_animation()
-        self.character.set_frame(self.sprite_manager.get_walk_frame(0, mirrored=self.coming_from_left))
-        
-        self.bubble = SpeechBubble(self.current_task, self.on_yes, self.on_no, self.coming_from_left)
+        self.character.show_sprite(self.sprite_manager.get_walk_frame, 0, self.coming_from_left)
         
         # Position bubble based on side
         if self.coming_from_left:
@@ -871,6 +1786,15 @@ class PetController:
             bubble_x = self.current_on_pos.x() - 160
         bubble_y = self.current_on_pos.y() - 50
         
+        if isinstance(self.character, PandaOverlay):
+            self.character.show_bubble(
+                self.current_task, self.on_yes, self.on_no, QPoint(bubble_x, bubble_y),
+                self.coming_from_left
+            )
+            return
+        
+        self.prewarm_bubble()
+        self.bubble.set_task(self.current_task, self.on_yes, self.on_no, self.coming_from_left)
         self.bubble.move(bubble_x, bubble_y)
         self.bubble.show()
         
@@ -878,7 +1802,7 @@ class PetController:
         log_task(self.current_task, True)
         self.hide_bubble()
         self.character.start_victory()
-        QTimer.singleShot(1500, self.walk_off_screen)
+        self.leave_timer.start(1500)
         
     def on_no(self):
         log_task(self.current_task, False)
@@ -887,13 +1811,20 @@ class PetController:
             self.character.show_angry()
         else:
             self.character.show_crying()
-        QTimer.singleShot(1500, self.walk_off_screen)
+        self.leave_timer.start(1500)
         
     def hide_bubble(self):
+        if isinstance(self.character, PandaOverlay):
+            self.character.hide_bubble()
         if self.bubble:
             self.bubble.hide()
-            self.bubble.deleteLater()
-            self.bubble = None
+            # Drop the callbacks; the widget itself is kept for the next visit
+            self.bubble.set_task("", None, None)
+    
+    def prewarm_bubble(self):
+        if self.bubble is None:
+            self.bubble = PaintedBubble(self.bubble_renderer)
+            self.bubble.prewarm(self.settings.get("tasks", []))
         
     def walk_off_screen(self):
         self.character.stop_animation()
@@ -913,19 +1844,146 @@ class PetController:
         self.character.stop_animation()
         self.character.hide()
         self.is_busy = False
+        self.update_idle_state()
+        self.schedule_idle_trim()
+    
+    def update_idle_state(self):
+        """Tell the wakeup counter whether anything is on screen."""
+        if self.wakeups:
+            self.wakeups.set_idle(not (self.is_busy or self.crowd or self.red_alert_visible()))
+    
+    def schedule_idle_trim(self):
+        minutes = self.settings.get("idle_trim_minutes", 10)
+        if minutes > 0:
+            self.idle_timer.start(minutes * 60 * 1000)
+        else:
+            self.idle_timer.stop()  # "never"
+    
+    def next_reminder_ms(self):
+        """Time until the next panda reminder or red alert, or None."""
+        remaining = [t.remainingTime() for t in (self.panda_timer, self.red_alert_timer) if t.isActive()]
+        return min(remaining) if remaining else None
+    
+    def schedule_restore(self):
+        """Restore trimmed memory shortly before the next reminder or alert."""
+        next_ms = self.next_reminder_ms()
+        if self.trimmed and next_ms is not None:
+            self.restore_timer.start(max(0, next_ms - self.RESTORE_LEAD_MS))
+    
+    def trim_memory(self):
+        """Release decoded frames and hidden windows while the pet is away."""
+        if self.trimmed or self.is_busy or self.crowd or self.red_alert_visible():
+            return
+        if self.settings.get("idle_trim_minutes", 10) <= 0:
+            return
+        next_ms = self.next_reminder_ms()
+        if next_ms is not None and next_ms < 2 * self.RESTORE_LEAD_MS:
+            return  # back too soon to be worth reloading
+        before = resident_memory()
+        pixmaps = self.sprite_manager.pixmap_bytes()
+        if not self.sprite_manager.trim():
+            return
+        for overlay in self.overlays.values():
+            overlay.deleteLater()
+        self.overlays.clear()
+        if self.bubble:
+            self.bubble.deleteLater()
+            self.bubble = None
+        self.bubble_renderer.clear()
+        self.walk_animation.setTargetObject(None)
+        self.panda_window.deleteLater()
+        self.panda_window = self.character = None
+        self.drop_red_alert()
+        self.trimmed = True
+        self.schedule_restore()
+        # The windows go away on the next event loop pass; measure after that
+        QTimer.singleShot(0, lambda: self.report_trim(before, pixmaps))
+    
+    def report_trim(self, before, pixmaps: int):
+        release_freed_memory()
+        after = resident_memory()
+        if before is None or after is None:
+            print(f"🧹 Idle: released {pixmaps / 1024 ** 2:.1f} MiB of sprites and the pet windows")
+        else:
+            print(f"🧹 Idle: released {pixmaps / 1024 ** 2:.1f} MiB of sprites and the pet windows, "
+                  f"RSS {before / 1024 ** 2:.1f} -> {after / 1024 ** 2:.1f} MiB")
+    
+    def restore_memory(self):
+        """Undo trim_memory(): reload the sprites and rebuild the pet window."""
+        if not self.trimmed:
+            return
+        self.trimmed = False
+        self.restore_timer.stop()
+        self.sprite_manager.restore()
+        self.panda_window = self.character = CharacterWidget(
+            self.sprite_manager, self.settings.get("frame_rate_policy", "adaptive")
+        )
+        QTimer.singleShot(0, self.prewarm_bubble)
+        QTimer.singleShot(0, self.prewarm_overlay)
+        if self.settings.get("red_alert_enabled", False):
+            QTimer.singleShot(0, self.prewarm_red_alert)
+        self.schedule_idle_trim()
+        
+    def set_crowd_visible(self, visible: bool):
+        """Crowd mode: one pet per task walking along the bottom of the screen."""
+        if not visible:
+            if self.crowd:
+                self.crowd.stop()
+                self.crowd.hide()
+                self.crowd.deleteLater()
+                self.crowd = None
+                self.update_idle_state()
+                self.schedule_idle_trim()
+            return
+        if self.crowd:
+            return
+        self.crowd = PetCrowd(self.sprite_manager)
+        self.crowd.ensure_sheet()
+        screen = self.app.primaryScreen().availableGeometry()
+        height = self.crowd.minimumHeight()
+        self.crowd.setGeometry(screen.x(), screen.bottom() - height + 1, screen.width(), height)
+        for task in self.settings.get("tasks", []):
+            self.crowd.add_pet(task)
+        self.crowd.show()
+        self.crowd.start()
+        self.update_idle_state()
+    
+    def toggle_crowd(self):
+        self.crowd_action.toggle()
         
     def trigger_red_alert(self):
         msg = self.settings.get("red_alert_message", "DRINK WATER NOW!")
         self.show_red_alert(msg)
         
+    def prewarm_red_alert(self):
+        """Build the alert window hidden, so an alert only has to show it."""
+        message = self.settings.get("red_alert_message", "DRINK WATER NOW!")
+        if self.red_alert_screen is None:
+            self.red_alert_screen = RedAlertScreen(message, self.on_red_alert_dismiss)
+            self.red_alert_screen.prewarm()
+        elif not self.red_alert_screen.isVisible() and message != self.red_alert_screen.message:
+            self.red_alert_screen.set_message(message)  # edited in the settings
+    
+    def drop_red_alert(self):
+        """Free the hidden alert window (it is rebuilt before it is needed)."""
+        if self.red_alert_screen and not self.red_alert_screen.isVisible():
+            self.red_alert_screen.deleteLater()
+            self.red_alert_screen = None
+            text_pixmap.cache_clear()  # the full-screen texts it rendered
+    
+    def red_alert_visible(self) -> bool:
+        return bool(self.red_alert_screen and self.red_alert_screen.isVisible())
+        
     def show_red_alert(self, message: str):
-        if self.red_alert_screen:
-            self.red_alert_screen.close()
-        self.red_alert_screen = RedAlertScreen(message, self.on_red_alert_dismiss)
-        self.red_alert_screen.show()
+        if self.red_alert_screen is None:
+            self.prewarm_red_alert()  # not enabled, e.g. the settings test button
+        # A new alert while one is up just replaces its message
+        self.red_alert_screen.present(message)
+        self.update_idle_state()
         
     def on_red_alert_dismiss(self):
-        self.red_alert_screen = None
+        self.update_idle_state()
+        self.schedule_idle_trim()  # a trim that came due during the alert was skipped
         
     def show_history(self):
         dialog = HistoryDialog()
@@ -938,12 +1996,47 @@ class PetController:
     def quit_app(self):
         self.server.close()
         self.tray.hide()
+        # Drop queued sprite decodes and let running ones finish while
+        # the objects they report to still exist
+        pool = QThreadPool.globalInstance()
+        pool.clear()
+        pool.waitForDone()
         self.app.quit()
     
+    def wakeup_report(self) -> str:
+        """Idle timer wakeups; the first request starts counting."""
+        if self.wakeups is None:
+            self.wakeups = WakeupCounter(self.app)
+            self.update_idle_state()
+            return "Counting timer wakeups from now; ask again later for the report"
+        return self.wakeups.report()
+    
+    def frame_stats_report(self) -> str:
+        """Frame timing histograms; the first request starts recording."""
+        clock = shared_clock()
+        if clock.stats is None:
+            clock.stats = FrameStats()
+            return "Recording frame timing from now; ask again after a visit for the report"
+        return clock.stats.report()
+    
+    def toggle_stats_overlay(self):
+        """Show or hide the live frame timing window (starts recording)."""
+        if self.stats_overlay:
+            self.stats_overlay.close()
+            self.stats_overlay.deleteLater()
+            self.stats_overlay = None
+            return
+        clock = shared_clock()
+        if clock.stats is None:
+            clock.stats = FrameStats()
+        self.stats_overlay = FrameStatsOverlay(clock.stats, clock)
+        self.stats_overlay.show()
+    
     def handle_cli_command(self):
         socket = self.server.nextPendingConnection()
         if socket and socket.waitForReadyRead(1000):
             cmd = socket.readAll().data().decode().strip()
+            reply = "ok"
             if cmd == "show":
                 self.trigger_reminder()
             elif cmd == "settings":
@@ -952,7 +2045,15 @@ class PetController:
                 self.show_history()
             elif cmd == "redalert":
                 self.trigger_red_alert()
-            socket.write(b"ok")
+            elif cmd == "crowd":
+                self.toggle_crowd()
+            elif cmd == "wakeups":
+                reply = self.wakeup_report()
+            elif cmd == "framestats":
+                reply = self.frame_stats_report()
+            elif cmd == "statsoverlay":
+                self.toggle_stats_overlay()
+            socket.write(reply.encode())
             socket.flush()
             socket.disconnectFromServer()
         
@@ -1001,7 +2102,10 @@ def send_command(cmd: str) -> bool:
     if socket.waitForConnected(1000):
         socket.write(cmd.encode())
         socket.flush()
-        socket.waitForReadyRead(1000)
+        if socket.waitForReadyRead(1000):
+            reply = socket.readAll().data().decode()
+            if reply != "ok":
+                print(reply)
         socket.disconnectFromServer()
         return True
     return False
@@ -1010,14 +2114,15 @@ def send_command(cmd: str) -> bool:
 if __name__ == "__main__":
     if len(sys.argv) > 1:
         cmd = sys.argv[1].lower()
-        if cmd in ("show", "settings", "history", "redalert"):
+        if cmd in ("show", "settings", "history", "redalert", "crowd", "wakeups",
+                   "framestats", "statsoverlay"):
             if send_command(cmd):
                 print(f"✓ Sent '{cmd}'")
             else:
                 print("✗ Panda not running! Start with: python main.py")
             sys.exit(0)
         else:
-            print("Usage: python main.py [show|settings|history|redalert]")
+            print("Usage: python main.py [show|settings|history|redalert|crowd|wakeups|framestats|statsoverlay]")
             sys.exit(1)
     
     controller = PetController()
@@ -45,15 +45,17 @@ def install_app(install_dir=None, create_desktop=True, create_startup=False):
     (install_dir / "assets").mkdir(exist_ok=True)
     
     # Copy files
-    files_to_copy = ["main.py", "launcher.pyw", "red_alert.py"]
+    files_to_copy = ["main.py", "launcher.pyw", "red_alert.py", "theme.py", "sprite_assets.py", "sprite_cache.py", "sprite_atlas.py", "crowd.py", "bubble.py", "skins.py", "animation.py", "frame_stats.py", "clips.py", "alert.py"]
     for f in files_to_copy:
         src = source_dir / f
         if src.exists():
             shutil.copy2(src, install_dir / f)
             print(f"  Copied {f}")
     
-    # Copy assets
-    assets_src = source_dir / "assets"
+    # Copy assets (the compiled set from build_assets.py when present)
+    assets_src = source_dir / "compiled_assets"
+    if not assets_src.exists():
+        assets_src = source_dir / "assets"
     if assets_src.exists():
         for f in assets_src.iterdir():
             try:
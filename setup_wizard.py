@@ -22,6 +22,7 @@ APP_NAME = "Hit and Run Panda"
 APP_VERSION = "1.0.0"
 APP_PUBLISHER = "Panda Software"
 APP_EXE = "HitAndRunPanda.exe"
+SOURCE_MODULES = ["main.py", "theme.py", "sprite_assets.py", "sprite_cache.py", "sprite_atlas.py", "crowd.py", "bubble.py", "skins.py", "animation.py", "frame_stats.py", "clips.py", "alert.py"]
 UNINSTALL_KEY = r"Software\Microsoft\Windows\CurrentVersion\Uninstall\HitAndRunPanda"
 
 
@@ -54,11 +55,14 @@ class InstallThread(QThread):
             else:
                 # If running from source, copy launcher
                 shutil.copy2(Path(self.source_dir) / "launcher.pyw", install_path / "launcher.pyw")
-                shutil.copy2(Path(self.source_dir) / "main.py", install_path / "main.py")
+                for module in SOURCE_MODULES:
+                    shutil.copy2(Path(self.source_dir) / module, install_path / module)
             
             # Step 3: Copy assets
             self.progress.emit(40, "Copying assets...")
-            src_assets = Path(self.source_dir) / "assets"
+            src_assets = Path(self.source_dir) / "compiled_assets"
+            if not src_assets.exists():
+                src_assets = Path(self.source_dir) / "assets"
             if src_assets.exists():
                 for f in src_assets.iterdir():
                     try:
@@ -0,0 +1,483 @@
+"""
+Hit & Run Panda - Custom Skins
+User-supplied pet skins, streamed frame by frame instead of decoded up
+front like the built-in panda sprites.
+
+A skin is one animated file (GIF, APNG, WebP) used for every state, or
+a folder with one file per state (walk.gif, victory.png, ...); states
+without a file fall back to the walk animation. A still image that is
+a whole number of squares wide is a horizontal sprite sheet.
+
+A skin pack is one .zip with a skin.json manifest naming each state's
+frames, their durations and an anchor point (the pixel that stands on
+the ground, bottom centre by default). The manifest is read once and
+cached; each stream opens the zip for its own lifetime and closes it
+when the skin drops the stream, so no file handle outlives the skin.
+Members are read on demand, so switching to a pack only decodes the
+frames that are actually shown:
+
+    {"anchor": [64, 124],
+     "states": {"walk": {"frames": ["walk1.png", "walk2.png"],
+                         "durations": [120, 180]},
+                "victory": {"file": "victory.gif"}}}
+
+Frames go through QImageReader one at a time (a sprite sheet a few
+clipped frames at a time), scaled to the character size as they are
+read, into a small ring of ready frames. Memory stays the same however
+long the animation is. Given the sprite disk cache, pack frames are
+kept there already scaled, so later cycles and launches read raw
+pixels instead of decoding the PNG again. APNG files animate only where
+Qt has an APNG image plugin; otherwise their first frame is shown.
+"""
+
+import bisect
+import json
+import os
+import time
+import zipfile
+from collections import deque
+from functools import lru_cache, partial
+
+from PyQt6.QtCore import QBuffer, QFile, QPoint, QRect, QSize, Qt
+from PyQt6.QtGui import QImage, QImageReader, QPainter, QPixmap, QTransform
+
+SKIN_EXTENSIONS = (".gif", ".png", ".apng", ".webp")
+PACK_EXTENSION = ".zip"
+PACK_MANIFEST = "skin.json"
+STATES = ("walk", "victory", "angry", "crying")
+RING_SIZE = 4
+DEFAULT_DURATION_MS = 150
+
+
+def _fit(size: QSize, pixels: int) -> QSize:
+    return size.scaled(pixels, pixels, Qt.AspectRatioMode.KeepAspectRatio)
+
+
+def _anchored(image: QImage, source: QSize, anchor, pixels: int) -> QImage:
+    """`image`, scaled from `source`, on a square canvas with the source
+    pixel `anchor` (bottom centre by default) at the canvas's bottom centre."""
+    ax, ay = anchor if anchor else (source.width() / 2, source.height())
+    factor = image.width() / source.width()
+    canvas = QImage(pixels, pixels, QImage.Format.Format_ARGB32_Premultiplied)
+    canvas.fill(Qt.GlobalColor.transparent)
+    painter = QPainter(canvas)
+    painter.drawImage(QPoint(round(pixels / 2 - ax * factor), round(pixels - ay * factor)), image)
+    painter.end()
+    return canvas
+
+
+def _to_pixmap(image: QImage, dpr: float, mirrored: bool) -> QPixmap:
+    if mirrored:
+        image = image.transformed(QTransform().scale(-1, 1))
+    pixmap = QPixmap.fromImage(image)
+    pixmap.setDevicePixelRatio(dpr)
+    return pixmap
+
+
+class FrameStream:
+    """One looping animation, decoded on demand into a ring of frames.
+
+    `open_device` returns a fresh, unopened QIODevice for the source each
+    time the animation restarts from the first frame. With an `anchor`
+    (from a pack manifest), frames are placed like FrameListStream's. An
+    `archive` the device reads from is closed along with the stream.
+    """
+
+    def __init__(self, open_device, size: int, dpr: float, mirrored: bool = False,
+                 ring_size: int = RING_SIZE, anchor=None, archive=None):
+        self.open_device = open_device
+        self.anchor = anchor
+        self.archive = archive
+        self.source_frame = None  # unscaled size of one frame
+        self.pixels = round(size * dpr)
+        self.dpr = dpr
+        self.mirrored = mirrored
+        self.ring = deque(maxlen=ring_size)
+        self.current = None
+        self.last_index = None
+        self.sheet_frames = 0  # sprite sheets only
+        self.sheet_position = 0  # next frame to read from the sheet
+        self.sheet_pending = deque()  # frames read with the last chunk, not yet shown
+        self.reader = None
+        self.device = None
+        self._open()
+
+    def _open(self):
+        if self.device is not None:
+            self.device.close()
+        self.device = self.open_device()
+        self.reader = QImageReader(self.device)
+        source = self.reader.size()
+        if not source.isValid():
+            return
+        animated = self.reader.supportsAnimation() and self.reader.imageCount() != 1
+        if not animated and source.height() and source.width() % source.height() == 0:
+            # Sprite sheet: read a ring's worth of frames at a time (_read_sheet)
+            self.sheet_frames = source.width() // source.height()
+            self.source_frame = QSize(source.height(), source.height())
+            self.device.close()
+            self.reader = self.device = None
+        else:
+            self.source_frame = source
+            self.reader.setScaledSize(_fit(source, self.pixels))
+
+    def _read_sheet(self):
+        """Decode the next few sheet frames, clipped and scaled by the reader.
+
+        Only that many scaled frames are ever resident, however long the
+        sheet; the file is decoded once per chunk rather than per frame.
+        """
+        count = min(self.ring.maxlen, self.sheet_frames - self.sheet_position)
+        side = self.source_frame.height()
+        frame = _fit(self.source_frame, self.pixels)
+        device = self.open_device()
+        reader = QImageReader(device)
+        reader.setClipRect(QRect(self.sheet_position * side, 0, count * side, side))
+        reader.setScaledSize(QSize(frame.width() * count, frame.height()))
+        strip = reader.read()
+        device.close()
+        if strip.isNull():
+            return
+        for i in range(count):
+            self.sheet_pending.append(strip.copy(i * frame.width(), 0, frame.width(), frame.height()))
+        self.sheet_position = (self.sheet_position + count) % self.sheet_frames
+
+    def _decode_next(self) -> QImage:
+        if self.sheet_frames:
+            if not self.sheet_pending:
+                self._read_sheet()
+            return self.sheet_pending.popleft() if self.sheet_pending else QImage()
+        if self.reader is None:
+            return QImage()
+        image = self.reader.read()
+        if image.isNull() and self.reader.currentImageNumber() > 0:
+            # End of the animation: loop by reopening the source
+            self._open()
+            image = self.reader.read() if self.reader else QImage()
+        return image
+
+    def _push(self):
+        image = self._decode_next()
+        if image.isNull():
+            return False
+        if self.anchor:
+            image = _anchored(image, self.source_frame, self.anchor, self.pixels)
+        self.ring.append(_to_pixmap(image, self.dpr, self.mirrored))
+        return True
+
+    def next(self) -> QPixmap:
+        """Advance one frame, decoding one more to keep the ring full."""
+        while len(self.ring) < self.ring.maxlen and self._push():
+            pass
+        if self.ring:
+            self.current = self.ring.popleft()
+            self._push()
+        return self.current
+
+    def frame(self, index=None) -> QPixmap:
+        """Frame for animation step `index`; a new index advances the stream."""
+        if self.current is None or index is None or index != self.last_index:
+            self.last_index = index
+            return self.next()
+        return self.current
+
+    def memory_bytes(self) -> int:
+        pixmaps = list(self.ring) + ([self.current] if self.current else [])
+        total = sum(p.width() * p.height() * p.depth() // 8 for p in pixmaps)
+        total += sum(image.sizeInBytes() for image in self.sheet_pending)
+        return total
+
+    def close(self):
+        """Drop the decoded frames and release the source file."""
+        if self.device is not None:
+            self.device.close()
+        if self.archive is not None:
+            self.archive.close()
+        self.reader = self.device = None
+        self.ring.clear()
+        self.sheet_pending.clear()
+        self.current = None
+
+
+class FrameListStream:
+    """A pack animation: one member per frame, decoded when first shown.
+
+    The frame on screen follows the wall clock and the per-frame
+    `durations`, so frames skipped by a slow tick are never decoded.
+    Shown frames stay in a small ring like FrameStream's, so short
+    cycles are decoded once; with a `disk_cache`, longer ones are read
+    back as raw scaled pixels instead of decoding the PNG again. The
+    stream owns `archive` and closes it in close().
+    """
+
+    def __init__(self, archive, names: list, durations: list, anchor, size: int, dpr: float,
+                 mirrored: bool = False, ring_size: int = RING_SIZE, disk_cache=None):
+        self.archive = archive
+        self.names = names
+        self.ends = []  # cumulative end time of each frame, in ms
+        total = 0
+        for duration in durations:
+            total += max(1, duration)
+            self.ends.append(total)
+        self.anchor = anchor
+        self.size = size
+        self.pixels = round(size * dpr)
+        self.dpr = dpr
+        self.mirrored = mirrored
+        self.disk_cache = disk_cache
+        self.ring = deque(maxlen=ring_size * 2)  # (frame position, QPixmap), oldest first
+        self.started = time.monotonic()
+        self.current = None
+        self.last_index = None
+        self.decoded = 0
+
+    def _read(self, name: str) -> QImage:
+        """Decode one member, scaled and anchored on the character box."""
+        device = self.archive.device(name)  # the reader does not keep it alive
+        reader = QImageReader(device)
+        source = reader.size()
+        if not source.isValid():
+            return None
+        reader.setScaledSize(_fit(source, self.pixels))
+        image = reader.read()
+        if image.isNull():
+            return None
+        self.decoded += 1
+        # Place the anchor on the bottom centre of the character box
+        return _anchored(image, source, self.anchor, self.pixels)
+
+    def _decode(self, position: int) -> QPixmap:
+        name = self.names[position]
+        image = None
+        if self.disk_cache:
+            image = self.disk_cache.load(self.archive.path, self.size, self.dpr, name)
+        if image is None:
+            image = self._read(name)
+            if image is None:
+                return None
+            if self.disk_cache:
+                # Unmirrored, so both facings share one entry
+                self.disk_cache.store(image, self.archive.path, self.size, self.dpr, name)
+        return _to_pixmap(image, self.dpr, self.mirrored)
+
+    def frame(self, index=None) -> QPixmap:
+        """Frame due now; a new `index` (animation tick) re-reads the clock."""
+        if self.current is not None and index is not None and index == self.last_index:
+            return self.current
+        self.last_index = index
+        elapsed = (time.monotonic() - self.started) * 1000 % self.ends[-1]
+        position = bisect.bisect_right(self.ends, elapsed)
+        for shown, pixmap in self.ring:
+            if shown == position:
+                break
+        else:
+            pixmap = self._decode(position)
+            if pixmap is None:
+                return self.current
+            self.ring.append((position, pixmap))
+        self.current = pixmap
+        return pixmap
+
+    def memory_bytes(self) -> int:
+        return sum(p.width() * p.height() * p.depth() // 8 for _, p in self.ring)
+
+    def close(self):
+        """Drop the decoded frames and close the pack."""
+        self.archive.close()
+        self.ring.clear()
+        self.current = None
+
+
+class PackArchive:
+    """A skin pack's zip, open for the lifetime of one stream."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.zip = zipfile.ZipFile(path)
+
+    def device(self, name: str) -> QBuffer:
+        """A fresh in-memory device holding one member."""
+        buffer = QBuffer()
+        buffer.setData(self.zip.read(name))  # copied; QBuffer(QByteArray) would only borrow it
+        return buffer
+
+    def close(self):
+        self.zip.close()
+
+
+def _pack_file_stream(path: str, member: str, anchor, size: int, dpr: float,
+                      mirrored: bool = False) -> FrameStream:
+    archive = PackArchive(path)
+    return FrameStream(partial(archive.device, member), size, dpr, mirrored,
+                       anchor=anchor, archive=archive)
+
+
+def _pack_frames_stream(path: str, names: list, durations: list, anchor, size: int,
+                        dpr: float, mirrored: bool = False, *, disk_cache=None) -> FrameListStream:
+    return FrameListStream(PackArchive(path), names, durations, anchor, size, dpr, mirrored,
+                           disk_cache=disk_cache)
+
+
+class PackIndex:
+    """A skin pack's member names and parsed manifest.
+
+    The zip is closed again once they are read; streams open their own
+    PackArchive.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with zipfile.ZipFile(path) as archive:
+            self.members = set(archive.namelist())
+            self.manifest = json.loads(archive.read(PACK_MANIFEST))
+
+
+@lru_cache(maxsize=8)
+def _open_pack(path: str, mtime_ns: int, size: int) -> PackIndex:
+    return PackIndex(path)
+
+
+def open_pack(path: str) -> PackIndex:
+    """Cached PackIndex for `path`; reloaded when the file changes."""
+    stat = os.stat(path)
+    return _open_pack(path, stat.st_mtime_ns, stat.st_size)
+
+
+class Skin:
+    """A set of per-state frame streams built from user files.
+
+    `sources` maps state -> callable(size, dpr, mirrored) returning a
+    FrameStream or FrameListStream.
+    """
+
+    def __init__(self, name: str, sources: dict, size: int, dpr: float):
+        self.name = name
+        self.sources = sources
+        self.size = size
+        self.dpr = dpr
+        self.streams = {}  # (state, mirrored) -> FrameStream
+
+    @classmethod
+    def from_path(cls, path: str, size: int, dpr: float, disk_cache=None):
+        """Skin for a file or folder, or None if it has no readable walk animation.
+
+        `disk_cache` (a SpriteDiskCache) keeps scaled pack frames between cycles.
+        """
+        name = os.path.splitext(os.path.basename(path.rstrip(os.sep)))[0]
+        sources = {}
+        if path.lower().endswith(PACK_EXTENSION):
+            try:
+                sources = cls.pack_sources(open_pack(path), disk_cache)
+            except (OSError, KeyError, ValueError, TypeError, zipfile.BadZipFile) as e:
+                print(f"⚠ Invalid skin pack {path}: {e}")
+                return None
+        elif os.path.isdir(path):
+            for filename in sorted(os.listdir(path)):
+                state, ext = os.path.splitext(filename)
+                if state in STATES and ext.lower() in SKIN_EXTENSIONS:
+                    sources[state] = partial(FrameStream, partial(QFile, os.path.join(path, filename)))
+        elif path.lower().endswith(SKIN_EXTENSIONS):
+            sources["walk"] = partial(FrameStream, partial(QFile, path))
+        skin = cls(name, sources, size, dpr)
+        if "walk" not in sources or skin.frame("walk") is None:
+            skin.close()
+            return None
+        return skin
+
+    @staticmethod
+    def pack_sources(pack: PackIndex, disk_cache=None) -> dict:
+        """Stream factories for every state listed in a pack's manifest.
+
+        Raises KeyError for a missing member and ValueError for a
+        malformed manifest.
+        """
+        manifest = pack.manifest
+        if not isinstance(manifest, dict) or not isinstance(manifest.get("states", {}), dict):
+            raise ValueError("manifest must be an object with a \"states\" object")
+        sources = {}
+        for state, spec in manifest.get("states", {}).items():
+            if state not in STATES:
+                continue
+            if not isinstance(spec, dict):
+                raise ValueError(f"{state}: state must be an object, not {type(spec).__name__}")
+            anchor = Skin.pack_anchor(state, spec.get("anchor", manifest.get("anchor")))
+            if "file" in spec:
+                if spec["file"] not in pack.members:
+                    raise KeyError(spec["file"])
+                sources[state] = partial(_pack_file_stream, pack.path, spec["file"], anchor)
+                continue
+            names = list(spec["frames"])
+            missing = [n for n in names if n not in pack.members]
+            if not names or missing:
+                raise KeyError(missing[0] if missing else f"{state}: no frames")
+            default = spec.get("duration", manifest.get("duration", DEFAULT_DURATION_MS))
+            durations = list(spec.get("durations", [default] * len(names)))
+            durations += [default] * (len(names) - len(durations))
+            sources[state] = partial(_pack_frames_stream, pack.path, names, durations, anchor,
+                                     disk_cache=disk_cache)
+        return sources
+
+    @staticmethod
+    def pack_anchor(state: str, anchor):
+        """A manifest anchor as an (x, y) tuple, or None for bottom centre."""
+        if not anchor:
+            return None
+        if (not isinstance(anchor, (list, tuple)) or len(anchor) != 2
+                or not all(isinstance(v, (int, float)) for v in anchor)):
+            raise ValueError(f"{state}: anchor must be [x, y], not {anchor!r}")
+        return tuple(anchor)
+
+    def set_dpr(self, dpr: float):
+        if dpr != self.dpr:
+            self.dpr = dpr
+            self.close()
+
+    def trim(self):
+        """Drop every decoded frame; streams restart on the next frame()."""
+        self.close()
+
+    def close(self):
+        """Close every stream and the files they hold; frame() reopens them."""
+        for stream in self.streams.values():
+            stream.close()
+        self.streams.clear()
+
+    def stream(self, state: str, mirrored: bool = False) -> FrameStream:
+        if state not in self.sources:
+            state = "walk"
+        key = (state, mirrored)
+        if key not in self.streams:
+            self.streams[key] = self.sources[state](self.size, self.dpr, mirrored)
+        return self.streams[key]
+
+    def frame(self, state: str, index=None, mirrored: bool = False, scale: float = 1.0,
+              angle: float = 0.0) -> QPixmap:
+        pixmap = self.stream(state, mirrored).frame(index)
+        if pixmap is not None and (scale != 1.0 or angle):
+            # Streamed frames are never reused, so transform them directly
+            dpr = pixmap.devicePixelRatio()
+            pixmap = pixmap.transformed(
+                QTransform().rotate(angle).scale(scale, scale),
+                Qt.TransformationMode.SmoothTransformation
+            )
+            pixmap.setDevicePixelRatio(dpr)
+        return pixmap
+
+    def memory_bytes(self) -> int:
+        return sum(s.memory_bytes() for s in self.streams.values())
+
+
+def find_skins(directory: str) -> dict:
+    """Map skin name -> path for every skin file or folder in `directory`."""
+    skins = {}
+    try:
+        entries = sorted(os.listdir(directory))
+    except OSError:
+        return skins
+    for entry in entries:
+        path = os.path.join(directory, entry)
+        if os.path.isdir(path):
+            skins[entry] = path
+        elif entry.lower().endswith(SKIN_EXTENSIONS + (PACK_EXTENSION,)):
+            skins[os.path.splitext(entry)[0]] = path
+    return skins
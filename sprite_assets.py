@@ -0,0 +1,18 @@
+"""
+Hit & Run Panda - Sprite Assets
+The panda's frames per state and the size the character is drawn at.
+
+Shared by the app and the asset pipeline (build_assets.py), so building
+the assets does not have to import the app and with it all of Qt.
+"""
+
+CHARACTER_SIZE = 120
+
+SPRITE_FILES = {
+    "walk": [f"walking panda {i}.png" for i in range(1, 5)],
+    "victory": [f"victory panda {i}.png" for i in range(1, 4)],
+    "angry": ["angry panda.png"],
+    "crying": ["crying panda.png"],
+}
+
+TRAY_ICON = "walking panda 1.png"
@@ -0,0 +1,138 @@
+"""
+Hit & Run Panda - Sprite Atlas
+Packs every scaled panda frame into one sheet plus a JSON index of
+frame rectangles, so startup is one file open and one image load.
+
+Frames are shelf-packed left to right into a roughly square sheet; the
+index maps each state ("walk", "walk_mirror", "victory", ...) to its
+rectangles, so new animations only add entries, not files. A loaded
+atlas reads only its index; images() maps the sheet file and reads
+just the rows that hold the requested state.
+"""
+
+import hashlib
+import json
+import math
+import os
+
+from PyQt6.QtCore import QRect, Qt
+from PyQt6.QtGui import QImage, QPainter
+
+from sprite_cache import FORMAT, read_raw_header, read_raw_rows, write_raw_image
+
+ATLAS_VERSION = 1
+
+
+def atlas_key(paths: list, size: int, dpr: float) -> str:
+    """Hash of the source assets (path + mtime) and target scale."""
+    parts = [f"v{ATLAS_VERSION}", str(size), f"{dpr:g}"]
+    for path in paths:
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            mtime = 0
+        parts.append(f"{os.path.abspath(path)}:{mtime}")
+    return hashlib.sha1("|".join(parts).encode()).hexdigest()
+
+
+class SpriteAtlas:
+    """One sheet of frames plus the rectangles to slice them back out.
+
+    Works purely on QImage, so loading and building can run off the GUI
+    thread; callers convert frames to QPixmap themselves. A built atlas
+    holds its `sheet`; a loaded one holds only the sheet's `path`.
+    """
+
+    def __init__(self, sheet: QImage, rects: dict, key: str = "", path: str = None,
+                 header: tuple = None):
+        self.sheet = sheet
+        self.rects = rects
+        self.key = key
+        self.path = path
+        self.header = header  # (width, height, bytes per line) of the sheet file
+
+    @staticmethod
+    def paths(directory: str, dpr: float):
+        stem = os.path.join(directory, f"atlas@{dpr:g}x")
+        return f"{stem}.sprite", f"{stem}.json"
+
+    @classmethod
+    def load(cls, directory: str, key: str, dpr: float):
+        """Load the atlas index for `key`, or None if missing or stale."""
+        image_path, index_path = cls.paths(directory, dpr)
+        try:
+            with open(index_path, "r") as f:
+                index = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        # Check the index before reading the sheet
+        if index.get("key") != key:
+            return None
+        header = read_raw_header(image_path)
+        if header is None:
+            return None
+        rects = {
+            state: [QRect(*r) for r in frames]
+            for state, frames in index.get("frames", {}).items()
+        }
+        return cls(None, rects, key, image_path, header)
+
+    @classmethod
+    def build(cls, frames: dict, key: str):
+        """Pack {state: [QImage, ...]} into a new atlas (not yet saved)."""
+        images = [i for state_frames in frames.values() for i in state_frames]
+        cell_width = max((i.width() for i in images), default=1)
+        max_width = cell_width * max(1, math.ceil(math.sqrt(len(images))))
+
+        rects = {}
+        x = y = row_height = width = 0
+        for state, state_frames in frames.items():
+            rects[state] = []
+            for image in state_frames:
+                if x + image.width() > max_width:
+                    x, y, row_height = 0, y + row_height, 0
+                rects[state].append(QRect(x, y, image.width(), image.height()))
+                x += image.width()
+                width = max(width, x)
+                row_height = max(row_height, image.height())
+
+        sheet = QImage(max(width, 1), max(y + row_height, 1), FORMAT)
+        sheet.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(sheet)
+        for state, state_frames in frames.items():
+            for image, rect in zip(state_frames, rects[state]):
+                painter.drawImage(rect.topLeft(), image)
+        painter.end()
+        return cls(sheet, rects, key)
+
+    def save(self, directory: str, dpr: float) -> bool:
+        image_path, index_path = self.paths(directory, dpr)
+        index = {
+            "version": ATLAS_VERSION,
+            "key": self.key,
+            "frames": {
+                state: [[r.x(), r.y(), r.width(), r.height()] for r in rects]
+                for state, rects in self.rects.items()
+            },
+        }
+        if not write_raw_image(self.sheet, image_path):
+            return False
+        # Index last: a sheet without a matching index is never used
+        try:
+            with open(index_path, "w") as f:
+                json.dump(index, f, indent=2)
+        except OSError:
+            return False
+        return True
+
+    def images(self, state: str) -> list:
+        """Frames of `state`; empty if the sheet file can no longer be read."""
+        rects = self.rects[state]
+        if self.sheet is not None:
+            return [self.sheet.copy(rect) for rect in rects]
+        top = min(rect.top() for rect in rects)
+        rows = max(rect.bottom() for rect in rects) + 1 - top
+        band = read_raw_rows(self.path, self.header, top, rows)
+        if band is None:
+            return []
+        return [band.copy(rect.translated(0, -top)) for rect in rects]
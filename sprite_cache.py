@@ -0,0 +1,119 @@
+"""
+Hit & Run Panda - Sprite Disk Cache
+Keeps already-scaled (and mirrored) sprite frames on disk so later
+launches skip decoding and smooth-scaling the full-size PNGs.
+
+Entries are raw premultiplied ARGB32 pixels behind a small header, so a
+hit is one file read with no PNG decode. Everything here works on
+QImage and is safe to use from worker threads.
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+import threading
+
+from PyQt6.QtGui import QImage
+
+
+MAGIC = b"PSP1"
+HEADER = struct.Struct("<4sIII")  # magic, width, height, bytes per line
+FORMAT = QImage.Format.Format_ARGB32_Premultiplied
+
+
+def read_raw_image(path: str):
+    """Read a raw sprite file into a QImage, or None if missing/corrupt."""
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, width, height, stride = HEADER.unpack_from(data)
+    except (OSError, struct.error):
+        return None
+    pixels = data[HEADER.size:]
+    if magic != MAGIC or len(pixels) != stride * height:
+        return None
+    # copy() detaches the image from the bytes buffer it was built on
+    return QImage(pixels, width, height, stride, FORMAT).copy()
+
+
+def read_raw_header(path: str):
+    """(width, height, bytes per line) of a raw sprite file, or None if missing/corrupt."""
+    try:
+        with open(path, "rb") as f:
+            magic, width, height, stride = HEADER.unpack(f.read(HEADER.size))
+            size = os.fstat(f.fileno()).st_size
+    except (OSError, struct.error):
+        return None
+    if magic != MAGIC or size != HEADER.size + stride * height:
+        return None
+    return width, height, stride
+
+
+def read_raw_rows(path: str, header: tuple, top: int, rows: int):
+    """Rows `top` to `top + rows` of a raw sprite file, or None on I/O errors.
+
+    The file is mapped, so only the pages holding those rows are read.
+    """
+    width, _, stride = header
+    start = HEADER.size + top * stride
+    try:
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            pixels = view[start:start + rows * stride]
+    except (OSError, ValueError):
+        return None
+    if len(pixels) != rows * stride:
+        return None
+    return QImage(pixels, width, rows, stride, FORMAT).copy()
+
+
+def write_raw_image(image: QImage, path: str) -> bool:
+    """Write `image` as a raw sprite file; returns False on I/O errors."""
+    image = image.convertToFormat(FORMAT)
+    bits = image.constBits()
+    bits.setsize(image.sizeInBytes())
+    header = HEADER.pack(MAGIC, image.width(), image.height(), image.bytesPerLine())
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write-then-rename so a crash never leaves a torn entry behind
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(header)
+            f.write(bytes(bits))
+        os.replace(tmp, path)
+    except OSError:
+        return False
+    return True
+
+
+class SpriteDiskCache:
+    """Pre-scaled sprite frames keyed by asset path, mtime, size and DPR."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, path: str, size: int, dpr: float, variant: str = "") -> str:
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            mtime = 0
+        raw = f"{os.path.abspath(path)}|{mtime}|{size}|{dpr:g}|{variant}"
+        return hashlib.sha1(raw.encode()).hexdigest()
+
+    def entry_path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.sprite")
+
+    def load(self, path: str, size: int, dpr: float, variant: str = ""):
+        """Return the cached QImage, or None on a miss."""
+        image = read_raw_image(self.entry_path(self.key(path, size, dpr, variant)))
+        if image is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return image
+
+    def store(self, image: QImage, path: str, size: int, dpr: float, variant: str = ""):
+        """Write a frame to the cache; failures only cost a future re-scale."""
+        write_raw_image(image, self.entry_path(self.key(path, size, dpr, variant)))
@@ -0,0 +1,121 @@
+"""
+Hit & Run Panda - Central Theme
+One application-wide stylesheet plus cached fonts and colors.
+
+Widgets pick their look through objectName() and dynamic properties
+instead of calling setStyleSheet() themselves, so Qt parses the CSS
+once at startup rather than on every widget construction.
+"""
+
+import platform
+from functools import lru_cache
+
+from PyQt6.QtGui import QFont, QColor
+
+IS_MAC = platform.system() == "Darwin"
+FONT_FAMILY = "SF Pro" if IS_MAC else "Segoe UI"
+
+# Named colors shared by the stylesheet and painted widgets
+COLORS = {
+    "text": "#333",
+    "muted": "#888",
+    "subtle": "#666",
+    "border": "#ddd",
+    "yes": "#4CAF50",
+    "yes_hover": "#45a049",
+    "no": "#f44336",
+    "no_hover": "#da190b",
+    "primary": "#2196F3",
+    "primary_hover": "#1976D2",
+    "danger_hover": "#d32f2f",
+    "completed_bg": "#e8f5e9",
+    "missed_bg": "#ffebee",
+    "stats_bg": "#f0f0f0",
+    "alert_bg": "#1a0000",
+    "alert_flash_on": "#2a0000",
+    "alert_flash_off": "#0a0000",
+    "alert_text": "#ff0000",
+    "alert_subtext": "#880000",
+    "alert_hint": "#550000",
+    "alert_button_bg": "#330000",
+}
+
+STYLESHEET = """
+/* Speech bubble */
+QFrame#bubbleContainer {
+    background-color: white;
+    border-radius: 15px;
+    border: 3px solid %(text)s;
+}
+QLabel#bubbleText { color: %(text)s; border: none; }
+
+/* Shared buttons: variant = yes / no / primary / danger */
+QPushButton[variant="yes"], QPushButton[variant="no"] {
+    color: white; border: none;
+    padding: 10px 25px; border-radius: 10px; font-weight: bold; font-size: 13px;
+}
+QPushButton[variant="yes"] { background-color: %(yes)s; }
+QPushButton[variant="yes"]:hover { background-color: %(yes_hover)s; }
+QPushButton[variant="no"] { background-color: %(no)s; }
+QPushButton[variant="no"]:hover { background-color: %(no_hover)s; }
+QPushButton[variant="primary"] {
+    background-color: %(primary)s; color: white; border: none; padding: 15px; border-radius: 10px;
+}
+QPushButton[variant="primary"]:hover { background-color: %(primary_hover)s; }
+QPushButton[variant="danger"] {
+    background-color: %(no)s; color: white; border: none; padding: 12px; border-radius: 8px;
+}
+QPushButton[variant="danger"]:hover { background-color: %(danger_hover)s; }
+QPushButton[variant="small-yes"], QPushButton[variant="small-no"] {
+    color: white; border: none; padding: 8px 15px; border-radius: 8px;
+}
+QPushButton[variant="small-yes"] { background-color: %(yes)s; }
+QPushButton[variant="small-no"] { background-color: %(no)s; }
+
+/* Settings dialog */
+QLabel#settingsTitle { color: %(text)s; padding: 10px; }
+QLabel#settingsHint { color: %(subtle)s; font-style: italic; }
+QLineEdit#taskInput { padding: 8px; border: 2px solid %(border)s; border-radius: 8px; }
+QListWidget#taskList { border: 2px solid %(border)s; border-radius: 8px; padding: 5px; }
+QLineEdit#alertMessageInput { padding: 10px; border: 2px solid %(no)s; border-radius: 8px; }
+
+/* History dialog */
+QLabel#historyStats { padding: 10px; background-color: %(stats_bg)s; border-radius: 8px; }
+QLineEdit#historySearch { padding: 8px; border: 2px solid %(border)s; border-radius: 8px; }
+QTableView#historyList { border: none; }
+QLabel#historyEmpty { color: %(muted)s; padding: 20px; }
+
+/* Red alert */
+QPushButton#alertButton {
+    background-color: %(alert_button_bg)s; color: %(alert_text)s;
+    border: 3px solid %(alert_text)s; padding: 20px 50px; margin-top: 50px;
+}
+QPushButton#alertButton:hover { background-color: %(alert_text)s; color: #000000; }
+""" % COLORS
+
+
+def install(app):
+    """Install the application stylesheet once."""
+    if app.property("pandaThemeInstalled"):
+        return
+    app.setStyleSheet(STYLESHEET)
+    app.setProperty("pandaThemeInstalled", True)
+
+
+@lru_cache(maxsize=None)
+def get_font(size=10, weight=None, family=None):
+    """Get a cached platform-appropriate font.
+
+    QFont is copied by setFont(), so the cached instance is safe to share
+    as long as callers do not mutate it in place.
+    """
+    family = family or FONT_FAMILY
+    if weight:
+        return QFont(family, size, weight)
+    return QFont(family, size)
+
+
+@lru_cache(maxsize=None)
+def get_color(name: str) -> QColor:
+    """Get a cached QColor by theme name or literal color string."""
+    return QColor(COLORS.get(name, name))